@@ -1,16 +1,35 @@
+import io
+import os
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import re
 import json
 import time
 import argparse
-from typing import Dict, List, Optional
+import threading
+from xml.sax.saxutils import escape
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote, unquote, urlparse
 import logging
+from requests.structures import CaseInsensitiveDict
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.platypus.tableofcontents import TableOfContents
 from reportlab.lib.enums import TA_JUSTIFY, TA_CENTER
 
+from http_cache import HTTPCache
+from article_cache import ArticleCache
+from search_cache import SearchCache
+from rate_limiter import RateLimiter, get_default_limiter
+from resilience import Resilience, CircuitOpenError, RETRYABLE_STATUSES, get_default_resilience
+import fast_extract
+from article_sections import HEADING_TAGS, heading_marker, split_marked_headings, split_wiki_headings, iter_sections
+from extractors import run_extractors
+from output_sink import JSONLSink
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -19,57 +38,518 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Header default untuk semua request ke Wikipedia
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+}
+
+# Timeout baca default per request (detik)
+DEFAULT_TIMEOUT = 10
+
+# Thread pool hedging dibuat sekali per scraper, di bawah lock ini
+_HEDGE_POOL_LOCK = threading.Lock()
+
+# Backend parser HTML yang didukung. 'selectolax' memakai fast path di
+# fast_extract untuk extract_article/extract_homepage dan lxml untuk sisanya.
+PARSER_BACKENDS = ('html.parser', 'lxml', 'selectolax')
+DEFAULT_PARSER = 'html.parser'
+
+# Batas judul per request action=query untuk client non-bot
+TITLES_PER_REQUEST = 50
+
+# Karakter yang tidak di-encode MediaWiki di URL artikel
+TITLE_SAFE_CHARS = "/:;@$!*(),~"
+
+# Backend ekstraksi artikel yang didukung
+ARTICLE_BACKENDS = ('html', 'api')
+
+# Versi layout PDF, naikkan setiap kali tampilan export_to_pdf berubah
+# (PDF lama di cache bot tidak dipakai lagi)
+PDF_LAYOUT_VERSION = 1
+
+# Style PDF dibuat sekali saat import, bukan setiap export_to_pdf
+_SAMPLE_STYLES = getSampleStyleSheet()
+
+PDF_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_SAMPLE_STYLES['Heading1'],
+    fontSize=24,
+    textColor='#000000',
+    spaceAfter=30,
+    alignment=TA_CENTER
+)
+
+PDF_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_SAMPLE_STYLES['Heading2'],
+    fontSize=16,
+    textColor='#333333',
+    spaceAfter=12,
+    spaceBefore=12
+)
+
+PDF_BODY_STYLE = ParagraphStyle(
+    'CustomBody',
+    parent=_SAMPLE_STYLES['BodyText'],
+    fontSize=11,
+    alignment=TA_JUSTIFY,
+    spaceAfter=12
+)
+
+PDF_SUBHEADING_STYLE = ParagraphStyle(
+    'CustomSubheading',
+    parent=_SAMPLE_STYLES['Heading3'],
+    fontSize=13,
+    textColor='#333333',
+    spaceAfter=8,
+    spaceBefore=8
+)
+
+PDF_CELL_STYLE = ParagraphStyle(
+    'CustomCell',
+    parent=_SAMPLE_STYLES['BodyText'],
+    fontSize=9,
+    leading=11
+)
+
+PDF_INFOBOX_TABLE_STYLE = TableStyle([
+    ('GRID', (0, 0), (-1, -1), 0.5, '#AAAAAA'),
+    ('BACKGROUND', (0, 0), (0, -1), '#EAECF0'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+])
+
+PDF_BUNDLE_TITLE_STYLE = ParagraphStyle(
+    'BundleTitle',
+    parent=PDF_TITLE_STYLE
+)
+
+PDF_TOC_STYLE = ParagraphStyle(
+    'TOCEntry',
+    parent=_SAMPLE_STYLES['BodyText'],
+    fontSize=11,
+    leading=16
+)
+
+# Jumlah flowable yang dibangun di depan posisi render pada export PDF lengkap
+PDF_LOOKAHEAD = 32
+
+
+class LazyStory(list):
+    """
+    Story ReportLab yang diisi dari generator sedikit demi sedikit
+
+    doc.build() hanya membaca beberapa flowable terdepan (flowables[0],
+    del flowables[0], keepWithNext), jadi cukup menyimpan PDF_LOOKAHEAD
+    flowable di memory, bukan seluruh artikel.
+    """
+
+    def __init__(self, flowables: Iterable, lookahead: int = PDF_LOOKAHEAD):
+        super().__init__()
+        self._source = iter(flowables)
+        self._lookahead = lookahead
+
+    def _fill(self):
+        while list.__len__(self) < self._lookahead:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = iter(())
+                return
+
+    def __len__(self) -> int:
+        self._fill()
+        return list.__len__(self)
+
+    def __getitem__(self, index):
+        self._fill()
+        return list.__getitem__(self, index)
+
+    def __delitem__(self, index):
+        self._fill()
+        list.__delitem__(self, index)
+
+
+class TimedDocTemplate(SimpleDocTemplate):
+    """SimpleDocTemplate yang mencatat waktu render setiap halaman"""
+
+    def build(self, flowables, **kwargs):
+        self.page_times: List[float] = []
+        self._page_started = time.perf_counter()
+        super().build(flowables, **kwargs)
+
+    def afterPage(self):
+        now = time.perf_counter()
+        self.page_times.append(now - self._page_started)
+        self._page_started = now
+
+
+class BundleDocTemplate(SimpleDocTemplate):
+    """SimpleDocTemplate yang mendaftarkan judul setiap artikel ke daftar isi dan bookmark PDF"""
+
+    def beforeDocument(self):
+        # multiBuild merender dokumen beberapa kali sampai nomor halaman daftar isi stabil
+        self._articles = 0
+
+    def lazyMultiBuild(self, make_story: Callable[[], Iterable], indexing: List, maxPasses: int = 10) -> int:
+        """
+        multiBuild dengan story yang dibangun ulang di setiap pass
+
+        multiBuild bawaan menyalin seluruh story (story[:]) di setiap pass,
+        sehingga semua flowable harus ada di memory. Di sini story dibuat
+        ulang dari make_story() per pass dan dibaca lewat LazyStory.
+
+        Args:
+            make_story: Fungsi yang mengembalikan iterable flowable baru
+            indexing: Flowable indexing di story (misalnya TableOfContents),
+                      objek yang sama harus dipakai make_story di setiap pass
+            maxPasses: Jumlah pass maksimum
+
+        Returns:
+            Jumlah pass
+        """
+        self._indexingFlowables = list(indexing)
+        self._doSave = 0
+        edits = []
+        self._multiBuildEdits = edits.append
+        passes = 0
+        try:
+            while True:
+                passes += 1
+                for flowable in self._indexingFlowables:
+                    flowable.beforeBuild()
+                self.build(LazyStory(make_story()))
+                for flowable in self._indexingFlowables:
+                    flowable.afterBuild()
+
+                if self._allSatisfied():
+                    self.canv.save()
+                    return passes
+                if passes > maxPasses:
+                    raise IndexError(f"Index entries not resolved after {maxPasses} passes")
+
+                while edits:
+                    edit = edits.pop(0)
+                    edit[0](*edit[1:])
+        finally:
+            del self._multiBuildEdits
+
+    def afterFlowable(self, flowable):
+        if isinstance(flowable, Paragraph) and flowable.style.name == PDF_TITLE_STYLE.name:
+            self._articles += 1
+            key = f"article-{self._articles}"
+            text = flowable.getPlainText()
+            self.canv.bookmarkPage(key)
+            self.canv.addOutlineEntry(text, key, level=0)
+            self.notify('TOCEntry', (0, text, self.page, key))
+
+
+# Extractor yang dijalankan scrape_homepage secara default
+HOMEPAGE_EXTRACTORS = ['title', 'meta_description', 'links', 'images', 'headings', 'scripts']
+
+
+def _is_article_region(name: str, attrs: Dict) -> bool:
+    """
+    Cek apakah tag termasuk bagian halaman yang dipakai extract_article:
+    h1.firstHeading, div.mw-parser-output, div#mw-normal-catlinks,
+    table.infobox dan li[id^=cite_note]
+
+    Args:
+        name: Nama tag
+        attrs: Atribut mentah tag (class masih berupa string)
+
+    Returns:
+        True jika tag (beserta isinya) perlu dibangun menjadi tree
+    """
+    if name not in ('h1', 'div', 'table', 'li'):
+        return False
+
+    element_id = attrs.get('id') or ''
+    classes = attrs.get('class') or []
+    if isinstance(classes, str):
+        classes = classes.split()
+
+    if name == 'h1':
+        return 'firstHeading' in classes
+    if name == 'div':
+        return 'mw-parser-output' in classes or element_id == 'mw-normal-catlinks'
+    if name == 'table':
+        return 'infobox' in classes
+    return element_id.startswith('cite_note')
+
+
+class ArticleRegionStrainer(SoupStrainer):
+    """SoupStrainer yang hanya membangun region artikel menjadi tree"""
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        # bs4 >= 4.13
+        return _is_article_region(name, attrs or {})
+
+    def allow_string_creation(self, string) -> bool:
+        # bs4 >= 4.13, string di luar region artikel dibuang
+        return False
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        # bs4 < 4.13
+        return _is_article_region(markup_name, dict(markup_attrs or {}))
+
+
+ARTICLE_STRAINER = ArticleRegionStrainer()
+
+
 class WikipediaScraper:
     """Web scraper untuk Wikipedia"""
 
-    def __init__(self, language: str = 'en'):
+    def __init__(self, language: str = 'en', http_cache: Optional[HTTPCache] = None,
+                 article_cache: Optional[ArticleCache] = None, parser: Optional[str] = None,
+                 partial_parse: bool = True, base_url: Optional[str] = None,
+                 backend: Optional[str] = None, rate_limiter: Optional[RateLimiter] = None,
+                 resilience: Optional[Resilience] = None, search_cache: Optional[SearchCache] = None):
         self.language = language
-        self.base_url = f"https://{language}.wikipedia.org"
+        # Backend ekstraksi artikel: 'html' (scrape halaman) atau 'api' (MediaWiki API)
+        self.backend = backend or os.getenv('WIKI_SCRAPER_BACKEND', 'html')
+        if self.backend not in ARTICLE_BACKENDS:
+            raise ValueError(f"Unknown article backend: {self.backend} (choose from {', '.join(ARTICLE_BACKENDS)})")
+        self.partial_parse = partial_parse
+        self.http_cache = http_cache
+        self.article_cache = article_cache
+        self.search_cache = search_cache
+        self.parser = self._resolve_parser(parser or os.getenv('WIKI_SCRAPER_PARSER', DEFAULT_PARSER))
+        # base_url bisa diganti, misalnya ke stand-in API server lokal untuk testing
+        self.base_url = (base_url or f"https://{language}.wikipedia.org").rstrip('/')
+        self.api_url = f"{self.base_url}/w/api.php"
+        # Rate limiter outbound dipakai bersama semua scraper di proses ini
+        self.rate_limiter = rate_limiter or get_default_limiter()
+        # Retry, hedged request dan circuit breaker per host
+        self.resilience = resilience or get_default_resilience()
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
         self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-        })
+        self.session.headers.update(DEFAULT_HEADERS)
 
-    def get_page(self, url: str, timeout: int = 10) -> Optional[requests.Response]:
+    def __getstate__(self) -> Dict:
+        """
+        State untuk pickle (dipakai saat parsing / render PDF dijalankan di
+        process pool): hanya konfigurasi, tanpa session, cache, rate limiter
+        dan state resilience yang berisi lock dan koneksi
+        """
+        state = self.__dict__.copy()
+        for key in ('session', 'http_cache', 'article_cache', 'search_cache', 'rate_limiter', 'resilience', '_hedge_pool'):
+            state[key] = None
+        return state
+
+    def _request(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                 timeout: Optional[float] = None) -> requests.Response:
+        """
+        GET dengan rate limit, retry, hedging dan circuit breaker
+
+        Error koneksi, timeout, status 429/5xx dan error maxlag diulang dengan
+        exponential backoff + jitter dalam satu loop: maksimal
+        resilience.max_attempts percobaan dan resilience.deadline detik total.
+        Respons throttle juga memblokir host di rate limiter selama Retry-After.
+
+        Args:
+            url: URL tujuan
+            params: Query parameter
+            headers: Header tambahan
+            timeout: Timeout baca per percobaan dalam detik (default: DEFAULT_TIMEOUT)
+
+        Returns:
+            Response object terakhir
+
+        Raises:
+            CircuitOpenError: Jika circuit host sedang terbuka
+            requests.exceptions.RequestException: Jika semua percobaan gagal
+        """
+        host = urlparse(url).netloc
+        if url == self.api_url:
+            params = self.rate_limiter.api_params(params)
+        timeout = timeout if timeout is not None else DEFAULT_TIMEOUT
+        deadline = time.monotonic() + self.resilience.deadline
+
+        for attempt in range(self.resilience.max_attempts):
+            self.resilience.check(host)
+            error = None
+            try:
+                response = self._hedged_send(host, url, params, headers,
+                                             self.resilience.attempt_timeout(timeout, deadline))
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.resilience.record_failure(host)
+                error = e
+            except BaseException:
+                # Error lain tidak diulang, tapi probe half-open tidak boleh menggantung
+                self.resilience.record_abandoned(host)
+                raise
+            else:
+                throttled = self.rate_limiter.throttle_delay(response.status_code, response.headers) is not None
+                if response.status_code not in RETRYABLE_STATUSES and not throttled:
+                    self.resilience.record_success(host)
+                    return response
+                self.resilience.record_failure(host)
+
+            delay = self.resilience.retry_wait(host, attempt, deadline,
+                                               self.rate_limiter.wait_time(url, self.language))
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            reason = error if error is not None else response.status_code
+            logger.warning(f"Request to {url} failed ({reason}), retrying")
+            time.sleep(delay)
+
+    def _hedged_send(self, host: str, url: str, params: Optional[Dict], headers: Optional[Dict],
+                     timeout: float) -> requests.Response:
+        """Kirim request, dan request duplikat jika yang pertama melewati latency p95 host"""
+        delay = self.resilience.hedge_delay(host)
+        if delay is None:
+            return self._send(url, params, headers, timeout)
+
+        with _HEDGE_POOL_LOCK:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='hedge')
+            pool = self._hedge_pool
+        first = pool.submit(self._send, url, params, headers, timeout)
+        if wait([first], timeout=delay).done:
+            return first.result()
+
+        logger.info(f"Hedging request after {delay:.2f}s: {url}")
+        second = pool.submit(self._send, url, params, headers, timeout)
+        error = None
+        for future in as_completed([first, second]):
+            try:
+                return future.result()
+            except requests.exceptions.RequestException as e:
+                error = e
+        raise error
+
+    def _send(self, url: str, params: Optional[Dict], headers: Optional[Dict],
+              timeout: float) -> requests.Response:
+        """
+        Satu percobaan GET lewat rate limiter
+
+        Respons 429/503 atau error maxlag memblokir host selama Retry-After;
+        pengulangannya diatur _request.
+        """
+        self.rate_limiter.acquire(url, self.language)
+        start = time.monotonic()
+        response = self.session.get(url, params=params, headers=headers,
+                                    timeout=(self.resilience.connect_timeout, timeout))
+        self.resilience.record_latency(url, response.status_code, time.monotonic() - start)
+        self.rate_limiter.observe(url, self.language, response.status_code, response.headers)
+        return response
+
+    def close(self):
+        """Tutup session HTTP dan thread pool hedging"""
+        with _HEDGE_POOL_LOCK:
+            pool, self._hedge_pool = self._hedge_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+        if self.session is not None:
+            self.session.close()
+
+    def get_page(self, url: str, timeout: Optional[float] = None) -> Optional[requests.Response]:
         """
         Mendapatkan halaman dari URL
 
         Args:
             url: URL yang akan di-scrape
-            timeout: Timeout dalam detik
+            timeout: Timeout baca dalam detik (default: DEFAULT_TIMEOUT)
 
         Returns:
             Response object atau None jika gagal
         """
         try:
             logger.info(f"Fetching: {url}")
-            response = self.session.get(url, timeout=timeout)
+            headers = {}
+            cached = self.http_cache.lookup(url) if self.http_cache else None
+
+            if cached:
+                if cached['fresh']:
+                    logger.info(f"Cache hit: {url}")
+                    return self._cached_response(cached)
+                headers.update(self.http_cache.conditional_headers(cached))
+
+            response = self._request(url, headers=headers, timeout=timeout)
+
+            if cached and response.status_code == 304:
+                logger.info(f"Not modified: {url}")
+                self.http_cache.mark_revalidated(url, response.headers)
+                return self._cached_response(cached)
+
             response.raise_for_status()
+
+            # Special:Random dan redirect lain tidak di-cache di bawah URL asal
+            if self.http_cache and not response.history:
+                self.http_cache.store(url, response.url, response.headers, response.content)
+
             return response
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, CircuitOpenError) as e:
             logger.error(f"Error fetching {url}: {e}")
             return None
 
-    def parse_html(self, html_content: str) -> BeautifulSoup:
+    def _cached_response(self, entry: Dict) -> requests.Response:
+        """
+        Bangun Response object dari entry HTTP cache
+
+        Args:
+            entry: Entry hasil HTTPCache.lookup()
+
+        Returns:
+            Response object dengan status 200
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = entry['url']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = entry['body']
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    @staticmethod
+    def _resolve_parser(parser: str) -> str:
+        """
+        Validasi backend parser
+
+        Args:
+            parser: Nama backend ('html.parser', 'lxml' atau 'selectolax')
+
+        Returns:
+            Nama backend yang bisa dipakai
+        """
+        if parser not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser backend: {parser} (choose from {', '.join(PARSER_BACKENDS)})")
+
+        if parser == 'selectolax' and not fast_extract.is_available():
+            logger.warning("selectolax is not installed, falling back to lxml parser")
+            return 'lxml'
+
+        return parser
+
+    def parse_html(self, html_content: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
         """
         Parse HTML content dengan BeautifulSoup
 
         Args:
             html_content: HTML string
+            parse_only: SoupStrainer opsional, hanya elemen yang cocok
+                        (beserta isinya) yang dibangun menjadi tree
 
         Returns:
             BeautifulSoup object
         """
-        return BeautifulSoup(html_content, 'html.parser')
+        features = 'lxml' if self.parser == 'selectolax' else self.parser
+        return BeautifulSoup(html_content, features, parse_only=parse_only)
 
-    def scrape_homepage(self) -> Dict:
+    def scrape_homepage(self, extractors: Optional[List[str]] = None) -> Dict:
         """
         Scrape homepage Wikipedia
 
+        Args:
+            extractors: Nama extractor yang dijalankan (default: HOMEPAGE_EXTRACTORS)
+
         Returns:
             Dictionary berisi data yang di-scrape
         """
@@ -77,59 +557,29 @@ class WikipediaScraper:
         if not response:
             return {}
 
-        soup = self.parse_html(response.text)
+        data = self.extract_homepage(response.text, extractors)
 
-        data = {
-            'title': '',
-            'meta_description': '',
-            'links': [],
-            'images': [],
-            'headings': [],
-            'scripts': [],
-        }
+        logger.info(f"Scraped {len(data.get('links', []))} links, {len(data.get('images', []))} images")
+        return data
 
-        # Extract title
-        title_tag = soup.find('title')
-        if title_tag:
-            data['title'] = title_tag.get_text(strip=True)
+    def extract_homepage(self, html_content: str, extractors: Optional[List[str]] = None) -> Dict:
+        """
+        Extract title, meta description, links, images, headings dan scripts dari HTML
+        dalam satu traversal dokumen
 
-        # Extract meta description
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc:
-            data['meta_description'] = meta_desc.get('content', '')
-
-        # Extract all links
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
-            text = link.get_text(strip=True)
-            data['links'].append({
-                'url': href,
-                'text': text
-            })
-
-        # Extract all images
-        for img in soup.find_all('img'):
-            src = img.get('src', '')
-            alt = img.get('alt', '')
-            data['images'].append({
-                'src': src,
-                'alt': alt
-            })
-
-        # Extract headings (h1, h2, h3, etc.)
-        for i in range(1, 7):
-            for heading in soup.find_all(f'h{i}'):
-                data['headings'].append({
-                    'level': i,
-                    'text': heading.get_text(strip=True)
-                })
-
-        # Extract script sources (untuk identifikasi teknologi)
-        for script in soup.find_all('script', src=True):
-            data['scripts'].append(script.get('src'))
-
-        logger.info(f"Scraped {len(data['links'])} links, {len(data['images'])} images")
-        return data
+        Args:
+            html_content: HTML string
+            extractors: Nama extractor yang dijalankan (default: HOMEPAGE_EXTRACTORS),
+                        lihat extractors.EXTRACTORS untuk daftar lengkap
+
+        Returns:
+            Dictionary berisi data halaman, satu kunci per extractor
+        """
+        if self.parser == 'selectolax' and extractors is None:
+            return fast_extract.extract_homepage(html_content)
+
+        soup = self.parse_html(html_content)
+        return run_extractors(soup, extractors or HOMEPAGE_EXTRACTORS)
 
     def scrape_article_links(self, max_links: int = 20) -> List[str]:
         """
@@ -141,28 +591,55 @@ class WikipediaScraper:
         Returns:
             List of article URLs
         """
-        response = self.get_page(self.base_url)
-        if not response:
-            return []
+        article_links = self.open_page(self.base_url).article_links(max_links)
 
-        soup = self.parse_html(response.text)
+        logger.info(f"Found {len(article_links)} article links")
+        return article_links
+
+    def filter_article_links(self, links: List[Dict], max_links: int = 20,
+                             base_url: Optional[str] = None) -> List[str]:
+        """
+        Filter link artikel Wikipedia dari hasil extractor 'links'
+
+        Args:
+            links: List of {'url', 'text'} dalam urutan dokumen
+            max_links: Maksimum jumlah link yang akan diambil
+            base_url: Base URL untuk link relatif (default: base_url scraper)
+
+        Returns:
+            List of article URLs tanpa duplikat
+        """
+        base_url = base_url or self.base_url
         article_links = []
+        seen = set()
 
-        # Cari semua link artikel Wikipedia
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
+        for link in links:
+            href = link['url']
             # Filter link artikel Wikipedia (yang dimulai dengan /wiki/)
             if href.startswith('/wiki/') and ':' not in href:
-                full_url = self.base_url + href
-                if full_url not in article_links:
+                full_url = base_url + href
+                if full_url not in seen:
+                    seen.add(full_url)
                     article_links.append(full_url)
 
                 if len(article_links) >= max_links:
                     break
 
-        logger.info(f"Found {len(article_links)} article links")
         return article_links
 
+    def open_page(self, url: str, extractors: Optional[List[str]] = None) -> 'PageSession':
+        """
+        Buka halaman sebagai PageSession (fetch dan parse sekali, extract berkali-kali)
+
+        Args:
+            url: URL halaman
+            extractors: Extractor yang dijalankan sekaligus pada traversal pertama
+
+        Returns:
+            PageSession object
+        """
+        return PageSession(self, url, extractors)
+
     def scrape_article(self, article_url: str) -> Dict:
         """
         Scrape artikel Wikipedia spesifik
@@ -173,11 +650,62 @@ class WikipediaScraper:
         Returns:
             Dictionary berisi data artikel
         """
-        response = self.get_page(article_url)
-        if not response:
-            return {}
+        return self.scrape_article_page(article_url)[0]
+
+    def scrape_article_page(self, article_url: str) -> Tuple[Dict, Optional[requests.Response]]:
+        """
+        Scrape artikel beserta response halaman HTML-nya
+
+        Dipakai pemanggil yang juga butuh isi halaman (misalnya link untuk
+        crawler) tanpa mengambil halaman yang sama dua kali.
+
+        Args:
+            article_url: URL artikel Wikipedia
+
+        Returns:
+            Tuple (dictionary artikel atau {}, response halaman); response None
+            jika data berasal dari article cache atau backend 'api'
+        """
+        if self.article_cache:
+            cached = self.article_cache.get(article_url, self.language)
+            if cached:
+                logger.info(f"Article cache hit: {cached['title']}")
+                return cached, None
+
+        response = None
+        if self.backend == 'api':
+            data, canonical_url = self.scrape_article_api(article_url)
+            if not data:
+                return {}, None
+        else:
+            response = self.get_page(article_url)
+            if not response:
+                return {}, None
+            data = self.extract_article(response.text, article_url)
+            canonical_url = response.url
+
+        if self.article_cache:
+            self.article_cache.put(article_url, canonical_url, self.language, data['revision_id'], data)
+
+        logger.info(f"Scraped article: {data['title']}")
+        return data, response
+
+    def extract_article(self, html_content: str, article_url: str) -> Dict:
+        """
+        Extract data artikel dari HTML halaman artikel
 
-        soup = self.parse_html(response.text)
+        Args:
+            html_content: HTML string halaman artikel
+            article_url: URL artikel
+
+        Returns:
+            Dictionary berisi data artikel
+        """
+        if self.parser == 'selectolax':
+            return fast_extract.extract_article(html_content, article_url)
+
+        # Partial parse: navigasi, skin dan script tidak pernah dibangun menjadi tree
+        soup = self.parse_html(html_content, parse_only=ARTICLE_STRAINER if self.partial_parse else None)
 
         data = {
             'url': article_url,
@@ -187,8 +715,15 @@ class WikipediaScraper:
             'categories': [],
             'references': [],
             'infobox': {},
+            'revision_id': None,
+            'sections': [],
         }
 
+        # Extract revision id dari konfigurasi MediaWiki (mw.config)
+        revision_match = re.search(r'"wgRevisionId":(\d+)', html_content)
+        if revision_match:
+            data['revision_id'] = int(revision_match.group(1))
+
         # Extract title
         title_tag = soup.find('h1', class_='firstHeading')
         if title_tag:
@@ -201,8 +736,17 @@ class WikipediaScraper:
             if first_p:
                 data['summary'] = first_p.get_text(strip=True)
 
+            # Tandai judul section agar posisinya di content diketahui (untuk export PDF lengkap)
+            for heading in content_div.find_all(HEADING_TAGS):
+                headline = heading.find(class_='mw-headline') or heading
+                if headline.get_text(strip=True):
+                    headline.insert_before(heading_marker(int(heading.name[1])))
+
             # Extract all text content
-            data['content'] = content_div.get_text(separator='\n', strip=True)
+            lines, data['sections'] = split_marked_headings(
+                content_div.get_text(separator='\n', strip=True).split('\n')
+            )
+            data['content'] = '\n'.join(lines)
 
         # Extract categories
         categories_div = soup.find('div', id='mw-normal-catlinks')
@@ -212,19 +756,192 @@ class WikipediaScraper:
                     data['categories'].append(cat_link.get_text(strip=True))
 
         # Extract infobox
+        data['infobox'] = self.extract_infobox(soup)
+
+        # Extract references count
+        references = soup.find_all('li', id=lambda x: x and x.startswith('cite_note'))
+        data['references'] = len(references)
+
+        return data
+
+    def extract_infobox(self, soup: BeautifulSoup) -> Dict[str, str]:
+        """
+        Extract pasangan key/value dari table.infobox pertama
+
+        Args:
+            soup: BeautifulSoup object
+
+        Returns:
+            Dictionary infobox
+        """
+        infobox_data = {}
         infobox = soup.find('table', class_='infobox')
         if infobox:
             for row in infobox.find_all('tr'):
                 header = row.find('th')
                 value = row.find('td')
                 if header and value:
-                    data['infobox'][header.get_text(strip=True)] = value.get_text(strip=True)
+                    infobox_data[header.get_text(strip=True)] = value.get_text(strip=True)
+        return infobox_data
 
-        # Extract references count
-        references = soup.find_all('li', id=lambda x: x and x.startswith('cite_note'))
-        data['references'] = len(references)
+    def scrape_article_api(self, article_url: str) -> Tuple[Dict, Optional[str]]:
+        """
+        Ambil data artikel lewat MediaWiki API, tanpa mengunduh halaman HTML penuh
+
+        Args:
+            article_url: URL artikel Wikipedia
+
+        Returns:
+            Tuple (dictionary artikel atau {}, canonical URL atau None)
+        """
+        title = self.title_from_url(article_url)
+
+        try:
+            logger.info(f"Fetching via API: {title}")
+            response = self._request(self.api_url, params=self.article_api_params(title))
+            response.raise_for_status()
+            query_data = response.json()
+
+            page = self.api_page(query_data)
+            if not page:
+                logger.warning(f"Article not found via API: {title}")
+                return {}, None
+
+            # Infobox hanya ada di HTML lead section (section=0)
+            response = self._request(self.api_url, params=self.infobox_api_params(page['title']))
+            response.raise_for_status()
+            parse_data = response.json()
+        except Exception as e:
+            logger.error(f"Error fetching {title} via API: {e}")
+            return {}, None
+
+        data = self.build_api_article(article_url, page, parse_data)
+        return data, self.article_url(page['title'])
+
+    def article_links_api(self, article_url: str) -> List[str]:
+        """
+        Link artikel (namespace 0) dari satu artikel lewat MediaWiki API
+
+        Args:
+            article_url: URL artikel Wikipedia
+
+        Returns:
+            List of article URLs, kosong jika gagal
+        """
+        params = self.links_api_params(self.title_from_url(article_url))
+        links = []
+        try:
+            while True:
+                response = self._request(self.api_url, params=params)
+                response.raise_for_status()
+                data = response.json()
+                for page in data.get('query', {}).get('pages', []):
+                    links.extend(self.article_url(link['title']) for link in page.get('links', []))
+                if 'continue' not in data:
+                    break
+                params = {**params, **data['continue']}
+        except Exception as e:
+            logger.error(f"Error fetching links of {article_url} via API: {e}")
+        return links
+
+    @staticmethod
+    def links_api_params(title: str) -> Dict:
+        """Parameter action=query untuk link artikel (namespace 0)"""
+        return {
+            'action': 'query',
+            'titles': title,
+            'redirects': 1,
+            'prop': 'links',
+            'plnamespace': 0,
+            'pllimit': 'max',
+            'format': 'json',
+            'formatversion': 2,
+        }
+
+    @staticmethod
+    def title_from_url(article_url: str) -> str:
+        """Judul artikel dari URL /wiki/<judul>"""
+        path = urlparse(article_url).path
+        title = path.split('/wiki/', 1)[-1]
+        return unquote(title).replace('_', ' ')
+
+    @staticmethod
+    def article_api_params(title: str) -> Dict:
+        """
+        Parameter action=query untuk extract, kategori, revision id dan link
+        eksternal artikel (wikitext tidak diunduh; jumlah referensi diperkirakan
+        dari link eksternal)
+        """
+        return {
+            'action': 'query',
+            'titles': title,
+            'redirects': 1,
+            'prop': 'extracts|categories|revisions|extlinks',
+            'explaintext': 1,
+            'exsectionformat': 'wiki',
+            'clshow': '!hidden',
+            'cllimit': 'max',
+            'rvprop': 'ids',
+            'ellimit': 'max',
+            'format': 'json',
+            'formatversion': 2,
+        }
+
+    @staticmethod
+    def infobox_api_params(title: str) -> Dict:
+        """Parameter action=parse untuk HTML lead section (berisi infobox)"""
+        return {
+            'action': 'parse',
+            'page': title,
+            'prop': 'text',
+            'section': 0,
+            'disablelimitreport': 1,
+            'disableeditsection': 1,
+            'format': 'json',
+            'formatversion': 2,
+        }
+
+    @staticmethod
+    def api_page(query_data: Dict) -> Optional[Dict]:
+        """Halaman pertama dari response action=query, None jika tidak ada"""
+        pages = query_data.get('query', {}).get('pages', [])
+        if not pages or pages[0].get('missing') or pages[0].get('invalid'):
+            return None
+        return pages[0]
+
+    def build_api_article(self, article_url: str, page: Dict, parse_data: Dict) -> Dict:
+        """
+        Bangun dictionary artikel (schema sama dengan extract_article) dari response API
+
+        Args:
+            article_url: URL artikel
+            page: Halaman dari response action=query
+            parse_data: Response action=parse untuk lead section
+
+        Returns:
+            Dictionary berisi data artikel
+        """
+        lines = [line.strip() for line in page.get('extract', '').split('\n') if line.strip()]
+        lines, sections = split_wiki_headings(lines)
+        revisions = page.get('revisions') or [{}]
+
+        data = {
+            'url': article_url,
+            'title': page.get('title', ''),
+            'summary': lines[0] if lines else '',
+            'content': '\n'.join(lines),
+            'categories': [cat['title'].split(':', 1)[-1] for cat in page.get('categories', [])],
+            # Perkiraan: link eksternal unik (maksimal satu halaman ellimit)
+            'references': len({link['url'] for link in page.get('extlinks', []) if 'url' in link}),
+            'infobox': {},
+            'revision_id': revisions[0].get('revid'),
+            'sections': sections,
+        }
+
+        lead_html = parse_data.get('parse', {}).get('text', '')
+        if lead_html:
+            data['infobox'] = self.extract_infobox(self.parse_html(lead_html))
 
-        logger.info(f"Scraped article: {data['title']}")
         return data
 
     def extract_json_ld(self, html_content: str) -> List[Dict]:
@@ -238,16 +955,7 @@ class WikipediaScraper:
             List of JSON-LD objects
         """
         soup = self.parse_html(html_content)
-        json_ld_data = []
-
-        for script in soup.find_all('script', type='application/ld+json'):
-            try:
-                data = json.loads(script.string)
-                json_ld_data.append(data)
-            except (json.JSONDecodeError, AttributeError) as e:
-                logger.warning(f"Failed to parse JSON-LD: {e}")
-
-        return json_ld_data
+        return run_extractors(soup, ['json_ld'])['json_ld']
 
     def search_article(self, query: str) -> Optional[str]:
         """
@@ -259,18 +967,25 @@ class WikipediaScraper:
         Returns:
             URL artikel yang ditemukan atau None
         """
-        search_url = f"{self.base_url}/w/api.php"
+        if self.search_cache:
+            cached = self.search_cache.lookup(self.language, query)
+            if cached:
+                logger.info(f"Search cache hit: {query}")
+                return cached['url']
+
+        search_url = self.api_url
         params = {
             'action': 'opensearch',
             'search': query,
             'limit': 1,
             'namespace': 0,
+            'redirects': 'resolve',
             'format': 'json'
         }
 
         try:
             logger.info(f"Searching for: {query}")
-            response = self.session.get(search_url, params=params, timeout=10)
+            response = self._request(search_url, params=params)
             response.raise_for_status()
 
             data = response.json()
@@ -278,15 +993,202 @@ class WikipediaScraper:
             if data and len(data) > 3 and data[3]:
                 article_url = data[3][0]
                 logger.info(f"Found article: {article_url}")
+                self.cache_search(query, article_url)
                 return article_url
             else:
                 logger.warning(f"No article found for query: {query}")
+                self.cache_search(query, None)
                 return None
 
         except Exception as e:
             logger.error(f"Error searching: {e}")
             return None
 
+    def cache_search(self, query: str, article_url: Optional[str], exact: bool = False):
+        """
+        Simpan hasil search (judul artikel tujuan ikut disimpan sebagai alias)
+
+        Args:
+            query: Kata kunci pencarian
+            article_url: URL artikel, atau None jika query tidak ditemukan
+            exact: Hasil lookup judul persis (disimpan dengan kunci case-sensitive)
+        """
+        if not self.search_cache:
+            return
+        aliases = [self.title_from_url(article_url)] if article_url else []
+        self.search_cache.put(self.language, query, article_url, aliases=aliases, exact=exact)
+
+    def cached_titles(self, queries: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Hasil lookup judul persis yang ada di search cache
+
+        Args:
+            queries: Query unik
+
+        Returns:
+            Dictionary query -> URL artikel untuk query yang ada di cache
+        """
+        results = {}
+        if self.search_cache:
+            for query in queries:
+                cached = self.search_cache.lookup(self.language, query, exact=True)
+                if cached:
+                    results[query] = cached['url']
+        return results
+
+    def cache_titles(self, urls: Dict[str, str]):
+        """Simpan hasil lookup judul persis (lihat title_lookup_urls)"""
+        for query, article_url in urls.items():
+            self.cache_search(query, article_url, exact=True)
+
+    def search_articles(self, queries: List[str], max_workers: int = 4) -> Dict[str, Optional[str]]:
+        """
+        Resolve banyak query sekaligus dengan request API seminimal mungkin
+
+        Query dicocokkan dulu sebagai judul persis (titles=A|B|C dengan
+        normalisasi dan redirect, maksimal 50 judul per request). Hanya query
+        yang tidak cocok yang di-search lewat opensearch secara concurrent.
+        Judul yang cocok di-cache dengan kunci case-sensitive, hasil
+        opensearch dengan kunci case-folded.
+
+        Args:
+            queries: List kata kunci pencarian
+            max_workers: Jumlah opensearch concurrent untuk query yang tidak cocok
+
+        Returns:
+            Dictionary query -> URL artikel (atau None jika tidak ditemukan)
+        """
+        unique = list(dict.fromkeys(q for q in queries if q and q.strip()))
+        results: Dict[str, Optional[str]] = self.cached_titles(unique)
+        unique = [q for q in unique if q not in results]
+
+        for batch in self.title_lookup_batches(unique):
+            try:
+                logger.info(f"Resolving {len(batch)} titles in one request")
+                response = self._request(self.api_url, params=self.title_lookup_params(batch))
+                response.raise_for_status()
+                urls = self.title_lookup_urls(batch, response.json())
+                self.cache_titles(urls)
+                results.update(urls)
+            except Exception as e:
+                logger.error(f"Error resolving titles: {e}")
+
+        misses = [q for q in unique if q not in results]
+        if misses:
+            logger.info(f"Falling back to opensearch for {len(misses)} queries")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for query, url in zip(misses, executor.map(self.search_article, misses)):
+                    results[query] = url
+
+        return {q: results.get(q) for q in queries}
+
+    def scrape_articles(self, queries: List[str], max_workers: int = 4) -> List[Dict]:
+        """
+        Search dan scrape banyak artikel secara concurrent
+
+        Args:
+            queries: List kata kunci pencarian
+            max_workers: Jumlah artikel yang di-scrape bersamaan
+
+        Returns:
+            List artikel sesuai urutan query; query yang tidak ditemukan atau
+            gagal di-scrape dilewati, artikel yang sama hanya muncul sekali
+        """
+        urls = self.search_articles(queries, max_workers=max_workers)
+        unique = list(dict.fromkeys(url for url in urls.values() if url))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            articles = list(executor.map(self.scrape_article, unique))
+        return [article for article in articles if article]
+
+    @staticmethod
+    def title_lookup_batches(queries: List[str]) -> List[List[str]]:
+        """
+        Bagi query menjadi batch untuk title_lookup_params
+
+        Args:
+            queries: Query unik
+
+        Returns:
+            List batch berisi maksimal TITLES_PER_REQUEST query; query yang
+            mengandung '|' tidak bisa digabung dalam parameter titles dan
+            dilewati (di-search lewat opensearch)
+        """
+        batchable = [q for q in queries if '|' not in q]
+        return [batchable[start:start + TITLES_PER_REQUEST]
+                for start in range(0, len(batchable), TITLES_PER_REQUEST)]
+
+    def title_lookup_urls(self, batch: List[str], data: Dict) -> Dict[str, str]:
+        """
+        URL artikel untuk query yang cocok dengan judul dari response title lookup
+
+        Args:
+            batch: Query yang dikirim lewat title_lookup_params
+            data: JSON response
+
+        Returns:
+            Dictionary query -> URL artikel, hanya untuk query yang ditemukan
+        """
+        urls = {}
+        for query, title in self.map_query_titles(batch, data).items():
+            if title:
+                urls[query] = self.article_url(title)
+        return urls
+
+    @staticmethod
+    def title_lookup_params(titles: List[str]) -> Dict:
+        """Parameter action=query untuk lookup judul persis dengan redirect"""
+        return {
+            'action': 'query',
+            'titles': '|'.join(titles),
+            'redirects': 1,
+            'format': 'json',
+            'formatversion': 2,
+        }
+
+    @staticmethod
+    def map_query_titles(queries: List[str], data: Dict) -> Dict[str, Optional[str]]:
+        """
+        Petakan query ke judul artikel dari response action=query
+
+        Args:
+            queries: Query yang dikirim sebagai titles
+            data: JSON response (formatversion=2)
+
+        Returns:
+            Dictionary query -> judul artikel (namespace 0), atau None
+        """
+        query_data = data.get('query', {})
+        normalized = {item['from']: item['to'] for item in query_data.get('normalized', [])}
+        redirects = {item['from']: item['to'] for item in query_data.get('redirects', [])}
+        pages = {
+            page['title']: page for page in query_data.get('pages', [])
+            if 'title' in page
+        }
+
+        titles = {}
+        for query in queries:
+            title = normalized.get(query, query)
+            title = redirects.get(title, title)
+            page = pages.get(title)
+            if page and not page.get('missing') and not page.get('invalid') and page.get('ns') == 0:
+                titles[query] = page['title']
+            else:
+                titles[query] = None
+        return titles
+
+    def article_url(self, title: str) -> str:
+        """
+        URL artikel untuk judul tertentu
+
+        Args:
+            title: Judul artikel
+
+        Returns:
+            URL artikel dengan encoding seperti yang dipakai MediaWiki
+        """
+        return f"{self.base_url}/wiki/{quote(title.replace(' ', '_'), safe=TITLE_SAFE_CHARS)}"
+
     def save_to_json(self, data: Dict, filename: str = 'wikipedia_data.json'):
         """
         Simpan data ke file JSON
@@ -302,135 +1204,349 @@ class WikipediaScraper:
         except Exception as e:
             logger.error(f"Error saving to JSON: {e}")
 
-    def export_to_pdf(self, article_data: Dict, filename: str = 'wikipedia_article.pdf'):
+    def export_to_pdf(self, article_data: Dict, filename: Union[str, BinaryIO] = 'wikipedia_article.pdf',
+                      full: bool = False):
         """
         Export artikel ke PDF
 
         Args:
             article_data: Data artikel yang akan di-export
-            filename: Nama file PDF output
+            filename: Nama file PDF output, atau buffer biner (misalnya
+                      io.BytesIO) yang diisi tanpa menyentuh disk
+            full: Export seluruh artikel (section sebagai judul, infobox
+                  sebagai tabel) tanpa batas 5000 karakter
+
+        Returns:
+            True jika berhasil
         """
+        if full:
+            return self.export_full_pdf(article_data, filename)
+
         try:
             # Create PDF document
             doc = SimpleDocTemplate(filename, pagesize=A4)
-            story = []
-            styles = getSampleStyleSheet()
-
-            # Custom styles
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                textColor='#000000',
-                spaceAfter=30,
-                alignment=TA_CENTER
-            )
 
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading2'],
-                fontSize=16,
-                textColor='#333333',
-                spaceAfter=12,
-                spaceBefore=12
-            )
+            # Build PDF
+            doc.build(self.pdf_story(article_data))
+            logger.info(f"PDF exported to {filename if isinstance(filename, str) else 'buffer'}")
+            return True
 
-            body_style = ParagraphStyle(
-                'CustomBody',
-                parent=styles['BodyText'],
-                fontSize=11,
-                alignment=TA_JUSTIFY,
-                spaceAfter=12
-            )
+        except Exception as e:
+            logger.error(f"Error exporting to PDF: {e}")
+            return False
 
-            # Title
-            if article_data.get('title'):
-                title = Paragraph(article_data['title'], title_style)
-                story.append(title)
-                story.append(Spacer(1, 0.2 * inch))
-
-            # URL
-            if article_data.get('url'):
-                url_text = f"<b>URL:</b> {article_data['url']}"
-                url_para = Paragraph(url_text, body_style)
-                story.append(url_para)
-                story.append(Spacer(1, 0.2 * inch))
-
-            # Summary
-            if article_data.get('summary'):
-                summary_heading = Paragraph("Summary", heading_style)
-                story.append(summary_heading)
-
-                # Clean summary text for PDF
-                summary_text = article_data['summary'].replace('<', '&lt;').replace('>', '&gt;')
-                summary_para = Paragraph(summary_text, body_style)
-                story.append(summary_para)
-                story.append(Spacer(1, 0.3 * inch))
-
-            # Categories
-            if article_data.get('categories'):
-                cat_heading = Paragraph("Categories", heading_style)
-                story.append(cat_heading)
-
-                categories_text = ', '.join(article_data['categories'][:10])
-                categories_para = Paragraph(categories_text, body_style)
-                story.append(categories_para)
-                story.append(Spacer(1, 0.3 * inch))
-
-            # Infobox
-            if article_data.get('infobox') and article_data['infobox']:
-                infobox_heading = Paragraph("Infobox", heading_style)
-                story.append(infobox_heading)
-
-                for key, value in list(article_data['infobox'].items())[:10]:
-                    # Clean text for PDF
-                    key_clean = key.replace('<', '&lt;').replace('>', '&gt;')
-                    value_clean = value.replace('<', '&lt;').replace('>', '&gt;')
-
-                    infobox_text = f"<b>{key_clean}:</b> {value_clean}"
-                    infobox_para = Paragraph(infobox_text, body_style)
-                    story.append(infobox_para)
-
-                story.append(Spacer(1, 0.3 * inch))
-
-            # References count
-            if 'references' in article_data:
-                ref_heading = Paragraph("References", heading_style)
-                story.append(ref_heading)
-
-                ref_text = f"Total references: {article_data['references']}"
-                ref_para = Paragraph(ref_text, body_style)
-                story.append(ref_para)
-                story.append(Spacer(1, 0.3 * inch))
-
-            # Content (limited to avoid huge PDFs)
-            if article_data.get('content'):
-                content_heading = Paragraph("Content", heading_style)
-                story.append(content_heading)
-
-                # Limit content length
-                content_text = article_data['content'][:5000]
-                if len(article_data['content']) > 5000:
-                    content_text += "\n\n... (Content truncated for PDF export)"
-
-                # Clean and split content into paragraphs
-                content_text = content_text.replace('<', '&lt;').replace('>', '&gt;')
-                paragraphs = content_text.split('\n')
-
-                for para_text in paragraphs[:50]:  # Limit to 50 paragraphs
-                    if para_text.strip():
-                        para = Paragraph(para_text.strip(), body_style)
-                        story.append(para)
+    def pdf_story(self, article_data: Dict) -> List:
+        """
+        Flowable PDF ringkas untuk satu artikel (konten dibatasi 5000 karakter)
 
-            # Build PDF
-            doc.build(story)
-            logger.info(f"PDF exported to {filename}")
+        Args:
+            article_data: Data artikel yang akan di-export
+
+        Returns:
+            List flowable ReportLab
+        """
+        story = []
+        title_style = PDF_TITLE_STYLE
+        heading_style = PDF_HEADING_STYLE
+        body_style = PDF_BODY_STYLE
+
+        # Title
+        if article_data.get('title'):
+            title = Paragraph(article_data['title'], title_style)
+            story.append(title)
+            story.append(Spacer(1, 0.2 * inch))
+
+        # URL
+        if article_data.get('url'):
+            url_text = f"<b>URL:</b> {article_data['url']}"
+            url_para = Paragraph(url_text, body_style)
+            story.append(url_para)
+            story.append(Spacer(1, 0.2 * inch))
+
+        # Summary
+        if article_data.get('summary'):
+            summary_heading = Paragraph("Summary", heading_style)
+            story.append(summary_heading)
+
+            # Clean summary text for PDF
+            summary_text = article_data['summary'].replace('<', '&lt;').replace('>', '&gt;')
+            summary_para = Paragraph(summary_text, body_style)
+            story.append(summary_para)
+            story.append(Spacer(1, 0.3 * inch))
+
+        # Categories
+        if article_data.get('categories'):
+            cat_heading = Paragraph("Categories", heading_style)
+            story.append(cat_heading)
+
+            categories_text = ', '.join(article_data['categories'][:10])
+            categories_para = Paragraph(categories_text, body_style)
+            story.append(categories_para)
+            story.append(Spacer(1, 0.3 * inch))
+
+        # Infobox
+        if article_data.get('infobox') and article_data['infobox']:
+            infobox_heading = Paragraph("Infobox", heading_style)
+            story.append(infobox_heading)
+
+            for key, value in list(article_data['infobox'].items())[:10]:
+                # Clean text for PDF
+                key_clean = key.replace('<', '&lt;').replace('>', '&gt;')
+                value_clean = value.replace('<', '&lt;').replace('>', '&gt;')
+
+                infobox_text = f"<b>{key_clean}:</b> {value_clean}"
+                infobox_para = Paragraph(infobox_text, body_style)
+                story.append(infobox_para)
+
+            story.append(Spacer(1, 0.3 * inch))
+
+        # References count
+        if 'references' in article_data:
+            ref_heading = Paragraph("References", heading_style)
+            story.append(ref_heading)
+
+            ref_text = f"Total references: {article_data['references']}"
+            ref_para = Paragraph(ref_text, body_style)
+            story.append(ref_para)
+            story.append(Spacer(1, 0.3 * inch))
+
+        # Content (limited to avoid huge PDFs)
+        if article_data.get('content'):
+            content_heading = Paragraph("Content", heading_style)
+            story.append(content_heading)
+
+            # Limit content length
+            content_text = article_data['content'][:5000]
+            if len(article_data['content']) > 5000:
+                content_text += "\n\n... (Content truncated for PDF export)"
+
+            # Clean and split content into paragraphs
+            content_text = content_text.replace('<', '&lt;').replace('>', '&gt;')
+            paragraphs = content_text.split('\n')
+
+            for para_text in paragraphs[:50]:  # Limit to 50 paragraphs
+                if para_text.strip():
+                    para = Paragraph(para_text.strip(), body_style)
+                    story.append(para)
+
+        return story
+
+    def export_full_pdf(self, article_data: Dict, filename: Union[str, BinaryIO] = 'wikipedia_article.pdf'):
+        """
+        Export seluruh artikel ke PDF
+
+        Flowable dibangun lazy per section selama halaman dirender, sehingga
+        memory tetap kecil untuk artikel terpanjang sekalipun. Waktu render
+        per halaman dicatat di log.
+
+        Args:
+            article_data: Data artikel yang akan di-export
+            filename: Nama file PDF output atau buffer biner
+
+        Returns:
+            True jika berhasil
+        """
+        try:
+            doc = TimedDocTemplate(filename, pagesize=A4)
+            start = time.perf_counter()
+            doc.build(LazyStory(self._full_pdf_flowables(article_data, doc.width)))
+            elapsed = time.perf_counter() - start
+
+            pages = len(doc.page_times)
+            for page, seconds in enumerate(doc.page_times, 1):
+                logger.debug(f"PDF page {page}: {seconds * 1000:.1f} ms")
+            logger.info(f"Full PDF exported to {filename if isinstance(filename, str) else 'buffer'}: "
+                        f"{pages} pages in {elapsed:.2f}s "
+                        f"({elapsed / max(pages, 1) * 1000:.1f} ms/page, "
+                        f"slowest {max(doc.page_times, default=0) * 1000:.1f} ms)")
             return True
 
         except Exception as e:
-            logger.error(f"Error exporting to PDF: {e}")
+            logger.error(f"Error exporting full PDF: {e}")
+            return False
+
+    def _full_pdf_flowables(self, article_data: Dict, width: float) -> Iterator:
+        """Flowable export PDF lengkap, dibangun satu per satu"""
+        if article_data.get('title'):
+            yield Paragraph(escape(article_data['title']), PDF_TITLE_STYLE)
+            yield Spacer(1, 0.2 * inch)
+
+        if article_data.get('url'):
+            yield Paragraph(f"<b>URL:</b> {escape(article_data['url'])}", PDF_BODY_STYLE)
+            yield Spacer(1, 0.2 * inch)
+
+        if article_data.get('infobox'):
+            yield Paragraph("Infobox", PDF_HEADING_STYLE)
+            rows = [
+                [Paragraph(f"<b>{escape(key)}</b>", PDF_CELL_STYLE), Paragraph(escape(value), PDF_CELL_STYLE)]
+                for key, value in article_data['infobox'].items()
+            ]
+            yield Table(rows, colWidths=[width * 0.3, width * 0.7], style=PDF_INFOBOX_TABLE_STYLE)
+            yield Spacer(1, 0.3 * inch)
+
+        for level, heading, paragraphs in iter_sections(article_data.get('content') or '',
+                                                        article_data.get('sections')):
+            if heading is not None:
+                style = PDF_HEADING_STYLE if level <= 2 else PDF_SUBHEADING_STYLE
+                yield Paragraph(escape(heading), style)
+            for text in paragraphs:
+                yield Paragraph(escape(text), PDF_BODY_STYLE)
+
+        if article_data.get('categories'):
+            yield Paragraph("Categories", PDF_HEADING_STYLE)
+            yield Paragraph(escape(', '.join(article_data['categories'])), PDF_BODY_STYLE)
+
+        if 'references' in article_data:
+            yield Paragraph("References", PDF_HEADING_STYLE)
+            yield Paragraph(f"Total references: {article_data['references']}", PDF_BODY_STYLE)
+
+    def render_pdf(self, article_data: Dict, full: bool = False) -> Optional[bytes]:
+        """
+        Render artikel ke PDF di memory
+
+        Args:
+            article_data: Data artikel yang akan di-export
+            full: Render seluruh artikel (lihat export_full_pdf)
+
+        Returns:
+            Isi file PDF, atau None jika gagal
+        """
+        buffer = io.BytesIO()
+        if not self.export_to_pdf(article_data, buffer, full=full):
+            return None
+        return buffer.getvalue()
+
+    def export_bundle_pdf(self, articles: List[Dict], filename: Union[str, BinaryIO] = 'wikipedia_bundle.pdf',
+                          title: str = 'Wikipedia Articles', full: bool = False):
+        """
+        Export banyak artikel ke satu PDF dengan daftar isi
+
+        Setiap artikel dimulai di halaman baru dan tercatat di daftar isi
+        serta bookmark PDF.
+
+        Args:
+            articles: List data artikel (misalnya hasil scrape_articles)
+            filename: Nama file PDF output atau buffer biner
+            title: Judul halaman pertama
+            full: Export seluruh isi setiap artikel (lihat export_full_pdf)
+
+        Returns:
+            True jika berhasil
+        """
+        try:
+            doc = BundleDocTemplate(filename, pagesize=A4)
+            toc = TableOfContents()
+            toc.levelStyles = [PDF_TOC_STYLE]
+
+            def story() -> Iterator:
+                yield Paragraph(escape(title), PDF_BUNDLE_TITLE_STYLE)
+                yield Paragraph("Contents", PDF_HEADING_STYLE)
+                yield toc
+                for article_data in articles:
+                    yield PageBreak()
+                    if full:
+                        yield from self._full_pdf_flowables(article_data, doc.width)
+                    else:
+                        yield from self.pdf_story(article_data)
+
+            # Story dibangun ulang per pass supaya flowable semua artikel tidak disimpan sekaligus
+            start = time.perf_counter()
+            passes = doc.lazyMultiBuild(story, [toc])
+            logger.info(f"PDF bundle of {len(articles)} articles exported to "
+                        f"{filename if isinstance(filename, str) else 'buffer'} "
+                        f"in {time.perf_counter() - start:.2f}s ({passes} passes)")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error exporting PDF bundle: {e}")
             return False
 
+    def render_bundle_pdf(self, articles: List[Dict], title: str = 'Wikipedia Articles',
+                          full: bool = False) -> Optional[bytes]:
+        """
+        Render bundle artikel ke PDF di memory (lihat export_bundle_pdf)
+
+        Returns:
+            Isi file PDF, atau None jika gagal
+        """
+        buffer = io.BytesIO()
+        if not self.export_bundle_pdf(articles, buffer, title=title, full=full):
+            return None
+        return buffer.getvalue()
+
+
+class PageSession:
+    """
+    Satu halaman yang di-fetch dan di-parse sekali, lalu dipakai bersama oleh
+    extractor homepage, article links dan JSON-LD
+    """
+
+    def __init__(self, scraper: WikipediaScraper, url: str, extractors: Optional[List[str]] = None):
+        """
+        Args:
+            scraper: WikipediaScraper yang dipakai untuk fetch dan parse
+            url: URL halaman
+            extractors: Extractor opsional yang dijalankan sekaligus pada traversal pertama
+        """
+        self.scraper = scraper
+        self.url = url
+        self.extractors = extractors
+        self._fetched = False
+        self._response = None
+        self._soup = None
+        self._results: Dict = {}
+
+    @property
+    def response(self) -> Optional[requests.Response]:
+        """Response halaman, di-fetch saat pertama kali dibutuhkan"""
+        if not self._fetched:
+            self._response = self.scraper.get_page(self.url)
+            self._fetched = True
+        return self._response
+
+    @property
+    def soup(self) -> Optional[BeautifulSoup]:
+        """Dokumen hasil parse, dibuat sekali"""
+        if self._soup is None and self.response:
+            self._soup = self.scraper.parse_html(self.response.text)
+        return self._soup
+
+    def extract(self, names: List[str]) -> Dict:
+        """
+        Jalankan extractor yang belum pernah dijalankan, hasil disimpan untuk
+        pemanggilan berikutnya
+
+        Args:
+            names: Nama extractor
+
+        Returns:
+            Dictionary nama extractor -> hasil, atau {} jika halaman gagal di-fetch
+        """
+        if self.soup is None:
+            return {}
+
+        missing = [name for name in names if name not in self._results]
+        if missing:
+            # Traversal pertama sekaligus menjalankan extractor yang diminta di awal
+            if not self._results and self.extractors:
+                missing = list(dict.fromkeys(list(self.extractors) + missing))
+            self._results.update(run_extractors(self.soup, missing))
+
+        return {name: self._results[name] for name in names}
+
+    def homepage(self, extractors: Optional[List[str]] = None) -> Dict:
+        """Data homepage (lihat WikipediaScraper.extract_homepage)"""
+        return self.extract(extractors or HOMEPAGE_EXTRACTORS)
+
+    def article_links(self, max_links: int = 20) -> List[str]:
+        """Link artikel dari halaman (lihat WikipediaScraper.scrape_article_links)"""
+        links = self.extract(['links']).get('links', [])
+        return self.scraper.filter_article_links(links, max_links)
+
+    def json_ld(self) -> List[Dict]:
+        """Objek JSON-LD dari halaman (lihat WikipediaScraper.extract_json_ld)"""
+        return self.extract(['json_ld']).get('json_ld', [])
+
 
 def main():
     """Main function untuk menjalankan scraper"""
@@ -459,8 +1575,23 @@ Examples:
   # Search in Indonesian and export to PDF
   python app.py -s "Indonesia" -l id --pdf
 
+  # Export the whole article (all sections, infobox as a table)
+  python app.py -s "World War II" --pdf --full-pdf
+
+  # Several articles in one PDF with a table of contents
+  python app.py --bundle "Python programming" "Java" "Rust" --full-pdf
+
   # Use different language
   python app.py -l id
+
+  # Disable the persistent HTTP cache
+  python app.py -s "Python programming" --no-cache
+
+  # Breadth-first crawl from the homepage article links (resumable)
+  python app.py --crawl --depth 2 --max-pages 500 --workers 8
+
+  # Crawl from specific seeds into a zstd-compressed JSONL file, rotated every 100 MB
+  python app.py --crawl --seed https://en.wikipedia.org/wiki/Python_(programming_language) --output pages.jsonl.zst --rotate-mb 100
         """
     )
 
@@ -486,15 +1617,186 @@ Examples:
         help='Export article detail to PDF (only works with --search)'
     )
 
+    parser.add_argument(
+        '--full-pdf',
+        action='store_true',
+        help='Export the whole article (all sections, infobox table) instead of the 5000-character summary (with --pdf or --bundle)'
+    )
+
+    parser.add_argument(
+        '--bundle',
+        type=str,
+        nargs='+',
+        help='Search several articles and export them into one PDF with a table of contents',
+        metavar='QUERY'
+    )
+
+    parser.add_argument(
+        '--parser',
+        type=str,
+        default=None,
+        choices=PARSER_BACKENDS,
+        help='HTML parser backend (default: $WIKI_SCRAPER_PARSER or html.parser)'
+    )
+
+    parser.add_argument(
+        '--backend',
+        type=str,
+        default=None,
+        choices=ARTICLE_BACKENDS,
+        help='Article extraction backend: html page scraping or MediaWiki API (default: $WIKI_SCRAPER_BACKEND or html)'
+    )
+
+    parser.add_argument(
+        '--full-parse',
+        action='store_true',
+        help='Build the full document tree instead of only the article regions'
+    )
+
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default='.cache',
+        help='Directory for the persistent HTTP, article and search caches (default: .cache)',
+        metavar='DIR'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the persistent HTTP, article and search caches'
+    )
+
+    parser.add_argument(
+        '--crawl',
+        action='store_true',
+        help='Breadth-first crawl following article links (resumes from --crawl-dir)'
+    )
+
+    parser.add_argument(
+        '--seed',
+        type=str,
+        nargs='+',
+        help='Seed URLs for --crawl (default: article links from the homepage)',
+        metavar='URL'
+    )
+
+    parser.add_argument(
+        '--depth',
+        type=int,
+        default=1,
+        help='Maximum link depth from the seeds for --crawl (default: 1)'
+    )
+
+    parser.add_argument(
+        '--max-pages',
+        type=int,
+        default=100,
+        help='Page budget for --crawl, 0 for unlimited (default: 100)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Concurrent crawl workers, or concurrent article fetches for --bundle (default: 4)'
+    )
+
+    parser.add_argument(
+        '--delay',
+        type=float,
+        default=1.0,
+        help='Minimum delay between requests to the same host in seconds (default: 1.0)'
+    )
+
+    parser.add_argument(
+        '--crawl-dir',
+        type=str,
+        default='.crawl',
+        help='Directory for the crawl frontier and checkpoints (default: .crawl)',
+        metavar='DIR'
+    )
+
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Stream article records to a JSON Lines file, compressed if it ends in .gz or .zst '
+             '(default: wikipedia_articles_detail_LANG.jsonl, or pages.jsonl in --crawl-dir for --crawl)',
+        metavar='FILE'
+    )
+
+    parser.add_argument(
+        '--rotate-mb',
+        type=float,
+        default=None,
+        help='Rotate --output into numbered files after this many megabytes',
+        metavar='MB'
+    )
+
     args = parser.parse_args()
 
     # Inisialisasi scraper dengan bahasa yang dipilih
     language_name = 'English' if args.language == 'en' else 'Indonesian'
     logger.info(f"Initializing scraper for {language_name} Wikipedia...")
-    scraper = WikipediaScraper(language=args.language)
+    http_cache = None
+    article_cache = None
+    search_cache = None
+    if not args.no_cache:
+        http_cache = HTTPCache(os.path.join(args.cache_dir, 'http'))
+        article_cache = ArticleCache(os.path.join(args.cache_dir, 'articles'))
+        search_cache = SearchCache(os.path.join(args.cache_dir, 'search'))
+    scraper = WikipediaScraper(
+        language=args.language,
+        http_cache=http_cache,
+        article_cache=article_cache,
+        search_cache=search_cache,
+        parser=args.parser,
+        partial_parse=not args.full_parse,
+        backend=args.backend
+    )
+
+    max_output_bytes = int(args.rotate_mb * 1024 * 1024) if args.rotate_mb else None
+
+    if args.crawl:
+        # Import di sini karena crawler mengimpor WikipediaScraper dari modul ini
+        from crawler import Crawler
+
+        seeds = args.seed or scraper.scrape_article_links(max_links=10)
+        crawler = Crawler(
+            scraper,
+            state_dir=args.crawl_dir,
+            output=args.output,
+            max_depth=args.depth,
+            max_pages=args.max_pages or None,
+            workers=args.workers,
+            delay=args.delay,
+            max_output_bytes=max_output_bytes
+        )
+        try:
+            stats = crawler.run(seeds)
+        finally:
+            crawler.close()
+
+        print(f"\nCrawl finished: {stats['done']} pages, {stats['failed']} failed, {stats['pending']} pending")
+        print(f"Output: {crawler.output}")
+
+    # Bundle beberapa artikel dalam satu PDF
+    elif args.bundle:
+        logger.info(f"Bundle mode: {len(args.bundle)} queries")
+        articles = scraper.scrape_articles(args.bundle, max_workers=args.workers)
+
+        if articles:
+            pdf_filename = f"wikipedia_bundle_{args.language}.pdf"
+            if scraper.export_bundle_pdf(articles, pdf_filename, full=args.full_pdf):
+                print(f"\nPDF bundle with {len(articles)} articles exported to: {pdf_filename}")
+            else:
+                print("Failed to export PDF bundle. Check logs for details.")
+        else:
+            print("\nNo articles found for the bundle queries")
 
     # Jika ada query search
-    if args.search:
+    elif args.search:
         logger.info(f"Search mode: Looking for '{args.search}'")
 
         # Search artikel
@@ -523,11 +1825,17 @@ Examples:
                 scraper.save_to_json(article_data, json_filename)
                 print(f"\nJSON data saved to: {json_filename}")
 
+                if args.output:
+                    # Output lama dipertahankan, record ditulis ke file bagian berikutnya
+                    with JSONLSink(args.output, max_bytes=max_output_bytes, append=True) as sink:
+                        sink.write(article_data)
+                    print(f"Record written to: {sink.current_path}")
+
                 # Export ke PDF jika diminta
                 if args.pdf:
                     pdf_filename = f"wikipedia_search_{args.search.replace(' ', '_')}.pdf"
                     print(f"\nExporting to PDF...")
-                    if scraper.export_to_pdf(article_data, pdf_filename):
+                    if scraper.export_to_pdf(article_data, pdf_filename, full=args.full_pdf):
                         print(f"PDF exported to: {pdf_filename}")
                     else:
                         print("Failed to export PDF. Check logs for details.")
@@ -543,8 +1851,10 @@ Examples:
 
     else:
         # Mode default: scrape homepage
+        # Homepage di-fetch dan di-parse sekali, semua extractor berjalan dalam satu traversal
         logger.info("Default mode: Scraping Wikipedia homepage...")
-        homepage_data = scraper.scrape_homepage()
+        page = scraper.open_page(scraper.base_url, extractors=HOMEPAGE_EXTRACTORS + ['json_ld'])
+        homepage_data = page.homepage()
 
         if homepage_data:
             logger.info(f"Homepage Title: {homepage_data.get('title')}")
@@ -554,12 +1864,9 @@ Examples:
             # Simpan data ke JSON
             scraper.save_to_json(homepage_data, f'wikipedia_homepage_{args.language}.json')
 
-        # Delay untuk menghindari rate limiting
-        time.sleep(1)
-
         # Extract article links
         logger.info("Extracting article links...")
-        article_links = scraper.scrape_article_links(max_links=10)
+        article_links = page.article_links(max_links=10)
 
         if article_links:
             logger.info(f"Found {len(article_links)} article links:")
@@ -572,31 +1879,26 @@ Examples:
                 'total': len(article_links)
             }, f'wikipedia_articles_{args.language}.json')
 
-            # Scrape beberapa artikel sebagai contoh
+            # Scrape beberapa artikel sebagai contoh, setiap artikel langsung ditulis ke output
             logger.info("Scraping sample articles...")
-            articles_data = []
-            for link in article_links[:3]:  # Ambil 3 artikel pertama
-                time.sleep(1)  # Delay antar request
-                article_data = scraper.scrape_article(link)
-                if article_data:
-                    articles_data.append(article_data)
-
-            if articles_data:
-                scraper.save_to_json({
-                    'articles': articles_data,
-                    'total': len(articles_data)
-                }, f'wikipedia_articles_detail_{args.language}.json')
+            output = args.output or f'wikipedia_articles_detail_{args.language}.jsonl'
+            with JSONLSink(output, max_bytes=max_output_bytes) as sink:
+                # Jeda antar request diatur oleh rate limiter
+                for link in article_links[:3]:  # Ambil 3 artikel pertama
+                    article_data = scraper.scrape_article(link)
+                    if article_data:
+                        sink.write(article_data)
+            logger.info(f"{sink.records} articles written to {output}")
 
         # Extract JSON-LD data
-        response = scraper.get_page(scraper.base_url)
-        if response:
-            json_ld_data = scraper.extract_json_ld(response.text)
-            if json_ld_data:
-                logger.info(f"Found {len(json_ld_data)} JSON-LD objects")
-                scraper.save_to_json({
-                    'json_ld': json_ld_data
-                }, f'wikipedia_jsonld_{args.language}.json')
+        json_ld_data = page.json_ld()
+        if json_ld_data:
+            logger.info(f"Found {len(json_ld_data)} JSON-LD objects")
+            scraper.save_to_json({
+                'json_ld': json_ld_data
+            }, f'wikipedia_jsonld_{args.language}.json')
 
+    scraper.close()
     logger.info("Scraping completed!")
 
 
@@ -0,0 +1,170 @@
+"""
+Cache artikel hasil ekstraksi untuk WikipediaScraper.scrape_article
+Record artikel (title, summary, content, categories, infobox, references)
+disimpan di SQLite dengan kunci canonical URL, bahasa dan revision id,
+sehingga lookup berulang tidak perlu request jaringan maupun parsing ulang.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ArticleCache:
+    """Cache record artikel di SQLite dengan TTL dan batas jumlah entry"""
+
+    def __init__(self, cache_dir: str = '.cache/articles', ttl: int = 3600,
+                 max_entries: int = 5000):
+        """
+        Args:
+            cache_dir: Direktori penyimpanan cache
+            ttl: Umur maksimum record (detik) sebelum dianggap kadaluarsa
+            max_entries: Jumlah maksimum record, yang paling lama tidak
+                         diakses dihapus lebih dulu
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, 'article_cache.sqlite')
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS articles (
+                canonical_url TEXT NOT NULL,
+                language TEXT NOT NULL,
+                revision_id INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (canonical_url, language, revision_id)
+            )
+        """)
+        # URL yang diminta (misalnya hasil search atau redirect) -> canonical URL
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS aliases (
+                url TEXT NOT NULL,
+                language TEXT NOT NULL,
+                canonical_url TEXT NOT NULL,
+                PRIMARY KEY (url, language)
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_articles_accessed ON articles (accessed_at)')
+        self._conn.commit()
+
+    def get(self, url: str, language: str) -> Optional[Dict]:
+        """
+        Ambil record artikel terbaru untuk URL yang masih dalam TTL
+
+        Args:
+            url: URL artikel (boleh URL asli maupun canonical)
+            language: Kode bahasa Wikipedia
+
+        Returns:
+            Dictionary artikel atau None jika tidak ada / kadaluarsa
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT canonical_url FROM aliases WHERE url = ? AND language = ?',
+                (url, language)
+            ).fetchone()
+            canonical_url = row[0] if row else url
+
+            row = self._conn.execute(
+                'SELECT revision_id, data FROM articles '
+                'WHERE canonical_url = ? AND language = ? AND created_at > ? '
+                'ORDER BY revision_id DESC LIMIT 1',
+                (canonical_url, language, now - self.ttl)
+            ).fetchone()
+
+            if not row:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                'UPDATE articles SET accessed_at = ? '
+                'WHERE canonical_url = ? AND language = ? AND revision_id = ?',
+                (now, canonical_url, language, row[0])
+            )
+            self._conn.commit()
+
+        self.hits += 1
+        return json.loads(row[1])
+
+    def put(self, url: str, canonical_url: str, language: str, revision_id: Optional[int], data: Dict):
+        """
+        Simpan record artikel
+
+        Args:
+            url: URL yang diminta
+            canonical_url: URL canonical artikel (setelah redirect)
+            language: Kode bahasa Wikipedia
+            revision_id: Revision id halaman, record tanpa revision id tidak disimpan
+            data: Dictionary artikel hasil scrape_article
+        """
+        if not revision_id:
+            return
+
+        now = time.time()
+        with self._lock:
+            # Revisi lama tidak dibutuhkan lagi setelah ada revisi yang lebih baru
+            self._conn.execute(
+                'DELETE FROM articles WHERE canonical_url = ? AND language = ? AND revision_id < ?',
+                (canonical_url, language, revision_id)
+            )
+            self._conn.execute(
+                'INSERT OR REPLACE INTO articles '
+                '(canonical_url, language, revision_id, data, created_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (canonical_url, language, revision_id, json.dumps(data, ensure_ascii=False), now, now)
+            )
+            for alias in {url, canonical_url}:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO aliases (url, language, canonical_url) VALUES (?, ?, ?)',
+                    (alias, language, canonical_url)
+                )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        """Hapus record kadaluarsa dan record berlebih (LRU)"""
+        self._conn.execute('DELETE FROM articles WHERE created_at <= ?', (now - self.ttl,))
+
+        count = self._conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                'DELETE FROM articles WHERE rowid IN '
+                '(SELECT rowid FROM articles ORDER BY accessed_at ASC LIMIT ?)',
+                (count - self.max_entries,)
+            )
+            logger.info(f"Article cache evicted {count - self.max_entries} entries")
+
+        self._conn.execute(
+            'DELETE FROM aliases WHERE canonical_url NOT IN (SELECT canonical_url FROM articles)'
+        )
+
+    def stats(self) -> Dict:
+        """Statistik cache: hits, misses, hit rate dan jumlah entry"""
+        with self._lock:
+            count = self._conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': count,
+        }
+
+    def close(self):
+        """Tutup koneksi database"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,123 @@
+"""
+Struktur section artikel
+Record artikel menyimpan content sebagai teks biasa (satu baris per blok
+teks) ditambah indeks section: list [level, nomor baris judul] yang
+menunjuk baris judul section di content. Dengan indeks ini content bisa
+dibaca ulang per section secara lazy, misalnya untuk export PDF lengkap,
+tanpa menyimpan struktur tambahan yang besar di cache.
+"""
+
+import re
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# Judul section di extract MediaWiki API dengan exsectionformat=wiki: "== Judul =="
+WIKI_HEADING_PATTERN = re.compile(r'^(={2,6})\s*(.*?)\s*\1$')
+
+# Tag judul section di HTML artikel (h1 hanya dipakai untuk judul halaman)
+HEADING_TAGS = ('h2', 'h3', 'h4', 'h5', 'h6')
+
+# Awalan penanda judul section. Extractor HTML menyisipkan text node
+# "\x00<level>" tepat sebelum teks judul, sehingga get_text() menghasilkan
+# baris penanda sebelum baris judul. Karakter NUL tidak pernah muncul di
+# teks HTML yang sudah di-parse, jadi baris lain tidak bisa tertukar dengan
+# penanda (berbeda dengan mencocokkan teks judul, yang bisa sama dengan
+# baris infobox atau daftar isi).
+SECTION_MARKER = '\x00'
+
+
+def heading_marker(level: int) -> str:
+    """Text node penanda untuk judul section level tertentu"""
+    return f"{SECTION_MARKER}{level}"
+
+
+def split_marked_headings(lines: Sequence[str]) -> Tuple[List[str], List[List[int]]]:
+    """
+    Buang baris penanda judul dari content dan catat posisi judulnya
+
+    Args:
+        lines: Baris hasil get_text() dengan penanda dari heading_marker()
+
+    Returns:
+        Tuple (baris content tanpa penanda, indeks section [level, nomor baris])
+    """
+    content = []
+    sections = []
+    for line in lines:
+        if line.startswith(SECTION_MARKER):
+            sections.append([int(line[1:]), len(content)])
+        else:
+            content.append(line)
+    # Penanda di akhir content tidak diikuti baris judul
+    return content, [section for section in sections if section[1] < len(content)]
+
+
+def split_wiki_headings(lines: List[str]) -> Tuple[List[str], List[List[int]]]:
+    """
+    Ubah baris "== Judul ==" dari extract API menjadi baris judul biasa
+
+    Args:
+        lines: Baris extract dengan exsectionformat=wiki
+
+    Returns:
+        Tuple (baris content tanpa tanda '=', sama dengan
+        exsectionformat=plain, dan indeks section)
+    """
+    content = []
+    sections = []
+    for line in lines:
+        match = WIKI_HEADING_PATTERN.match(line)
+        if match:
+            sections.append([len(match.group(1)), len(content)])
+            content.append(match.group(2))
+        else:
+            content.append(line)
+    return content, sections
+
+
+def iter_lines(text: str) -> Iterator[str]:
+    """Baris-baris text satu per satu tanpa membuat list seluruh baris"""
+    start = 0
+    while start <= len(text):
+        end = text.find('\n', start)
+        if end == -1:
+            end = len(text)
+        yield text[start:end]
+        start = end + 1
+
+
+def iter_sections(content: str, sections: Optional[List[List[int]]]
+                  ) -> Iterator[Tuple[int, Optional[str], List[str]]]:
+    """
+    Baca content artikel per section secara lazy
+
+    Args:
+        content: Content artikel (teks per baris)
+        sections: Indeks section dari record artikel (boleh None / kosong,
+                  misalnya record cache lama: seluruh content jadi satu section)
+
+    Returns:
+        Iterator (level, judul, paragraf); section pembuka punya level 0
+        dan judul None
+    """
+    starts = {index: level for level, index in sections or []}
+    level, heading, paragraphs = 0, None, []
+    skip = 0
+
+    for index, line in enumerate(iter_lines(content)):
+        if index in starts:
+            if heading is not None or paragraphs:
+                yield level, heading, paragraphs
+            level, heading, paragraphs = starts[index], line, []
+            continue
+        if skip:
+            skip -= 1
+            continue
+        if heading is not None and not paragraphs and line == '[':
+            # Link "[edit]" setelah judul section di HTML artikel
+            skip = 2
+            continue
+        if line.strip():
+            paragraphs.append(line.strip())
+
+    if heading is not None or paragraphs:
+        yield level, heading, paragraphs
@@ -0,0 +1,428 @@
+"""
+Async Wikipedia Scraper
+Versi asyncio dari WikipediaScraper berbasis httpx dengan connection pool
+bersama yang dibatasi, sehingga handler bot bisa await I/O yang benar-benar
+non-blocking tanpa menahan event loop.
+"""
+
+import time
+import asyncio
+import functools
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from app import WikipediaScraper, DEFAULT_HEADERS
+from http_cache import HTTPCache
+from article_cache import ArticleCache
+from search_cache import SearchCache
+from offload import OffloadExecutor, JobCancelled
+from rate_limiter import RateLimiter
+from resilience import Resilience, CircuitOpenError, RETRYABLE_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+def create_client(max_connections: int = 20, max_keepalive: int = 10,
+                  timeout: float = 10.0, connect_timeout: float = 5.0) -> httpx.AsyncClient:
+    """
+    Buat AsyncClient dengan connection pool yang dibatasi
+
+    Args:
+        max_connections: Jumlah maksimum koneksi bersamaan di pool
+        max_keepalive: Jumlah maksimum koneksi keep-alive yang disimpan
+        timeout: Timeout default per request (detik)
+        connect_timeout: Timeout untuk membuka koneksi TCP/TLS (detik)
+
+    Returns:
+        httpx.AsyncClient yang bisa dipakai bersama oleh beberapa scraper
+    """
+    # Accept-Encoding diserahkan ke httpx agar hanya encoding yang bisa
+    # di-decode (br butuh paket brotli) yang diminta
+    headers = {k: v for k, v in DEFAULT_HEADERS.items() if k != 'Accept-Encoding'}
+    return httpx.AsyncClient(
+        headers=headers,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive),
+        timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        follow_redirects=True,
+    )
+
+
+class AsyncWikipediaScraper:
+    """Async web scraper untuk Wikipedia"""
+
+    def __init__(self, language: str = 'en', client: Optional[httpx.AsyncClient] = None,
+                 http_cache: Optional[HTTPCache] = None,
+                 article_cache: Optional[ArticleCache] = None,
+                 executor: Optional[OffloadExecutor] = None, parser: Optional[str] = None,
+                 base_url: Optional[str] = None, backend: Optional[str] = None,
+                 rate_limiter: Optional[RateLimiter] = None, resilience: Optional[Resilience] = None,
+                 search_cache: Optional[SearchCache] = None):
+        """
+        Args:
+            language: Kode bahasa Wikipedia
+            client: AsyncClient bersama, jika None scraper membuat client sendiri
+            http_cache: HTTP cache persisten (opsional)
+            article_cache: Cache record artikel (opsional)
+            executor: Eksekutor untuk parsing artikel, jika None
+                      pekerjaan CPU-bound dijalankan langsung di event loop
+            parser: Backend parser HTML (lihat WikipediaScraper)
+            base_url: Ganti base URL Wikipedia (misalnya stand-in API server lokal)
+            backend: Backend ekstraksi artikel, 'html' atau 'api' (lihat WikipediaScraper)
+            rate_limiter: Rate limiter outbound (default: limiter bersama proses ini)
+            resilience: Kebijakan retry, hedging dan circuit breaker (default: bersama proses ini)
+            search_cache: Cache resolusi query -> URL artikel (opsional)
+        """
+        self.language = language
+        self.http_cache = http_cache
+        self.article_cache = article_cache
+        self.search_cache = search_cache
+        self.executor = executor
+        self._owns_client = client is None
+        self.client = client or create_client()
+        # Parsing dan ekstraksi dipakai ulang dari scraper sinkron (tanpa I/O)
+        self._extractor = WikipediaScraper(language=language, parser=parser, base_url=base_url,
+                                           backend=backend, rate_limiter=rate_limiter,
+                                           resilience=resilience, search_cache=search_cache)
+        self.rate_limiter = self._extractor.rate_limiter
+        self.resilience = self._extractor.resilience
+        self.parser = self._extractor.parser
+        self.backend = self._extractor.backend
+        self.base_url = self._extractor.base_url
+        self.api_url = self._extractor.api_url
+
+    async def _request(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                       timeout: Optional[float] = None) -> httpx.Response:
+        """
+        GET dengan rate limit, retry, hedging dan circuit breaker (lihat WikipediaScraper._request)
+
+        Args:
+            url: URL tujuan
+            params: Query parameter
+            headers: Header tambahan
+            timeout: Timeout baca per percobaan dalam detik (default: timeout client)
+
+        Returns:
+            Response object terakhir
+
+        Raises:
+            CircuitOpenError: Jika circuit host sedang terbuka
+            httpx.HTTPError: Jika semua percobaan gagal
+        """
+        host = urlparse(url).netloc
+        if url == self.api_url:
+            params = self.rate_limiter.api_params(params)
+        timeout = timeout if timeout is not None else self.client.timeout.read
+        deadline = time.monotonic() + self.resilience.deadline
+
+        for attempt in range(self.resilience.max_attempts):
+            self.resilience.check(host)
+            error = None
+            try:
+                response = await self._hedged_send(host, url, params, headers,
+                                                   self.resilience.attempt_timeout(timeout, deadline))
+            except httpx.TransportError as e:
+                self.resilience.record_failure(host)
+                error = e
+            except BaseException:
+                # Dibatalkan atau error lain: probe half-open tidak boleh menggantung
+                self.resilience.record_abandoned(host)
+                raise
+            else:
+                throttled = self.rate_limiter.throttle_delay(response.status_code, response.headers) is not None
+                if response.status_code not in RETRYABLE_STATUSES and not throttled:
+                    self.resilience.record_success(host)
+                    return response
+                self.resilience.record_failure(host)
+
+            delay = self.resilience.retry_wait(host, attempt, deadline,
+                                               self.rate_limiter.wait_time(url, self.language))
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            reason = repr(error) if error is not None else response.status_code
+            logger.warning(f"Request to {url} failed ({reason}), retrying")
+            await asyncio.sleep(delay)
+
+    async def _hedged_send(self, host: str, url: str, params: Optional[Dict], headers: Optional[Dict],
+                           timeout: float) -> httpx.Response:
+        """Kirim request, dan request duplikat jika yang pertama melewati latency p95 host"""
+        delay = self.resilience.hedge_delay(host)
+        if delay is None:
+            return await self._send(url, params, headers, timeout)
+
+        pending = {asyncio.ensure_future(self._send(url, params, headers, timeout))}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return done.pop().result()
+
+            logger.info(f"Hedging request after {delay:.2f}s: {url}")
+            pending.add(asyncio.ensure_future(self._send(url, params, headers, timeout)))
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # Request yang kalah dibatalkan
+            for task in pending:
+                task.cancel()
+
+    async def _send(self, url: str, params: Optional[Dict], headers: Optional[Dict],
+                    timeout: float) -> httpx.Response:
+        """Satu percobaan GET lewat rate limiter (lihat WikipediaScraper._send)"""
+        await self.rate_limiter.acquire_async(url, self.language)
+        start = time.monotonic()
+        response = await self.client.get(url, params=params, headers=headers,
+                                         timeout=httpx.Timeout(timeout, connect=self.resilience.connect_timeout))
+        self.resilience.record_latency(url, response.status_code, time.monotonic() - start)
+        self.rate_limiter.observe(url, self.language, response.status_code, response.headers)
+        return response
+
+    async def get_page(self, url: str, timeout: Optional[float] = None) -> Optional[httpx.Response]:
+        """
+        Mendapatkan halaman dari URL
+
+        Args:
+            url: URL yang akan di-scrape
+            timeout: Timeout baca dalam detik (default: timeout client)
+
+        Returns:
+            Response object atau None jika gagal
+        """
+        try:
+            logger.info(f"Fetching: {url}")
+            headers = {}
+            cached = await self._run_io(self.http_cache.lookup, url) if self.http_cache else None
+
+            if cached:
+                if cached['fresh']:
+                    logger.info(f"Cache hit: {url}")
+                    return self._cached_response(cached)
+                headers.update(self.http_cache.conditional_headers(cached))
+
+            response = await self._request(url, headers=headers, timeout=timeout)
+
+            if cached and response.status_code == 304:
+                logger.info(f"Not modified: {url}")
+                await self._run_io(self.http_cache.mark_revalidated, url, response.headers)
+                return self._cached_response(cached)
+
+            response.raise_for_status()
+
+            # Special:Random dan redirect lain tidak di-cache di bawah URL asal
+            if self.http_cache and not response.history:
+                await self._run_io(self.http_cache.store, url, str(response.url), response.headers, response.content)
+
+            return response
+        except (httpx.HTTPError, CircuitOpenError) as e:
+            logger.error(f"Error fetching {url}: {e}")
+            return None
+
+    def _cached_response(self, entry: Dict) -> httpx.Response:
+        """
+        Bangun Response object dari entry HTTP cache
+
+        Args:
+            entry: Entry hasil HTTPCache.lookup()
+
+        Returns:
+            Response object dengan status 200
+        """
+        return httpx.Response(
+            200,
+            headers=entry['headers'],
+            content=entry['body'],
+            request=httpx.Request('GET', entry['url']),
+        )
+
+    async def search_article(self, query: str) -> Optional[str]:
+        """
+        Search artikel di Wikipedia berdasarkan query
+
+        Args:
+            query: Kata kunci pencarian
+
+        Returns:
+            URL artikel yang ditemukan atau None
+        """
+        if self.search_cache:
+            cached = await self._run_io(self.search_cache.lookup, self.language, query)
+            if cached:
+                logger.info(f"Search cache hit: {query}")
+                return cached['url']
+
+        search_url = self.api_url
+        params = {
+            'action': 'opensearch',
+            'search': query,
+            'limit': 1,
+            'namespace': 0,
+            'redirects': 'resolve',
+            'format': 'json'
+        }
+
+        try:
+            logger.info(f"Searching for: {query}")
+            response = await self._request(search_url, params=params)
+            response.raise_for_status()
+
+            data = response.json()
+
+            if data and len(data) > 3 and data[3]:
+                article_url = data[3][0]
+                logger.info(f"Found article: {article_url}")
+                await self._run_io(self._extractor.cache_search, query, article_url)
+                return article_url
+            else:
+                logger.warning(f"No article found for query: {query}")
+                await self._run_io(self._extractor.cache_search, query, None)
+                return None
+
+        except Exception as e:
+            logger.error(f"Error searching: {e}")
+            return None
+
+    async def search_articles(self, queries: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Resolve banyak query sekaligus (lihat WikipediaScraper.search_articles)
+
+        Args:
+            queries: List kata kunci pencarian
+
+        Returns:
+            Dictionary query -> URL artikel (atau None jika tidak ditemukan)
+        """
+        unique = list(dict.fromkeys(q for q in queries if q and q.strip()))
+        results: Dict[str, Optional[str]] = {}
+        if self.search_cache:
+            results = await self._run_io(self._extractor.cached_titles, unique)
+            unique = [q for q in unique if q not in results]
+
+        for batch in self._extractor.title_lookup_batches(unique):
+            try:
+                logger.info(f"Resolving {len(batch)} titles in one request")
+                response = await self._request(self.api_url, params=self._extractor.title_lookup_params(batch))
+                response.raise_for_status()
+                urls = self._extractor.title_lookup_urls(batch, response.json())
+                if self.search_cache:
+                    await self._run_io(self._extractor.cache_titles, urls)
+                results.update(urls)
+            except Exception as e:
+                logger.error(f"Error resolving titles: {e}")
+
+        misses = [q for q in unique if q not in results]
+        if misses:
+            logger.info(f"Falling back to opensearch for {len(misses)} queries")
+            urls = await asyncio.gather(*(self.search_article(q) for q in misses))
+            results.update(zip(misses, urls))
+
+        return {q: results.get(q) for q in queries}
+
+    async def _run_io(self, func: Callable, *args):
+        """Jalankan I/O blocking (query SQLite HTTP, artikel dan search cache) di thread pool, di luar event loop"""
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+    async def _run_cpu(self, kind: str, func: Callable, *args,
+                       before_start: Optional[Callable[[], Awaitable[bool]]] = None):
+        """Jalankan pekerjaan CPU-bound lewat executor jika ada"""
+        if self.executor:
+            return await self.executor.run(kind, func, *args, before_start=before_start)
+        if before_start and not await before_start():
+            raise JobCancelled(kind)
+        return func(*args)
+
+    async def scrape_article(self, article_url: str,
+                             before_start: Optional[Callable[[], Awaitable[bool]]] = None) -> Dict:
+        """
+        Scrape artikel Wikipedia spesifik
+
+        Args:
+            article_url: URL artikel Wikipedia
+            before_start: Coroutine opsional sebelum parsing dimulai, jika
+                          mengembalikan False parsing dibatalkan (JobCancelled)
+
+        Returns:
+            Dictionary berisi data artikel
+        """
+        if self.article_cache:
+            cached = await self._run_io(self.article_cache.get, article_url, self.language)
+            if cached:
+                logger.info(f"Article cache hit: {cached['title']}")
+                return cached
+
+        if self.backend == 'api':
+            data, canonical_url = await self.scrape_article_api(article_url, before_start=before_start)
+            if not data:
+                return {}
+        else:
+            response = await self.get_page(article_url)
+            if not response:
+                return {}
+            data = await self._run_cpu(
+                'parse', self._extractor.extract_article, response.text, article_url,
+                before_start=before_start
+            )
+            canonical_url = str(response.url)
+
+        if self.article_cache:
+            await self._run_io(self.article_cache.put, article_url, canonical_url, self.language,
+                               data['revision_id'], data)
+
+        logger.info(f"Scraped article: {data['title']}")
+        return data
+
+    async def scrape_article_api(self, article_url: str,
+                                 before_start: Optional[Callable[[], Awaitable[bool]]] = None
+                                 ) -> Tuple[Dict, Optional[str]]:
+        """
+        Ambil data artikel lewat MediaWiki API (lihat WikipediaScraper.scrape_article_api)
+
+        Args:
+            article_url: URL artikel Wikipedia
+            before_start: Coroutine opsional sebelum parsing infobox dimulai
+
+        Returns:
+            Tuple (dictionary artikel atau {}, canonical URL atau None)
+        """
+        title = self._extractor.title_from_url(article_url)
+
+        try:
+            logger.info(f"Fetching via API: {title}")
+            response = await self._request(self.api_url, params=self._extractor.article_api_params(title))
+            response.raise_for_status()
+
+            page = self._extractor.api_page(response.json())
+            if not page:
+                logger.warning(f"Article not found via API: {title}")
+                return {}, None
+
+            response = await self._request(self.api_url, params=self._extractor.infobox_api_params(page['title']))
+            response.raise_for_status()
+            parse_data = response.json()
+        except Exception as e:
+            logger.error(f"Error fetching {title} via API: {e}")
+            return {}, None
+
+        data = await self._run_cpu(
+            'parse', self._extractor.build_api_article, article_url, page, parse_data,
+            before_start=before_start
+        )
+        return data, self._extractor.article_url(page['title'])
+
+    def extract_article(self, html_content: str, article_url: str) -> Dict:
+        """Extract data artikel dari HTML (lihat WikipediaScraper.extract_article)"""
+        return self._extractor.extract_article(html_content, article_url)
+
+    async def close(self):
+        """Tutup AsyncClient jika dibuat oleh scraper ini"""
+        self._extractor.close()
+        if self._owns_client:
+            await self.client.aclose()
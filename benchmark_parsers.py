@@ -0,0 +1,173 @@
+"""
+Benchmark backend parser HTML
+Membandingkan waktu dan peak memory extract_article untuk setiap backend
+parser (full parse dan partial parse) pada artikel yang disimpan di
+direktori fixtures, sekaligus memverifikasi bahwa semua varian menghasilkan
+output extract_article / extract_homepage yang identik.
+
+Contoh:
+  # Simpan beberapa artikel sebagai fixture (butuh koneksi internet)
+  python benchmark_parsers.py --fetch "Python (programming language)" "Indonesia"
+
+  # Jalankan benchmark
+  python benchmark_parsers.py
+  python benchmark_parsers.py --repeat 10 --parsers lxml selectolax
+
+  # Fixture kecil yang ikut di-commit (tanpa koneksi internet)
+  python benchmark_parsers.py --fixtures tests/fixtures
+"""
+
+import os
+import time
+import argparse
+import statistics
+import tracemalloc
+from typing import Dict, Optional
+from urllib.parse import quote
+
+from app import WikipediaScraper, PARSER_BACKENDS, logger
+
+DEFAULT_FIXTURES_DIR = 'fixtures'
+
+
+def fetch_fixtures(titles, fixtures_dir: str, language: str = 'en'):
+    """
+    Download artikel dan simpan HTML-nya sebagai fixture
+
+    Args:
+        titles: Judul artikel Wikipedia
+        fixtures_dir: Direktori fixture
+        language: Kode bahasa Wikipedia
+    """
+    os.makedirs(fixtures_dir, exist_ok=True)
+    scraper = WikipediaScraper(language=language)
+
+    for title in titles:
+        url = f"{scraper.base_url}/wiki/{quote(title.replace(' ', '_'))}"
+        response = scraper.get_page(url)
+        if not response:
+            continue
+
+        filename = os.path.join(fixtures_dir, f"{language}_{title.replace(' ', '_').replace('/', '_')}.html")
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        print(f"Saved {url} -> {filename}")
+
+
+def time_call(func, repeat: int) -> float:
+    """Median waktu eksekusi func (detik)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def peak_memory(func) -> int:
+    """Peak memory (byte) yang dialokasikan selama func berjalan"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def build_variants(parsers) -> Dict[str, WikipediaScraper]:
+    """
+    Scraper untuk setiap varian yang dibandingkan
+
+    Backend BeautifulSoup diukur dua kali: full parse dan partial parse
+    (hanya region artikel). selectolax selalu mem-parse seluruh dokumen.
+    """
+    variants = {}
+    for name in parsers:
+        if name == 'selectolax':
+            variants[name] = WikipediaScraper(parser=name)
+        else:
+            variants[name] = WikipediaScraper(parser=name, partial_parse=False)
+            variants[f"{name}+partial"] = WikipediaScraper(parser=name, partial_parse=True)
+    return variants
+
+
+def run_benchmark(fixtures_dir: str, parsers, repeat: int) -> Optional[bool]:
+    """
+    Jalankan benchmark untuk semua fixture
+
+    Args:
+        fixtures_dir: Direktori fixture (*.html)
+        parsers: Backend parser yang dibandingkan
+        repeat: Jumlah pengulangan per pengukuran
+
+    Returns:
+        True jika output semua backend identik, None jika tidak ada fixture
+    """
+    fixtures = []
+    if os.path.isdir(fixtures_dir):
+        fixtures = sorted(f for f in os.listdir(fixtures_dir) if f.endswith('.html'))
+    if not fixtures:
+        print(f"No fixtures found in {fixtures_dir}. Use --fetch to save some articles first.")
+        return None
+
+    variants = build_variants(parsers)
+    labels = list(variants)
+    identical = True
+
+    header = f"{'fixture':<32} {'size KB':>8} " + ' '.join(f"{label:>20}" for label in labels)
+    print(header)
+    print(' ' * 42 + ' '.join(f"{'time / peak MB':>20}" for _ in labels))
+    for fixture in fixtures:
+        with open(os.path.join(fixtures_dir, fixture), encoding='utf-8') as f:
+            html_content = f.read()
+
+        outputs = {}
+        results = {}
+        for label, scraper in variants.items():
+            outputs[label] = (
+                scraper.extract_article(html_content, fixture),
+                scraper.extract_homepage(html_content),
+            )
+            extract = lambda: scraper.extract_article(html_content, fixture)
+            results[label] = (time_call(extract, repeat), peak_memory(extract))
+
+        reference = outputs[labels[0]]
+        mismatches = [label for label, output in outputs.items() if output != reference]
+        if mismatches:
+            identical = False
+
+        row = f"{fixture[:32]:<32} {len(html_content) / 1024:>8.0f} "
+        row += ' '.join(
+            f"{f'{elapsed * 1000:.1f}ms / {peak / 1024 / 1024:.1f}':>20}"
+            for elapsed, peak in (results[label] for label in labels)
+        )
+        if mismatches:
+            row += f"  MISMATCH: {', '.join(mismatches)}"
+        print(row)
+
+    return identical
+
+
+def main():
+    """Main function untuk benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark HTML parser backends on saved article fixtures')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES_DIR, help='Fixtures directory (default: fixtures)')
+    parser.add_argument('--parsers', nargs='+', default=list(PARSER_BACKENDS), choices=PARSER_BACKENDS,
+                        help='Parser backends to compare')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions per measurement (default: 5)')
+    parser.add_argument('--fetch', nargs='+', metavar='TITLE', help='Download articles into the fixtures directory')
+    parser.add_argument('-l', '--language', default='en', help='Wikipedia language for --fetch (default: en)')
+    args = parser.parse_args()
+
+    if args.fetch:
+        fetch_fixtures(args.fetch, args.fixtures, args.language)
+        return
+
+    logger.setLevel('WARNING')
+    identical = run_benchmark(args.fixtures, args.parsers, args.repeat)
+    if identical is not None:
+        print("\nAll variants produce identical output." if identical else "\nVariants produce DIFFERENT output!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Callback data tombol inline bot Telegram
+Telegram membatasi callback_data maksimal 64 byte. Payload pendek dikirim
+langsung ("pdf:Python"); payload yang lebih panjang (misalnya dua judul
+untuk "PDF Keduanya") disimpan di memory dan tombol hanya membawa kunci
+pendeknya ("pdfbundle#<kunci>"). Payload tersimpan dibatasi jumlahnya
+(LRU), tombol yang payload-nya sudah terhapus dianggap kedaluwarsa.
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Batas callback_data dari Telegram Bot API (byte UTF-8)
+MAX_CALLBACK_BYTES = 64
+
+# Pemisah action dan payload langsung / kunci payload tersimpan
+INLINE_SEPARATOR = ':'
+STORED_SEPARATOR = '#'
+
+
+class CallbackPayloads:
+    """Encode dan decode callback_data, payload panjang disimpan dengan kunci pendek"""
+
+    def __init__(self, max_entries: int = 10000):
+        """
+        Args:
+            max_entries: Jumlah payload tersimpan maksimum
+        """
+        self.max_entries = max_entries
+        self._payloads: 'OrderedDict[str, str]' = OrderedDict()
+
+    def encode(self, action: str, payload: str) -> str:
+        """
+        callback_data untuk tombol
+
+        Args:
+            action: Nama action tanpa ':' dan '#', misalnya 'pdf'
+            payload: Data tombol, misalnya query artikel
+
+        Returns:
+            callback_data yang muat dalam batas 64 byte
+        """
+        data = f"{action}{INLINE_SEPARATOR}{payload}"
+        if len(data.encode('utf-8')) <= MAX_CALLBACK_BYTES:
+            return data
+
+        # Kunci dari isi payload: tombol dengan payload sama memakai entry yang sama
+        key = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+        self._payloads[key] = payload
+        self._payloads.move_to_end(key)
+        while len(self._payloads) > self.max_entries:
+            self._payloads.popitem(last=False)
+        return f"{action}{STORED_SEPARATOR}{key}"
+
+    def decode(self, data: str) -> Tuple[str, Optional[str]]:
+        """
+        Pisahkan callback_data menjadi action dan payload
+
+        Args:
+            data: callback_data dari CallbackQuery
+
+        Returns:
+            Tuple (action, payload); payload None jika tombol tidak membawa
+            payload atau payload tersimpannya sudah kedaluwarsa
+        """
+        inline = data.find(INLINE_SEPARATOR)
+        stored = data.find(STORED_SEPARATOR)
+        if stored != -1 and (inline == -1 or stored < inline):
+            action, key = data[:stored], data[stored + 1:]
+            payload = self._payloads.get(key)
+            if payload is None:
+                logger.info(f"Callback payload expired: {data}")
+            else:
+                self._payloads.move_to_end(key)
+            return action, payload
+        if inline != -1:
+            return data[:inline], data[inline + 1:]
+        return data, None
@@ -0,0 +1,246 @@
+"""
+Export columnar (Parquet / Arrow IPC) untuk record artikel
+Record scrape_article ditulis per batch dengan schema tetap ke dua tabel:
+
+  articles/  satu baris per artikel (url, title, summary, content,
+             categories, references, revision_id, infobox_size)
+  infobox/   tabel panjang satu baris per pasangan infobox
+             (url, revision_id, position, key, value)
+
+Setiap exporter menulis satu part file baru di masing-masing direktori
+(part-00000.parquet, part-00001.parquet, ...), sehingga seluruh direktori
+bisa dibaca sebagai satu dataset dengan pyarrow.dataset atau pandas.
+
+pyarrow adalah dependency opsional: pip install pyarrow
+
+Contoh:
+  # Konversi output JSON Lines (boleh .gz / .zst) ke dataset Parquet
+  python columnar_export.py pages.jsonl.zst --out dataset
+  python columnar_export.py wikipedia_articles_detail_en.jsonl --out dataset --format arrow
+"""
+
+import os
+import re
+import argparse
+import logging
+from typing import Dict, Iterable, List
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - dependency opsional
+    pa = None
+    pq = None
+
+from output_sink import read_jsonl
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('parquet', 'arrow')
+FORMAT_EXTENSIONS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+if pa is not None:
+    ARTICLE_SCHEMA = pa.schema([
+        ('url', pa.string()),
+        ('title', pa.string()),
+        ('summary', pa.string()),
+        ('content', pa.string()),
+        ('categories', pa.list_(pa.string())),
+        ('references', pa.int32()),
+        ('revision_id', pa.int64()),
+        ('infobox_size', pa.int16()),
+    ])
+
+    INFOBOX_SCHEMA = pa.schema([
+        ('url', pa.string()),
+        ('revision_id', pa.int64()),
+        ('position', pa.int16()),
+        ('key', pa.string()),
+        ('value', pa.string()),
+    ])
+
+
+def is_available() -> bool:
+    """Cek apakah pyarrow ter-install"""
+    return pa is not None
+
+
+class _TableWriter:
+    """Buffer kolom + writer Parquet/Arrow untuk satu tabel"""
+
+    def __init__(self, path: str, schema, file_format: str, compression: str):
+        self.path = path
+        self.schema = schema
+        self.rows = 0
+        # Perkiraan ukuran buffer: ukuran UTF-8 nilai string (content artikel mendominasi)
+        self.buffered_bytes = 0
+        self._columns: Dict[str, List] = {name: [] for name in schema.names}
+        if file_format == 'parquet':
+            self._writer = pq.ParquetWriter(path, schema, compression=compression)
+        else:
+            self._writer = pa.ipc.new_file(path, schema)
+
+    def __len__(self) -> int:
+        return len(self._columns[self.schema.names[0]])
+
+    def append(self, row: Dict):
+        for name, values in self._columns.items():
+            value = row[name]
+            values.append(value)
+            if isinstance(value, str):
+                self.buffered_bytes += len(value.encode('utf-8'))
+
+    def flush(self):
+        """Tulis buffer sebagai satu record batch (satu row group di Parquet)"""
+        if not len(self):
+            return
+        batch = pa.RecordBatch.from_pydict(self._columns, schema=self.schema)
+        self._writer.write_batch(batch)
+        self.rows += batch.num_rows
+        self.buffered_bytes = 0
+        self._columns = {name: [] for name in self.schema.names}
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+
+
+class ColumnarExporter:
+    """Tulis record artikel ke dataset columnar secara batch"""
+
+    def __init__(self, directory: str, file_format: str = 'parquet', batch_size: int = 500,
+                 compression: str = 'zstd', max_batch_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            directory: Direktori dataset (berisi articles/ dan infobox/)
+            file_format: 'parquet' atau 'arrow' (Arrow IPC file)
+            batch_size: Jumlah artikel maksimum per batch / row group
+            compression: Kompresi Parquet ('zstd', 'snappy', 'gzip' atau 'none')
+            max_batch_bytes: Batch juga ditulis begitu teks yang di-buffer (byte UTF-8)
+                             melewati ukuran ini, supaya memory tetap terbatas untuk artikel panjang
+        """
+        if pa is None:
+            raise ValueError("Columnar export requires the pyarrow package: pip install pyarrow")
+        if file_format not in FORMATS:
+            raise ValueError(f"Unknown format: {file_format} (choose from {', '.join(FORMATS)})")
+
+        self.directory = directory
+        self.file_format = file_format
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        part = self._next_part()
+        self.articles = self._open_table('articles', ARTICLE_SCHEMA, part, compression)
+        self.infobox = self._open_table('infobox', INFOBOX_SCHEMA, part, compression)
+
+    def _next_part(self) -> int:
+        """Nomor part file berikutnya (part yang sudah ada tidak ditimpa)"""
+        extension = FORMAT_EXTENSIONS[self.file_format]
+        pattern = re.compile(rf"part-(\d{{5}}){re.escape(extension)}$")
+        table_dir = os.path.join(self.directory, 'articles')
+        if not os.path.isdir(table_dir):
+            return 0
+        matches = (pattern.match(f) for f in os.listdir(table_dir))
+        return max((int(m.group(1)) + 1 for m in matches if m), default=0)
+
+    def _open_table(self, name: str, schema, part: int, compression: str) -> _TableWriter:
+        table_dir = os.path.join(self.directory, name)
+        os.makedirs(table_dir, exist_ok=True)
+        path = os.path.join(table_dir, f"part-{part:05d}{FORMAT_EXTENSIONS[self.file_format]}")
+        return _TableWriter(path, schema, self.file_format, compression)
+
+    def write(self, record: Dict):
+        """
+        Tambahkan satu record artikel (format hasil scrape_article)
+
+        Args:
+            record: Dictionary artikel; kunci di luar schema diabaikan
+        """
+        infobox = record.get('infobox') or {}
+        self.articles.append({
+            'url': record.get('url'),
+            'title': record.get('title'),
+            'summary': record.get('summary'),
+            'content': record.get('content'),
+            'categories': list(record.get('categories') or []),
+            'references': record.get('references'),
+            'revision_id': record.get('revision_id'),
+            'infobox_size': len(infobox),
+        })
+        for position, (key, value) in enumerate(infobox.items()):
+            self.infobox.append({
+                'url': record.get('url'),
+                'revision_id': record.get('revision_id'),
+                'position': position,
+                'key': key,
+                'value': value,
+            })
+
+        if (len(self.articles) >= self.batch_size
+                or self.articles.buffered_bytes + self.infobox.buffered_bytes >= self.max_batch_bytes):
+            self.flush()
+
+    def write_many(self, records: Iterable[Dict]) -> int:
+        """
+        Tambahkan banyak record
+
+        Returns:
+            Jumlah record yang ditulis
+        """
+        count = 0
+        for record in records:
+            self.write(record)
+            count += 1
+        return count
+
+    def flush(self):
+        """Tulis batch yang sedang di-buffer"""
+        self.articles.flush()
+        self.infobox.flush()
+
+    def close(self):
+        """Flush dan tutup kedua tabel"""
+        self.articles.close()
+        self.infobox.close()
+        logger.info(f"Exported {self.articles.rows} articles and {self.infobox.rows} infobox rows to {self.directory}")
+
+    def __enter__(self) -> 'ColumnarExporter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def convert_jsonl(paths: Iterable[str], directory: str, file_format: str = 'parquet',
+                  batch_size: int = 500) -> int:
+    """
+    Konversi file JSON Lines (output JSONLSink) ke dataset columnar
+
+    Args:
+        paths: File .jsonl / .jsonl.gz / .jsonl.zst
+        directory: Direktori dataset
+        file_format: 'parquet' atau 'arrow'
+        batch_size: Jumlah artikel per batch
+
+    Returns:
+        Jumlah artikel yang diekspor
+    """
+    with ColumnarExporter(directory, file_format=file_format, batch_size=batch_size) as exporter:
+        return sum(exporter.write_many(read_jsonl(path)) for path in paths)
+
+
+def main():
+    """Main function untuk konversi JSON Lines ke Parquet/Arrow"""
+    parser = argparse.ArgumentParser(description='Convert scraped JSON Lines articles to a columnar dataset')
+    parser.add_argument('inputs', nargs='+', help='JSON Lines files (.jsonl, .jsonl.gz, .jsonl.zst)')
+    parser.add_argument('--out', default='dataset', help='Dataset directory (default: dataset)')
+    parser.add_argument('--format', default='parquet', choices=FORMATS, help='Output format (default: parquet)')
+    parser.add_argument('--batch-size', type=int, default=500, help='Articles per batch / row group (default: 500)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    count = convert_jsonl(args.inputs, args.out, args.format, args.batch_size)
+    print(f"Exported {count} articles to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,485 @@
+"""
+Crawler breadth-first untuk Wikipedia
+Mulai dari seed URL, crawler mengikuti link artikel sampai kedalaman dan
+budget halaman tertentu dengan beberapa worker bersamaan. Frontier
+disimpan di SQLite (antrian on-disk) dan URL yang sudah pernah dilihat
+dicatat di Bloom filter, sehingga memory tetap kecil untuk jutaan URL.
+State crawl di-checkpoint ke direktori crawl sehingga crawl yang terhenti
+bisa dilanjutkan, dan setiap halaman langsung ditulis ke file JSONL.
+Halaman baru dicatat selesai di database saat checkpoint, setelah output
+di-flush, sehingga crash tidak menghilangkan record (paling buruk halaman
+terakhir di-crawl ulang dan muncul dua kali di output).
+"""
+
+import os
+import re
+import math
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from html import unescape
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from app import WikipediaScraper
+from output_sink import JSONLSink
+
+logger = logging.getLogger(__name__)
+
+# Link artikel di HTML halaman (tanpa fragment dan query string)
+WIKI_LINK_PATTERN = re.compile(r'href="(/wiki/[^"#?]+)')
+
+# State URL di antrian
+PENDING, IN_PROGRESS, DONE, FAILED = 0, 1, 2, 3
+
+
+class BloomFilter:
+    """Bloom filter berbasis bytearray untuk deduplikasi URL"""
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        """
+        Args:
+            capacity: Perkiraan jumlah item yang akan dimasukkan
+            error_rate: Probabilitas false positive pada kapasitas penuh
+        """
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        """Posisi bit untuk item (double hashing dari satu digest)"""
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> bool:
+        """
+        Tambahkan item
+
+        Returns:
+            True jika item belum pernah ada (kemungkinan besar baru)
+        """
+        added = False
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                added = True
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[p // 8] & (1 << (p % 8)) for p in self._positions(item))
+
+    def save(self, path: str):
+        """Simpan bit array ke file secara atomik"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self.size.to_bytes(8, 'little'))
+            f.write(self.hashes.to_bytes(1, 'little'))
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> bool:
+        """
+        Muat bit array dari file
+
+        Returns:
+            True jika file ada dan ukurannya cocok dengan filter ini
+        """
+        if not os.path.exists(path):
+            return False
+        with open(path, 'rb') as f:
+            size = int.from_bytes(f.read(8), 'little')
+            hashes = int.from_bytes(f.read(1), 'little')
+            bits = f.read()
+        if size != self.size or hashes != self.hashes or len(bits) != len(self.bits):
+            logger.warning(f"Bloom filter {path} does not match capacity/error rate, rebuilding")
+            return False
+        self.bits = bytearray(bits)
+        return True
+
+
+class Frontier:
+    """Antrian URL on-disk (SQLite) dengan deduplikasi Bloom filter"""
+
+    def __init__(self, state_dir: str, capacity: int = 1_000_000, error_rate: float = 0.001):
+        """
+        Args:
+            state_dir: Direktori state crawl (antrian dan Bloom filter)
+            capacity: Perkiraan jumlah URL unik (ukuran Bloom filter)
+            error_rate: False positive rate Bloom filter
+        """
+        os.makedirs(state_dir, exist_ok=True)
+        self.bloom_path = os.path.join(state_dir, 'seen.bloom')
+        self.seen = BloomFilter(capacity, error_rate)
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._conn = sqlite3.connect(os.path.join(state_dir, 'frontier.sqlite'), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS queue (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+                state INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_queue_state ON queue (state, id)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+        self._conn.commit()
+        # URL yang sudah selesai tapi status DONE-nya belum ditulis (menunggu checkpoint)
+        self._unsaved_done: List[int] = []
+        self._resume()
+
+    def _resume(self):
+        """Pulihkan state dari crawl sebelumnya (jika ada)"""
+        # URL yang sedang dikerjakan saat crawl terhenti dikerjakan ulang
+        self._conn.execute('UPDATE queue SET state = ? WHERE state = ?', (PENDING, IN_PROGRESS))
+        self._conn.commit()
+
+        # URL yang masuk antrian setelah checkpoint terakhir belum ada di
+        # Bloom filter yang tersimpan
+        checkpoint_id = self._meta('bloom_checkpoint_id') if self.seen.load(self.bloom_path) else 0
+        for (url,) in self._conn.execute('SELECT url FROM queue WHERE id > ?', (checkpoint_id,)):
+            self.seen.add(url)
+
+        self.counts = {state: 0 for state in (PENDING, IN_PROGRESS, DONE, FAILED)}
+        for state, count in self._conn.execute('SELECT state, COUNT(*) FROM queue GROUP BY state'):
+            self.counts[state] = count
+        if self.counts[DONE] or self.counts[PENDING]:
+            logger.info(f"Resuming crawl: {self.counts[DONE]} done, {self.counts[PENDING]} pending")
+
+    def _meta(self, key: str, default: int = 0) -> int:
+        row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def add(self, urls: List[str], depth: int) -> int:
+        """
+        Masukkan URL baru ke antrian
+
+        Args:
+            urls: URL yang ditemukan
+            depth: Kedalaman URL dari seed
+
+        Returns:
+            Jumlah URL yang benar-benar baru
+        """
+        with self._lock:
+            new_urls = [(url, depth) for url in urls if self.seen.add(url)]
+            if new_urls:
+                self._conn.executemany('INSERT INTO queue (url, depth) VALUES (?, ?)', new_urls)
+                self._conn.commit()
+                self.counts[PENDING] += len(new_urls)
+                self._changed.notify_all()
+            return len(new_urls)
+
+    def claim(self, max_pages: Optional[int]) -> Optional[Tuple[int, str, int]]:
+        """
+        Ambil URL berikutnya (urutan BFS) dan tandai sedang dikerjakan
+
+        Args:
+            max_pages: Budget halaman, None jika tidak dibatasi
+
+        Returns:
+            Tuple (id, url, depth) atau None jika antrian kosong / budget habis
+        """
+        with self._lock:
+            if max_pages is not None and self.processed() + self.counts[IN_PROGRESS] >= max_pages:
+                return None
+            row = self._conn.execute(
+                'SELECT id, url, depth FROM queue WHERE state = ? ORDER BY id LIMIT 1', (PENDING,)
+            ).fetchone()
+            if not row:
+                return None
+            self._conn.execute('UPDATE queue SET state = ? WHERE id = ?', (IN_PROGRESS, row[0]))
+            self._conn.commit()
+            self.counts[PENDING] -= 1
+            self.counts[IN_PROGRESS] += 1
+            return row
+
+    def finish(self, item_id: int, ok: bool) -> int:
+        """
+        Tandai URL selesai (DONE) atau gagal (FAILED)
+
+        Status DONE baru ditulis ke database pada checkpoint() berikutnya,
+        yang dipanggil setelah output record-nya di-flush. Sampai saat itu
+        URL tetap IN_PROGRESS di database dan dikerjakan ulang jika crawl
+        terhenti.
+
+        Returns:
+            Jumlah halaman yang sudah dikerjakan setelah URL ini
+        """
+        state = DONE if ok else FAILED
+        with self._lock:
+            if ok:
+                self._unsaved_done.append(item_id)
+            else:
+                self._conn.execute('UPDATE queue SET state = ? WHERE id = ?', (state, item_id))
+                self._conn.commit()
+            self.counts[IN_PROGRESS] -= 1
+            self.counts[state] += 1
+            self._changed.notify_all()
+            return self.processed()
+
+    def processed(self) -> int:
+        """Jumlah halaman yang sudah dikerjakan (berhasil maupun gagal)"""
+        return self.counts[DONE] + self.counts[FAILED]
+
+    def wait(self, timeout: float = 1.0) -> bool:
+        """
+        Tunggu sampai ada URL baru atau worker lain selesai
+
+        Returns:
+            False jika crawl sudah habis (tidak ada antrian dan tidak ada yang dikerjakan)
+        """
+        with self._lock:
+            if not self.counts[PENDING] and not self.counts[IN_PROGRESS]:
+                return False
+            self._changed.wait(timeout)
+            return True
+
+    def checkpoint(self):
+        """
+        Simpan status DONE yang tertunda, Bloom filter dan posisi antrian yang
+        sudah tercakup. Output record harus sudah di-flush sebelum dipanggil.
+        """
+        with self._lock:
+            if self._unsaved_done:
+                self._conn.executemany('UPDATE queue SET state = ? WHERE id = ?',
+                                       [(DONE, item_id) for item_id in self._unsaved_done])
+                self._unsaved_done = []
+            last_id = self._conn.execute('SELECT COALESCE(MAX(id), 0) FROM queue').fetchone()[0]
+            self.seen.save(self.bloom_path)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', ('bloom_checkpoint_id', last_id)
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Checkpoint dan tutup koneksi database"""
+        self.checkpoint()
+        with self._lock:
+            self._conn.close()
+
+
+class HostPoliteness:
+    """Batas per host: jeda minimum antar request dan jumlah request bersamaan"""
+
+    def __init__(self, delay: float = 1.0, max_per_host: int = 2):
+        """
+        Args:
+            delay: Jeda minimum (detik) antar dimulainya request ke host yang sama
+            max_per_host: Jumlah maksimum request bersamaan ke host yang sama
+        """
+        self.delay = delay
+        self.max_per_host = max_per_host
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.Semaphore] = {}
+        self._next_allowed: Dict[str, float] = {}
+
+    def acquire(self, host: str):
+        """Tunggu sampai boleh mengirim request ke host"""
+        with self._lock:
+            slot = self._slots.setdefault(host, threading.Semaphore(self.max_per_host))
+        slot.acquire()
+
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_allowed.get(host, 0.0))
+            self._next_allowed[host] = start + self.delay
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, host: str):
+        """Lepas slot request ke host"""
+        self._slots[host].release()
+
+
+class Crawler:
+    """Crawler breadth-first dengan beberapa worker thread"""
+
+    def __init__(self, scraper: WikipediaScraper, state_dir: str = '.crawl',
+                 output: Optional[str] = None, max_depth: int = 1,
+                 max_pages: Optional[int] = 100, workers: int = 4, delay: float = 1.0,
+                 max_per_host: int = 2, capacity: int = 1_000_000,
+                 checkpoint_every: int = 100, max_output_bytes: Optional[int] = None):
+        """
+        Args:
+            scraper: WikipediaScraper untuk fetch dan ekstraksi (HTTP cache dipakai jika ada)
+            state_dir: Direktori state crawl, crawl dengan direktori yang sama dilanjutkan
+            output: File JSONL output, boleh .gz/.zst (default: pages.jsonl di state_dir);
+                    crawl yang dilanjutkan menulis ke file bagian baru (pages-00001.jsonl, ...)
+            max_depth: Kedalaman maksimum dari seed (seed = 0)
+            max_pages: Budget halaman total termasuk crawl sebelumnya, None = tanpa batas
+            workers: Jumlah worker bersamaan
+            delay: Jeda minimum antar request ke host yang sama (detik)
+            max_per_host: Jumlah maksimum request bersamaan per host
+            capacity: Perkiraan jumlah URL unik untuk ukuran Bloom filter
+            checkpoint_every: Simpan checkpoint setiap N halaman
+            max_output_bytes: Rotasi file output setelah ukuran ini (lihat JSONLSink)
+        """
+        self.scraper = scraper
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.workers = workers
+        self.checkpoint_every = checkpoint_every
+        self.frontier = Frontier(state_dir, capacity=capacity)
+        self.politeness = HostPoliteness(delay, max_per_host)
+        self.output = output or os.path.join(state_dir, 'pages.jsonl')
+        self.max_output_bytes = max_output_bytes
+        self._stop = threading.Event()
+        # Menjaga urutan write -> finish dan flush -> checkpoint antar worker
+        self._output_lock = threading.Lock()
+
+    def extract_links(self, html_content: str, page_url: str) -> List[str]:
+        """
+        Ambil link artikel dari HTML halaman tanpa membangun tree kedua
+
+        Args:
+            html_content: HTML string halaman
+            page_url: URL halaman (menentukan host untuk link relatif)
+
+        Returns:
+            List of article URLs tanpa duplikat
+        """
+        parsed = urlparse(page_url)
+        links = [{'url': unescape(href), 'text': ''} for href in WIKI_LINK_PATTERN.findall(html_content)]
+        return self.scraper.filter_article_links(links, max_links=len(links), base_url=f"{parsed.scheme}://{parsed.netloc}")
+
+    def page_links(self, url: str, response=None) -> List[str]:
+        """
+        Link artikel dari satu halaman sesuai backend scraper
+
+        Backend 'api' memakai daftar link dari MediaWiki API; backend 'html'
+        mengambil link dari response halaman yang sudah di-fetch
+        scrape_article_page, dan hanya mengambil halaman lagi jika data
+        artikel berasal dari article cache.
+
+        Args:
+            url: URL artikel
+            response: Response halaman artikel jika sudah ada
+
+        Returns:
+            List of article URLs
+        """
+        if self.scraper.backend == 'api':
+            return self.scraper.article_links_api(url)
+        if response is None:
+            response = self.scraper.get_page(url)
+            if not response:
+                return []
+        return self.extract_links(response.text, response.url)
+
+    def crawl_page(self, url: str, depth: int) -> Optional[Dict]:
+        """
+        Scrape satu artikel dan masukkan link-nya ke frontier
+
+        Artikel diambil lewat scraper.scrape_article_page, sehingga backend
+        ('html' / 'api') dan article cache scraper ikut dipakai, dan link
+        diambil dari response halaman yang sama.
+
+        Args:
+            url: URL artikel
+            depth: Kedalaman URL dari seed
+
+        Returns:
+            Record artikel atau None jika gagal
+        """
+        host = urlparse(url).netloc
+        follow = depth < self.max_depth
+        self.politeness.acquire(host)
+        try:
+            data, response = self.scraper.scrape_article_page(url)
+            links = self.page_links(url, response) if data and follow else []
+        finally:
+            self.politeness.release(host)
+        if not data:
+            return None
+
+        # Salinan: record dari article cache tidak boleh ikut berubah
+        data = {**data, 'depth': depth}
+        if links:
+            self.frontier.add(links, depth + 1)
+
+        return data
+
+    def _worker(self, sink: JSONLSink):
+        """Loop worker: ambil URL, crawl, tulis hasil"""
+        while not self._stop.is_set():
+            item = self.frontier.claim(self.max_pages)
+            if item is None:
+                if self.max_pages is not None and self.frontier.processed() >= self.max_pages:
+                    return
+                if not self.frontier.wait():
+                    return
+                continue
+
+            item_id, url, depth = item
+            try:
+                data = self.crawl_page(url, depth)
+            except Exception as e:
+                logger.error(f"Error crawling {url}: {e}")
+                data = None
+
+            with self._output_lock:
+                if data:
+                    sink.write(data)
+                processed = self.frontier.finish(item_id, data is not None)
+                if processed % self.checkpoint_every == 0:
+                    # Flush dulu: halaman hanya dicatat DONE jika record-nya sudah di disk
+                    sink.flush()
+                    self.frontier.checkpoint()
+                    logger.info(f"Checkpoint: {processed} pages crawled")
+
+    def run(self, seeds: List[str]) -> Dict[str, int]:
+        """
+        Jalankan crawl sampai frontier habis, budget tercapai atau Ctrl+C
+
+        Args:
+            seeds: URL awal (diabaikan jika sudah pernah masuk frontier)
+
+        Returns:
+            Dictionary statistik crawl (done, failed, pending)
+        """
+        self.frontier.add(seeds, 0)
+        # Output crawl sebelumnya dipertahankan, lanjutan ditulis ke file bagian baru
+        sink = JSONLSink(self.output, max_bytes=self.max_output_bytes, append=True)
+        threads = [
+            threading.Thread(target=self._worker, args=(sink,), name=f"crawler-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        logger.info(f"Crawling with {self.workers} workers, depth {self.max_depth}, "
+                    f"budget {self.max_pages or 'unlimited'} -> {self.output}")
+
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            logger.warning("Interrupted, finishing in-flight pages and saving checkpoint...")
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+        finally:
+            sink.close()
+            self.frontier.checkpoint()
+
+        return self.stats()
+
+    def stats(self) -> Dict[str, int]:
+        """Statistik crawl: done, failed dan pending"""
+        counts = self.frontier.counts
+        return {
+            'done': counts[DONE],
+            'failed': counts[FAILED],
+            'pending': counts[PENDING] + counts[IN_PROGRESS],
+        }
+
+    def close(self):
+        """Tutup frontier"""
+        self.frontier.close()
@@ -0,0 +1,216 @@
+"""
+Single-pass extractor framework
+Extractor yang terdaftar menerima elemen dari satu traversal dokumen,
+sehingga waktu ekstraksi sebanding dengan ukuran dokumen dan bukan dengan
+jumlah extractor yang dijalankan.
+"""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+from bs4 import BeautifulSoup, Tag
+
+logger = logging.getLogger(__name__)
+
+# Registry nama extractor -> class
+EXTRACTORS: Dict[str, Type['Extractor']] = {}
+
+
+def register_extractor(cls: Type['Extractor']) -> Type['Extractor']:
+    """Decorator untuk mendaftarkan extractor berdasarkan atribut name"""
+    EXTRACTORS[cls.name] = cls
+    return cls
+
+
+class Extractor(ABC):
+    """
+    Base class extractor
+
+    Subclass menentukan name (kunci hasil), tags (nama tag yang ingin
+    diterima) dan mengimplementasikan visit() serta result().
+    """
+
+    name = ''
+    tags: Iterable[str] = ()
+
+    @abstractmethod
+    def visit(self, tag: Tag):
+        """Dipanggil untuk setiap elemen yang namanya ada di tags, urut dokumen"""
+
+    @abstractmethod
+    def result(self) -> Any:
+        """Hasil ekstraksi setelah traversal selesai"""
+
+
+@register_extractor
+class TitleExtractor(Extractor):
+    """Isi tag <title> pertama"""
+
+    name = 'title'
+    tags = ('title',)
+
+    def __init__(self):
+        self.title = None
+
+    def visit(self, tag: Tag):
+        if self.title is None:
+            self.title = tag.get_text(strip=True)
+
+    def result(self) -> str:
+        return self.title or ''
+
+
+@register_extractor
+class MetaDescriptionExtractor(Extractor):
+    """Atribut content dari <meta name="description"> pertama"""
+
+    name = 'meta_description'
+    tags = ('meta',)
+
+    def __init__(self):
+        self.description = None
+
+    def visit(self, tag: Tag):
+        if self.description is None and tag.get('name') == 'description':
+            self.description = tag.get('content', '')
+
+    def result(self) -> str:
+        return self.description or ''
+
+
+@register_extractor
+class LinksExtractor(Extractor):
+    """Semua <a href> beserta teksnya"""
+
+    name = 'links'
+    tags = ('a',)
+
+    def __init__(self):
+        self.links = []
+
+    def visit(self, tag: Tag):
+        href = tag.get('href')
+        if href is not None:
+            self.links.append({
+                'url': href,
+                'text': tag.get_text(strip=True)
+            })
+
+    def result(self) -> List[Dict]:
+        return self.links
+
+
+@register_extractor
+class ImagesExtractor(Extractor):
+    """Semua <img> beserta src dan alt"""
+
+    name = 'images'
+    tags = ('img',)
+
+    def __init__(self):
+        self.images = []
+
+    def visit(self, tag: Tag):
+        self.images.append({
+            'src': tag.get('src', ''),
+            'alt': tag.get('alt', '')
+        })
+
+    def result(self) -> List[Dict]:
+        return self.images
+
+
+@register_extractor
+class HeadingsExtractor(Extractor):
+    """Heading h1-h6, diurutkan per level lalu urutan dokumen"""
+
+    name = 'headings'
+    tags = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+    def __init__(self):
+        self.by_level = {level: [] for level in range(1, 7)}
+
+    def visit(self, tag: Tag):
+        level = int(tag.name[1])
+        self.by_level[level].append({
+            'level': level,
+            'text': tag.get_text(strip=True)
+        })
+
+    def result(self) -> List[Dict]:
+        return [heading for level in range(1, 7) for heading in self.by_level[level]]
+
+
+@register_extractor
+class ScriptsExtractor(Extractor):
+    """Atribut src dari semua <script src> (untuk identifikasi teknologi)"""
+
+    name = 'scripts'
+    tags = ('script',)
+
+    def __init__(self):
+        self.scripts = []
+
+    def visit(self, tag: Tag):
+        src = tag.get('src')
+        if src is not None:
+            self.scripts.append(src)
+
+    def result(self) -> List[str]:
+        return self.scripts
+
+
+@register_extractor
+class JsonLdExtractor(Extractor):
+    """Objek JSON-LD dari <script type="application/ld+json">"""
+
+    name = 'json_ld'
+    tags = ('script',)
+
+    def __init__(self):
+        self.objects = []
+
+    def visit(self, tag: Tag):
+        if tag.get('type') != 'application/ld+json':
+            return
+        try:
+            self.objects.append(json.loads(tag.string))
+        except (json.JSONDecodeError, TypeError, AttributeError) as e:
+            logger.warning(f"Failed to parse JSON-LD: {e}")
+
+    def result(self) -> List[Dict]:
+        return self.objects
+
+
+def run_extractors(soup: BeautifulSoup, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Jalankan extractor terpilih dalam satu traversal dokumen
+
+    Args:
+        soup: BeautifulSoup object
+        names: Nama extractor yang dijalankan (default: semua yang terdaftar)
+
+    Returns:
+        Dictionary nama extractor -> hasil
+    """
+    names = list(names) if names is not None else list(EXTRACTORS)
+    unknown = [name for name in names if name not in EXTRACTORS]
+    if unknown:
+        raise ValueError(f"Unknown extractor(s): {', '.join(unknown)}")
+
+    extractors = [EXTRACTORS[name]() for name in names]
+
+    # Dispatch table: nama tag -> extractor yang tertarik
+    dispatch: Dict[str, List[Extractor]] = {}
+    for extractor in extractors:
+        for tag_name in extractor.tags:
+            dispatch.setdefault(tag_name, []).append(extractor)
+
+    for element in soup.descendants:
+        if isinstance(element, Tag):
+            for extractor in dispatch.get(element.name, ()):
+                extractor.visit(element)
+
+    return {extractor.name: extractor.result() for extractor in extractors}
@@ -0,0 +1,191 @@
+"""
+Fast path ekstraksi berbasis selectolax (lexbor)
+Menghasilkan output yang sama dengan ekstraksi BeautifulSoup di
+WikipediaScraper.extract_article / extract_homepage, tetapi parsing dan
+query CSS dijalankan di C sehingga jauh lebih cepat untuk artikel besar.
+
+selectolax adalah dependency opsional: pip install selectolax
+"""
+
+import re
+from typing import Dict, Optional
+
+from article_sections import HEADING_TAGS, heading_marker, split_marked_headings
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - dependency opsional
+    LexborHTMLParser = None
+
+# Teks di dalam tag ini diabaikan oleh BeautifulSoup.get_text()
+NON_TEXT_TAGS = {'script', 'style', 'template'}
+
+
+def is_available() -> bool:
+    """Cek apakah selectolax ter-install"""
+    return LexborHTMLParser is not None
+
+
+def _attr(node, name: str, default: str = '') -> str:
+    """Ambil atribut dengan semantik BeautifulSoup (atribut tanpa nilai -> '')"""
+    attributes = node.attributes
+    if name not in attributes:
+        return default
+    value = attributes[name]
+    return value if value is not None else ''
+
+
+def _get_text(node, separator: str = '', strip: bool = False) -> str:
+    """
+    Ekuivalen BeautifulSoup Tag.get_text(separator, strip)
+
+    Args:
+        node: Node selectolax
+        separator: Pemisah antar string
+        strip: Strip setiap string dan buang string kosong
+
+    Returns:
+        Teks gabungan dari semua text node turunan
+    """
+    strings = []
+    for child in node.traverse(include_text=True):
+        if child.tag != '-text' or child.parent.tag in NON_TEXT_TAGS:
+            continue
+        text = child.text_content
+        if strip:
+            text = text.strip()
+            if not text:
+                continue
+        strings.append(text)
+    return separator.join(strings)
+
+
+def _first_child(node, tag: str) -> Optional[object]:
+    """Ekuivalen node.find(tag, recursive=False)"""
+    for child in node.iter():
+        if child.tag == tag:
+            return child
+    return None
+
+
+def extract_article(html_content: str, article_url: str) -> Dict:
+    """
+    Extract data artikel dari HTML (lihat WikipediaScraper.extract_article)
+
+    Args:
+        html_content: HTML string halaman artikel
+        article_url: URL artikel
+
+    Returns:
+        Dictionary berisi data artikel
+    """
+    tree = LexborHTMLParser(html_content)
+
+    data = {
+        'url': article_url,
+        'title': '',
+        'summary': '',
+        'content': '',
+        'categories': [],
+        'references': [],
+        'infobox': {},
+        'revision_id': None,
+        'sections': [],
+    }
+
+    revision_match = re.search(r'"wgRevisionId":(\d+)', html_content)
+    if revision_match:
+        data['revision_id'] = int(revision_match.group(1))
+
+    title_tag = tree.css_first('h1.firstHeading')
+    if title_tag:
+        data['title'] = _get_text(title_tag, strip=True)
+
+    content_div = tree.css_first('div.mw-parser-output')
+    if content_div:
+        first_p = _first_child(content_div, 'p')
+        if first_p:
+            data['summary'] = _get_text(first_p, strip=True)
+
+        for heading in content_div.css(', '.join(HEADING_TAGS)):
+            headline = heading.css_first('.mw-headline') or heading
+            if _get_text(headline, strip=True):
+                headline.insert_before(heading_marker(int(heading.tag[1])))
+
+        lines, data['sections'] = split_marked_headings(
+            _get_text(content_div, separator='\n', strip=True).split('\n')
+        )
+        data['content'] = '\n'.join(lines)
+
+    categories_div = tree.css_first('div#mw-normal-catlinks')
+    if categories_div:
+        for cat_link in categories_div.css('a'):
+            text = _get_text(cat_link, strip=True)
+            if text != 'Categories':
+                data['categories'].append(text)
+
+    infobox = tree.css_first('table.infobox')
+    if infobox:
+        for row in infobox.css('tr'):
+            header = row.css_first('th')
+            value = row.css_first('td')
+            if header and value:
+                data['infobox'][_get_text(header, strip=True)] = _get_text(value, strip=True)
+
+    data['references'] = len(tree.css('li[id^="cite_note"]'))
+
+    return data
+
+
+def extract_homepage(html_content: str) -> Dict:
+    """
+    Extract data homepage dari HTML (lihat WikipediaScraper.extract_homepage)
+
+    Args:
+        html_content: HTML string
+
+    Returns:
+        Dictionary berisi title, meta description, links, images, headings dan scripts
+    """
+    tree = LexborHTMLParser(html_content)
+
+    data = {
+        'title': '',
+        'meta_description': '',
+        'links': [],
+        'images': [],
+        'headings': [],
+        'scripts': [],
+    }
+
+    title_tag = tree.css_first('title')
+    if title_tag:
+        data['title'] = _get_text(title_tag, strip=True)
+
+    meta_desc = tree.css_first('meta[name="description"]')
+    if meta_desc:
+        data['meta_description'] = _attr(meta_desc, 'content')
+
+    for link in tree.css('a[href]'):
+        data['links'].append({
+            'url': _attr(link, 'href'),
+            'text': _get_text(link, strip=True)
+        })
+
+    for img in tree.css('img'):
+        data['images'].append({
+            'src': _attr(img, 'src'),
+            'alt': _attr(img, 'alt')
+        })
+
+    for i in range(1, 7):
+        for heading in tree.css(f'h{i}'):
+            data['headings'].append({
+                'level': i,
+                'text': _get_text(heading, strip=True)
+            })
+
+    for script in tree.css('script[src]'):
+        data['scripts'].append(_attr(script, 'src'))
+
+    return data
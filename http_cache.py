@@ -0,0 +1,230 @@
+"""
+HTTP Cache persisten untuk WikipediaScraper
+Menyimpan body halaman beserta ETag/Last-Modified di SQLite, melakukan
+revalidasi dengan If-None-Match / If-Modified-Since, dan eviksi LRU
+berdasarkan total ukuran body.
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Header yang ikut disimpan bersama body (Content-Encoding sengaja tidak
+# disimpan karena body yang disimpan sudah dalam bentuk ter-decode)
+STORED_HEADERS = ('content-type', 'etag', 'last-modified', 'cache-control', 'content-language')
+
+
+class HTTPCache:
+    """Cache HTTP di disk dengan revalidasi kondisional dan eviksi LRU"""
+
+    def __init__(self, cache_dir: str = '.cache/http', max_size_mb: int = 200,
+                 min_ttl: int = 60):
+        """
+        Args:
+            cache_dir: Direktori penyimpanan cache
+            max_size_mb: Batas total ukuran body di cache (MB)
+            min_ttl: Durasi (detik) sebuah entry dianggap fresh dan dilayani
+                     tanpa request ke server, untuk response tanpa Cache-Control
+                     max-age / no-cache maupun Expires
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, 'http_cache.sqlite')
+        self.max_size = max_size_mb * 1024 * 1024
+        self.min_ttl = min_ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                final_url TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fresh_until REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)')
+        self._conn.commit()
+
+    def _freshness(self, headers: Dict) -> Optional[float]:
+        """
+        Hitung batas waktu fresh dari header Cache-Control
+
+        Returns:
+            Timestamp fresh_until atau None jika response tidak boleh disimpan
+        """
+        cache_control = (headers.get('cache-control') or '').lower()
+        if 'no-store' in cache_control:
+            return None
+
+        now = time.time()
+        # Directive eksplisit dari server selalu diikuti; min_ttl hanya untuk
+        # response tanpa informasi freshness sama sekali
+        if re.search(r'(?:^|[,\s])no-cache(?:$|[,\s=])', cache_control):
+            return now
+
+        match = re.search(r'(?:^|[,\s])max-age=(\d+)', cache_control)
+        if match:
+            return now + int(match.group(1))
+
+        if headers.get('expires'):
+            try:
+                return parsedate_to_datetime(headers['expires']).timestamp()
+            except (TypeError, ValueError):
+                # Expires yang tidak valid berarti sudah kadaluarsa (RFC 9111)
+                return now
+
+        return now + self.min_ttl
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """
+        Cari entry cache untuk URL
+
+        Args:
+            url: URL yang diminta
+
+        Returns:
+            Dictionary entry (url, headers, body, etag, last_modified, fresh)
+            atau None jika tidak ada
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT final_url, headers, body, etag, last_modified, fresh_until '
+                'FROM entries WHERE url = ?', (url,)
+            ).fetchone()
+            if not row:
+                self.misses += 1
+                return None
+
+            self._conn.execute('UPDATE entries SET accessed_at = ? WHERE url = ?', (time.time(), url))
+            self._conn.commit()
+
+        entry = {
+            'url': row[0],
+            'headers': json.loads(row[1]),
+            'body': row[2],
+            'etag': row[3],
+            'last_modified': row[4],
+            'fresh': row[5] > time.time(),
+        }
+        if entry['fresh']:
+            self.hits += 1
+        return entry
+
+    def conditional_headers(self, entry: Dict) -> Dict[str, str]:
+        """
+        Header untuk request revalidasi
+
+        Args:
+            entry: Entry hasil lookup()
+
+        Returns:
+            Dictionary header If-None-Match / If-Modified-Since
+        """
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url: str, final_url: str, headers: Dict, body: bytes):
+        """
+        Simpan response 200 ke cache
+
+        Args:
+            url: URL yang diminta (kunci cache)
+            final_url: URL akhir setelah redirect
+            headers: Header response
+            body: Body response (sudah ter-decode)
+        """
+        headers = {k.lower(): v for k, v in headers.items()}
+        fresh_until = self._freshness(headers)
+        if fresh_until is None:
+            return
+
+        stored = {k: headers[k] for k in STORED_HEADERS if k in headers}
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries '
+                '(url, final_url, headers, body, size, etag, last_modified, fresh_until, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, final_url, json.dumps(stored), body, len(body),
+                 headers.get('etag'), headers.get('last-modified'), fresh_until, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def mark_revalidated(self, url: str, headers: Dict):
+        """
+        Perbarui masa fresh entry setelah server menjawab 304 Not Modified
+
+        Args:
+            url: URL yang diminta
+            headers: Header response 304
+        """
+        headers = {k.lower(): v for k, v in headers.items()}
+        fresh_until = self._freshness(headers) or time.time()
+        self.revalidated += 1
+
+        with self._lock:
+            self._conn.execute(
+                'UPDATE entries SET fresh_until = ?, accessed_at = ?, '
+                'etag = COALESCE(?, etag) WHERE url = ?',
+                (fresh_until, time.time(), headers.get('etag'), url)
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        """Hapus entry yang paling lama tidak diakses sampai ukuran di bawah batas"""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_size:
+            return
+
+        evicted = 0
+        for url, size in self._conn.execute(
+            'SELECT url, size FROM entries ORDER BY accessed_at ASC'
+        ).fetchall():
+            if total <= self.max_size:
+                break
+            self._conn.execute('DELETE FROM entries WHERE url = ?', (url,))
+            total -= size
+            evicted += 1
+
+        logger.info(f"HTTP cache evicted {evicted} entries")
+
+    def stats(self) -> Dict:
+        """Statistik cache: hits, revalidated, misses, jumlah entry dan ukuran"""
+        with self._lock:
+            count, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries'
+            ).fetchone()
+        return {
+            'hits': self.hits,
+            'revalidated': self.revalidated,
+            'misses': self.misses,
+            'entries': count,
+            'size_bytes': size,
+        }
+
+    def close(self):
+        """Tutup koneksi database"""
+        with self._lock:
+            self._conn.close()
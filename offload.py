@@ -0,0 +1,126 @@
+"""
+Offload pekerjaan CPU-bound (parsing HTML, ekstraksi artikel) ke thread pool atau process pool, supaya event loop bot tetap responsif.
+Setiap jenis pekerjaan punya batas konkurensi sendiri dan kedalaman
+antriannya bisa dipantau.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Batas konkurensi default per jenis pekerjaan
+DEFAULT_LIMITS = {
+    'parse': 4,
+}
+
+
+class JobCancelled(Exception):
+    """Pekerjaan dibatalkan sebelum dijalankan (misalnya pesan user sudah dihapus)"""
+
+
+class OffloadExecutor:
+    """Eksekutor pekerjaan CPU-bound dengan batas konkurensi per jenis"""
+
+    def __init__(self, mode: str = 'thread', max_workers: Optional[int] = None,
+                 limits: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            mode: 'thread' atau 'process'
+            max_workers: Jumlah worker pool (default dari concurrent.futures)
+            limits: Batas konkurensi per jenis pekerjaan, misalnya {'parse': 4}
+        """
+        if mode not in ('thread', 'process'):
+            raise ValueError(f"Unknown offload mode: {mode}")
+
+        self.mode = mode
+        self.limits = dict(DEFAULT_LIMITS)
+        self.limits.update(limits or {})
+        self._executor: Executor = (
+            ProcessPoolExecutor(max_workers=max_workers) if mode == 'process'
+            else ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='offload')
+        )
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._queued = defaultdict(int)
+        self._running = defaultdict(int)
+
+    def _semaphore(self, kind: str) -> asyncio.Semaphore:
+        """Semaphore per jenis pekerjaan, dibuat di dalam event loop yang aktif"""
+        if kind not in self._semaphores:
+            self._semaphores[kind] = asyncio.Semaphore(self.limits.get(kind, 1))
+        return self._semaphores[kind]
+
+    async def run(self, kind: str, func: Callable, *args,
+                  before_start: Optional[Callable[[], Awaitable[bool]]] = None, **kwargs):
+        """
+        Jalankan func di pool setelah mendapat slot untuk jenis pekerjaan ini
+
+        Args:
+            kind: Jenis pekerjaan (misalnya 'parse')
+            func: Fungsi CPU-bound (harus picklable untuk mode process)
+            before_start: Coroutine opsional yang dipanggil setelah keluar dari
+                          antrian; jika mengembalikan False pekerjaan dibatalkan
+
+        Returns:
+            Hasil func
+
+        Raises:
+            JobCancelled: Jika before_start mengembalikan False
+        """
+        semaphore = self._semaphore(kind)
+        self._queued[kind] += 1
+        try:
+            if semaphore.locked():
+                logger.info(f"Offload queue '{kind}': {self._queued[kind]} waiting")
+            await semaphore.acquire()
+        finally:
+            # Dikurangi juga jika dibatalkan (asyncio.CancelledError) saat masih di antrian
+            self._queued[kind] -= 1
+
+        try:
+            if before_start and not await before_start():
+                logger.info(f"Offload job '{kind}' cancelled before start")
+                raise JobCancelled(kind)
+
+            self._running[kind] += 1
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+            finally:
+                self._running[kind] -= 1
+        finally:
+            semaphore.release()
+
+    def queue_depth(self, kind: Optional[str] = None) -> int:
+        """
+        Jumlah pekerjaan yang sedang menunggu slot
+
+        Args:
+            kind: Jenis pekerjaan, atau None untuk total semua jenis
+
+        Returns:
+            Kedalaman antrian
+        """
+        if kind is not None:
+            return self._queued[kind]
+        return sum(self._queued.values())
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Statistik per jenis pekerjaan: queued, running dan limit"""
+        kinds = set(self.limits) | set(self._queued) | set(self._running)
+        return {
+            kind: {
+                'queued': self._queued[kind],
+                'running': self._running[kind],
+                'limit': self.limits.get(kind, 1),
+            }
+            for kind in sorted(kinds)
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Matikan pool"""
+        self._executor.shutdown(wait=wait)
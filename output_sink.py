@@ -0,0 +1,239 @@
+"""
+Streaming output sink untuk record artikel
+Setiap record ditulis sebagai satu baris JSON compact (JSON Lines) begitu
+tersedia, sehingga memory tetap konstan berapa pun jumlah artikelnya.
+Output bisa dikompres dengan gzip atau zstd (dipilih dari ekstensi file)
+dan dirotasi berdasarkan ukuran file. File lama tidak pernah ditambah:
+stream terkompres yang terputus (misalnya proses mati) tidak bisa
+dilanjutkan, jadi output lanjutan ditulis ke file bagian baru.
+
+zstd butuh dependency opsional: pip install zstandard
+"""
+
+import os
+import re
+import gzip
+import json
+import logging
+import threading
+from typing import BinaryIO, Dict, Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependency opsional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Ekstensi file -> kompresi
+COMPRESSION_EXTENSIONS = {
+    '.gz': 'gzip',
+    '.zst': 'zstd',
+}
+
+# Ukuran chunk saat membaca file output
+READ_SIZE = 1024 * 1024
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """Kompresi berdasarkan ekstensi file ('gzip', 'zstd' atau None)"""
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def _decompressed_chunks(raw: BinaryIO, compression: Optional[str], path: str) -> Iterator[bytes]:
+    """
+    Data file yang sudah di-decompress, per chunk
+
+    File terkompres yang terputus (proses mati sebelum close) dibaca sampai
+    data terakhir yang sudah di-flush, dengan peringatan.
+    """
+    if compression == 'gzip':
+        stream = gzip.GzipFile(fileobj=raw)
+        try:
+            # read1: satu pembacaan per chunk, data sebelum akhir file yang terputus tidak hilang
+            for chunk in iter(lambda: stream.read1(READ_SIZE), b''):
+                yield chunk
+        except EOFError:
+            logger.warning(f"{path} ends inside a gzip stream (interrupted write?), read up to the last flush")
+    elif compression == 'zstd':
+        # decompressobj per frame: stream_reader membuang sisa data frame yang belum ditutup
+        dctx = zstandard.ZstdDecompressor()
+        decompressor = dctx.decompressobj()
+        finished = True
+        for chunk in iter(lambda: raw.read(READ_SIZE), b''):
+            while chunk:
+                yield decompressor.decompress(chunk)
+                finished = decompressor.eof
+                if not finished:
+                    break
+                chunk = decompressor.unused_data
+                decompressor = dctx.decompressobj()
+        if not finished:
+            logger.warning(f"{path} ends inside a zstd frame (interrupted write?), read up to the last flush")
+    else:
+        yield from iter(lambda: raw.read(READ_SIZE), b'')
+
+
+def read_jsonl(path: str) -> Iterator[Dict]:
+    """
+    Baca record dari file JSON Lines (terkompres atau tidak) satu per satu
+
+    Args:
+        path: File .jsonl, .jsonl.gz atau .jsonl.zst
+
+    Returns:
+        Iterator record
+    """
+    compression = detect_compression(path)
+    if compression == 'zstd' and zstandard is None:
+        raise ValueError("Reading zstd files requires the zstandard package: pip install zstandard")
+
+    with open(path, 'rb') as raw:
+        pending = b''
+        for chunk in _decompressed_chunks(raw, compression, path):
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+        if pending.strip():
+            try:
+                yield json.loads(pending)
+            except ValueError:
+                logger.warning(f"Skipping incomplete last record in {path}")
+
+
+class JSONLSink:
+    """Tulis record sebagai JSON Lines, aman dipakai bersama beberapa thread"""
+
+    def __init__(self, path: str, compression: Optional[str] = 'auto',
+                 max_bytes: Optional[int] = None, level: Optional[int] = None,
+                 append: bool = False):
+        """
+        Args:
+            path: File output, misalnya articles.jsonl, articles.jsonl.gz atau
+                  articles.jsonl.zst
+            compression: 'gzip', 'zstd', None, atau 'auto' dari ekstensi path
+            max_bytes: Rotasi ke file baru setelah ukuran file (terkompres)
+                       melewati batas ini. Kompresor menulis per blok, jadi
+                       file bisa sedikit melebihi batas. File rotasi diberi
+                       nomor: articles-00000.jsonl.zst, articles-00001.jsonl.zst, ...
+            level: Level kompresi (default dari library)
+            append: False untuk menimpa output lama (termasuk file rotasinya),
+                    True untuk mempertahankannya dan menulis ke file bagian
+                    berikutnya (path tanpa nomor dihitung sebagai bagian 0)
+        """
+        self.compression = detect_compression(path) if compression == 'auto' else compression
+        if self.compression not in (None, 'gzip', 'zstd'):
+            raise ValueError(f"Unknown compression: {self.compression}")
+        if self.compression == 'zstd' and zstandard is None:
+            raise ValueError("zstd output requires the zstandard package: pip install zstandard")
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.level = level
+        self.records = 0
+        self._lock = threading.Lock()
+        self._index = self._first_index(append)
+        self._raw = None
+        self._stream = None
+        self._open()
+
+    def _rotated_path(self, index: int) -> str:
+        """Path file rotasi ke-index (nomor disisipkan sebelum ekstensi pertama)"""
+        directory, name = os.path.split(self.path)
+        stem, dot, extensions = name.partition('.')
+        return os.path.join(directory, f"{stem}-{index:05d}{dot}{extensions}")
+
+    def _existing_parts(self) -> Dict[int, str]:
+        """File rotasi yang sudah ada: nomor -> path"""
+        directory, name = os.path.split(self.path)
+        stem, dot, extensions = name.partition('.')
+        pattern = re.compile(rf"{re.escape(stem)}-(\d{{5}}){re.escape(dot + extensions)}$")
+        if not os.path.isdir(directory or '.'):
+            return {}
+        matches = (pattern.match(f) for f in os.listdir(directory or '.'))
+        return {int(m.group(1)): os.path.join(directory, m.group(0)) for m in matches if m}
+
+    def _first_index(self, append: bool) -> Optional[int]:
+        """Nomor file pertama yang ditulis, None untuk path tanpa nomor"""
+        parts = self._existing_parts()
+        if not append:
+            for part in parts.values():
+                os.remove(part)
+            return 0 if self.max_bytes else None
+
+        last = max(parts, default=-1)
+        if os.path.exists(self.path):
+            last = max(last, 0)
+        if last < 0 and not self.max_bytes:
+            return None
+        return last + 1
+
+    @property
+    def current_path(self) -> str:
+        """File yang sedang ditulis"""
+        return self._rotated_path(self._index) if self._index is not None else self.path
+
+    def _open(self):
+        """Buka file output saat ini (selalu file baru, tidak pernah append)"""
+        directory = os.path.dirname(self.current_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._raw = open(self.current_path, 'wb')
+        if self.compression == 'gzip':
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode='wb', compresslevel=self.level or 6)
+        elif self.compression == 'zstd':
+            compressor = zstandard.ZstdCompressor(level=self.level or 3)
+            self._stream = compressor.stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = self._raw
+
+    def _close_stream(self):
+        if self._stream is not self._raw:
+            self._stream.close()
+        self._raw.close()
+
+    def write(self, record: Dict):
+        """
+        Tulis satu record
+
+        Args:
+            record: Dictionary yang bisa di-serialize ke JSON
+        """
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+        with self._lock:
+            self._stream.write(line)
+            self.records += 1
+            if self.compression is None:
+                self._stream.flush()
+
+            if self.max_bytes and self._raw.tell() >= self.max_bytes:
+                self._close_stream()
+                logger.info(f"Output rotated: {self.current_path}")
+                self._index += 1
+                self._open()
+
+    def flush(self):
+        """
+        Flush data terkompres yang masih di buffer ke disk (fsync)
+
+        Setelah flush, semua record yang sudah ditulis bisa dibaca kembali
+        walaupun proses mati sebelum close().
+        """
+        with self._lock:
+            self._stream.flush()
+            self._raw.flush()
+            os.fsync(self._raw.fileno())
+
+    def close(self):
+        """Tutup file output"""
+        with self._lock:
+            self._close_stream()
+
+    def __enter__(self) -> 'JSONLSink':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
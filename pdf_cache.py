@@ -0,0 +1,194 @@
+"""
+Cache PDF hasil render untuk bot Telegram
+PDF disimpan di SQLite dengan kunci bahasa, judul canonical, revision id
+dan versi layout PDF. Setelah PDF pertama kali diupload, file_id Telegram
+ikut disimpan sehingga permintaan berikutnya cukup mengirim ulang file_id
+tanpa render maupun upload.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PDFCache:
+    """Cache PDF di disk dengan file_id Telegram dan eviksi LRU"""
+
+    def __init__(self, cache_dir: str = '.cache/pdf', max_size_mb: int = 200,
+                 layout_version: int = 1):
+        """
+        Args:
+            cache_dir: Direktori penyimpanan cache
+            max_size_mb: Batas total ukuran PDF di cache (MB)
+            layout_version: Versi layout PDF saat ini (app.PDF_LAYOUT_VERSION),
+                            PDF dengan versi lain tidak dipakai lagi
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, 'pdf_cache.sqlite')
+        self.max_size = max_size_mb * 1024 * 1024
+        self.layout_version = layout_version
+        self.hits = 0
+        self.file_id_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pdfs (
+                language TEXT NOT NULL,
+                title TEXT NOT NULL,
+                revision_id INTEGER NOT NULL,
+                layout_version INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                file_id TEXT,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (language, title, revision_id, layout_version)
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_pdfs_accessed ON pdfs (accessed_at)')
+        self._conn.commit()
+
+    def get(self, language: str, title: str, revision_id: Optional[int]) -> Optional[Dict]:
+        """
+        Ambil PDF untuk revisi artikel
+
+        Args:
+            language: Kode bahasa Wikipedia
+            title: Judul canonical artikel
+            revision_id: Revision id artikel
+
+        Returns:
+            Dictionary berisi data (bytes PDF) dan file_id (None jika belum
+            pernah diupload), atau None jika tidak ada di cache
+        """
+        if not revision_id:
+            return None
+
+        key = (language, title, revision_id, self.layout_version)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data, file_id FROM pdfs '
+                'WHERE language = ? AND title = ? AND revision_id = ? AND layout_version = ?',
+                key
+            ).fetchone()
+            if not row:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                'UPDATE pdfs SET accessed_at = ? '
+                'WHERE language = ? AND title = ? AND revision_id = ? AND layout_version = ?',
+                (time.time(),) + key
+            )
+            self._conn.commit()
+
+        if row[1]:
+            self.file_id_hits += 1
+        else:
+            self.hits += 1
+        return {'data': row[0], 'file_id': row[1]}
+
+    def put(self, language: str, title: str, revision_id: Optional[int], data: bytes):
+        """
+        Simpan PDF hasil render
+
+        Args:
+            language: Kode bahasa Wikipedia
+            title: Judul canonical artikel
+            revision_id: Revision id artikel, PDF tanpa revision id tidak disimpan
+            data: Bytes PDF
+        """
+        if not revision_id or not data:
+            return
+
+        now = time.time()
+        with self._lock:
+            # PDF revisi lama atau layout lama tidak akan diminta lagi
+            self._conn.execute(
+                'DELETE FROM pdfs WHERE language = ? AND title = ? '
+                'AND (revision_id < ? OR layout_version != ?)',
+                (language, title, revision_id, self.layout_version)
+            )
+            self._conn.execute(
+                'INSERT OR REPLACE INTO pdfs '
+                '(language, title, revision_id, layout_version, data, size, file_id, created_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, NULL, ?, ?)',
+                (language, title, revision_id, self.layout_version, data, len(data), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def set_file_id(self, language: str, title: str, revision_id: Optional[int], file_id: str):
+        """
+        Simpan file_id Telegram setelah PDF berhasil diupload
+
+        Args:
+            language: Kode bahasa Wikipedia
+            title: Judul canonical artikel
+            revision_id: Revision id artikel
+            file_id: file_id dokumen dari respons Telegram
+        """
+        if not revision_id or not file_id:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                'UPDATE pdfs SET file_id = ? '
+                'WHERE language = ? AND title = ? AND revision_id = ? AND layout_version = ?',
+                (file_id, language, title, revision_id, self.layout_version)
+            )
+            self._conn.commit()
+
+    def clear_file_id(self, language: str, title: str, revision_id: Optional[int]):
+        """Lupakan file_id yang ditolak Telegram (PDF akan diupload ulang dari bytes)"""
+        with self._lock:
+            self._conn.execute(
+                'UPDATE pdfs SET file_id = NULL '
+                'WHERE language = ? AND title = ? AND revision_id = ? AND layout_version = ?',
+                (language, title, revision_id, self.layout_version)
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        """Hapus PDF yang paling lama tidak diakses sampai ukuran di bawah batas"""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM pdfs').fetchone()[0]
+        if total <= self.max_size:
+            return
+
+        evicted = 0
+        for rowid, size in self._conn.execute(
+            'SELECT rowid, size FROM pdfs ORDER BY accessed_at ASC'
+        ).fetchall():
+            if total <= self.max_size:
+                break
+            self._conn.execute('DELETE FROM pdfs WHERE rowid = ?', (rowid,))
+            total -= size
+            evicted += 1
+
+        logger.info(f"PDF cache evicted {evicted} entries")
+
+    def stats(self) -> Dict:
+        """Statistik cache: hits (file_id / bytes), misses, jumlah entry dan ukuran"""
+        with self._lock:
+            count, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pdfs'
+            ).fetchone()
+        return {
+            'file_id_hits': self.file_id_hits,
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': count,
+            'size_bytes': size,
+        }
+
+    def close(self):
+        """Tutup koneksi database"""
+        with self._lock:
+            self._conn.close()
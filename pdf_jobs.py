@@ -0,0 +1,279 @@
+"""
+Layanan render PDF untuk bot Telegram
+Render ReportLab adalah pekerjaan CPU murni, jadi dijalankan di process pool
+tersendiri (bukan di event loop dan bukan di pool parsing). Worker dipakai
+ulang untuk banyak job dan sudah memuat ReportLab sejak start, sehingga
+throughput PDF naik sesuai jumlah core.
+
+Antrian job dibatasi (backpressure): jika antrian penuh atau user masih
+punya job yang berjalan, job baru langsung ditolak dengan pesan yang jelas
+daripada menumpuk tanpa batas. Progress job (queued -> rendering) dilaporkan
+lewat callback agar bisa ditampilkan di pesan status; posisi antrian
+dilaporkan ulang setiap kali berubah.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from offload import JobCancelled
+
+logger = logging.getLogger(__name__)
+
+# Callback progress: (stage, posisi antrian) -> False jika job sebaiknya dibatalkan
+ProgressCallback = Callable[[str, int], Awaitable[bool]]
+
+# Jeda pengecekan posisi antrian job yang menunggu (detik)
+QUEUE_UPDATE_INTERVAL = 2.0
+
+# Start method worker: bot sudah punya thread (event loop, executor offload)
+# saat pool dibuat, dan fork dari proses multi-thread bisa menyalin lock yang
+# sedang dipegang. forkserver/spawn memulai worker dari proses bersih;
+# _init_worker memuat sendiri semua yang dibutuhkan.
+WORKER_START_METHOD = ('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods()
+                       else 'spawn')
+
+# Renderer milik proses worker, dibuat sekali oleh _init_worker
+_renderer = None
+
+
+def _init_worker():
+    """Initializer worker: muat ReportLab dan render satu PDF kecil sebagai pemanasan"""
+    global _renderer
+    from app import WikipediaScraper
+
+    _renderer = WikipediaScraper()
+    _renderer.render_pdf({'title': 'warmup', 'summary': 'warmup'})
+
+
+def _render(article_data: Dict) -> Optional[bytes]:
+    """Render satu artikel di worker (hanya dict artikel yang di-pickle, bukan scraper)"""
+    if _renderer is None:
+        _init_worker()
+    return _renderer.render_pdf(article_data)
+
+
+def _render_bundle(articles: List[Dict], title: str) -> Optional[bytes]:
+    """Render bundle artikel dengan daftar isi di worker"""
+    if _renderer is None:
+        _init_worker()
+    return _renderer.render_bundle_pdf(articles, title=title)
+
+
+class JobRejected(Exception):
+    """Job PDF ditolak sebelum masuk antrian"""
+
+
+class QueueFull(JobRejected):
+    """Antrian PDF penuh"""
+
+    def __init__(self, depth: int):
+        super().__init__(f"PDF queue full ({depth} jobs)")
+        self.depth = depth
+
+
+class UserLimitReached(JobRejected):
+    """User masih punya job PDF yang belum selesai"""
+
+    def __init__(self, user_id: int, active: int):
+        super().__init__(f"User {user_id} already has {active} PDF job(s)")
+        self.user_id = user_id
+        self.active = active
+
+
+class PDFJobService:
+    """Antrian job render PDF dengan worker pool, backpressure dan batas per user"""
+
+    def __init__(self, workers: Optional[int] = None, max_queue: int = 20,
+                 per_user: int = 1, mode: str = 'process'):
+        """
+        Args:
+            workers: Jumlah worker renderer (default: jumlah core)
+            max_queue: Jumlah maksimum job (menunggu + berjalan), job berikutnya ditolak
+            per_user: Jumlah maksimum job aktif per user
+            mode: 'process' (default) atau 'thread' (misalnya untuk debugging)
+        """
+        if mode not in ('thread', 'process'):
+            raise ValueError(f"Unknown PDF worker mode: {mode}")
+
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.per_user = per_user
+        self.mode = mode
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.render_seconds = 0.0
+        self._executor = self._create_executor()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._waiting = deque()
+        self._running = 0
+        self._active: Dict[int, int] = {}
+
+    def _create_executor(self) -> Executor:
+        if self.mode == 'process':
+            return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                       mp_context=multiprocessing.get_context(WORKER_START_METHOD))
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='pdf')
+
+    @property
+    def depth(self) -> int:
+        """Jumlah job yang menunggu dan sedang dirender"""
+        return len(self._waiting) + self._running
+
+    def check(self, user_id: int):
+        """
+        Pastikan job baru untuk user akan diterima (dipanggil sebelum scrape
+        agar request yang pasti ditolak tidak membuang waktu)
+
+        Raises:
+            QueueFull: Jika antrian penuh
+            UserLimitReached: Jika user sudah mencapai batas job aktif
+        """
+        active = self._active.get(user_id, 0)
+        if active >= self.per_user:
+            self.rejected += 1
+            raise UserLimitReached(user_id, active)
+        if self.depth >= self.max_queue:
+            self.rejected += 1
+            raise QueueFull(self.depth)
+
+    async def render(self, user_id: int, article_data: Dict,
+                     progress: Optional[ProgressCallback] = None) -> Optional[bytes]:
+        """
+        Render artikel ke PDF lewat worker pool
+
+        Args:
+            user_id: ID user Telegram (untuk batas per user)
+            article_data: Data artikel hasil scrape_article
+            progress: Callback progress, dipanggil dengan ('queued', posisi)
+                      saat harus menunggu dan setiap kali posisinya berubah,
+                      dan ('rendering', 0) saat render dimulai; jika
+                      mengembalikan False job dibatalkan
+
+        Returns:
+            Bytes PDF, atau None jika render gagal
+
+        Raises:
+            JobRejected: Jika antrian penuh atau batas per user tercapai
+            JobCancelled: Jika progress mengembalikan False sebelum render
+        """
+        return await self._submit(user_id, progress, _render, article_data)
+
+    async def render_bundle(self, user_id: int, articles: List[Dict], title: str,
+                            progress: Optional[ProgressCallback] = None) -> Optional[bytes]:
+        """
+        Render beberapa artikel menjadi satu PDF dengan daftar isi (lihat render)
+
+        Args:
+            user_id: ID user Telegram
+            articles: List data artikel
+            title: Judul halaman pertama bundle
+            progress: Callback progress
+
+        Returns:
+            Bytes PDF, atau None jika render gagal
+        """
+        return await self._submit(user_id, progress, _render_bundle, articles, title)
+
+    async def _submit(self, user_id: int, progress: Optional[ProgressCallback],
+                      func: Callable, *args) -> Optional[bytes]:
+        """Antrikan job, tunggu slot worker lalu jalankan func(*args) di pool"""
+        self.check(user_id)
+        if self._slots is None:
+            # Dibuat di dalam event loop yang aktif
+            self._slots = asyncio.Semaphore(self.workers)
+
+        job = object()
+        self._active[user_id] = self._active.get(user_id, 0) + 1
+        self._waiting.append(job)
+        try:
+            try:
+                await self._wait_for_slot(job, user_id, progress)
+            finally:
+                self._waiting.remove(job)
+
+            try:
+                if progress and not await progress('rendering', 0):
+                    raise JobCancelled('pdf')
+                return await self._run(func, *args)
+            finally:
+                self._slots.release()
+        finally:
+            remaining = self._active.get(user_id, 0) - 1
+            if remaining > 0:
+                self._active[user_id] = remaining
+            else:
+                self._active.pop(user_id, None)
+
+    async def _wait_for_slot(self, job: object, user_id: int, progress: Optional[ProgressCallback]):
+        """Tunggu slot worker, posisi antrian dilaporkan setiap kali berubah"""
+        if not self._slots.locked() or not progress:
+            await self._slots.acquire()
+            return
+
+        acquire = asyncio.ensure_future(self._slots.acquire())
+        try:
+            reported = None
+            while not acquire.done():
+                position = self._waiting.index(job) + 1
+                if position != reported:
+                    reported = position
+                    logger.info(f"PDF queue: job for user {user_id} at position {position}")
+                    if not await progress('queued', position):
+                        raise JobCancelled('pdf')
+                await asyncio.wait({acquire}, timeout=QUEUE_UPDATE_INTERVAL)
+        except BaseException:
+            # Slot yang sudah didapat dikembalikan, yang belum dibatalkan
+            if acquire.done() and not acquire.cancelled():
+                self._slots.release()
+            else:
+                acquire.cancel()
+            raise
+
+    async def _run(self, func: Callable, *args) -> Optional[bytes]:
+        """Jalankan render di pool dan catat durasinya"""
+        self._running += 1
+        start = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, func, *args)
+        except BrokenProcessPool:
+            # Worker mati (misalnya kehabisan memory): buat pool baru untuk job berikutnya
+            logger.error("PDF worker pool broken, restarting")
+            self._executor.shutdown(wait=False)
+            self._executor = self._create_executor()
+            result = None
+        finally:
+            self._running -= 1
+
+        elapsed = time.monotonic() - start
+        if result:
+            self.completed += 1
+            self.render_seconds += elapsed
+            logger.info(f"PDF rendered in {elapsed:.2f}s ({len(result)} bytes)")
+        else:
+            self.failed += 1
+        return result
+
+    def stats(self) -> Dict:
+        """Statistik layanan: workers, queued, running, completed, failed, rejected, avg_render"""
+        return {
+            'workers': self.workers,
+            'queued': len(self._waiting),
+            'running': self._running,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'avg_render': self.render_seconds / self.completed if self.completed else 0.0,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Matikan worker pool"""
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,264 @@
+"""
+Rate limiter outbound untuk request ke Wikipedia
+Token bucket per host dan bahasa yang dipakai bersama oleh scraper sinkron
+(thread) maupun async (task). Limiter bereaksi terhadap respons 429/503
+dengan header Retry-After dan error maxlag MediaWiki: host yang di-throttle
+diblokir selama Retry-After dan rate-nya diturunkan, lalu naik kembali
+perlahan selama request berhasil.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Status HTTP yang menandakan server meminta client melambat
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse header Retry-After (detik atau HTTP-date)
+
+    Args:
+        value: Nilai header
+
+    Returns:
+        Jumlah detik yang harus ditunggu, atau None jika tidak valid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket untuk satu host (dihitung dengan GCRA: hanya menyimpan
+    waktu kedatangan teoretis request berikutnya)
+    """
+
+    def __init__(self, rate: float, burst: int, min_rate: float):
+        """
+        Args:
+            rate: Request per detik
+            burst: Jumlah request yang boleh dikirim sekaligus
+            min_rate: Batas bawah rate setelah di-throttle
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min(min_rate, rate)
+        self._tat = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def _tolerance(self) -> float:
+        return (self.burst - 1) / self.rate
+
+    def reserve(self) -> float:
+        """
+        Ambil satu token
+
+        Returns:
+            Jumlah detik yang harus ditunggu sebelum request boleh dikirim
+        """
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            self._tat = tat + 1 / self.rate
+            return max(0.0, tat - self._tolerance - now)
+
+    def wait_time(self) -> float:
+        """Waktu tunggu untuk request berikutnya tanpa mengambil token"""
+        with self._lock:
+            now = time.monotonic()
+            return max(0.0, max(self._tat, now) - self._tolerance - now)
+
+    def penalize(self, delay: float):
+        """Blokir bucket selama delay detik dan turunkan rate (multiplicative decrease)"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            # Setelah blokir, request berikutnya tidak mendapat burst
+            self._tat = max(self._tat, time.monotonic() + delay + self._tolerance)
+
+    def reward(self):
+        """Naikkan rate perlahan setelah request berhasil (additive increase)"""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 50)
+
+
+class RateLimiter:
+    """Kumpulan token bucket per (host, bahasa), aman untuk thread dan asyncio"""
+
+    def __init__(self, rate: float = 10.0, burst: int = 10, min_rate: float = 0.5,
+                 maxlag: Optional[int] = 5, default_retry_after: float = 5.0,
+                 max_retry_after: float = 60.0):
+        """
+        Args:
+            rate: Request per detik per host dan bahasa, 0 untuk tanpa batas
+            burst: Jumlah request yang boleh dikirim sekaligus
+            min_rate: Batas bawah rate setelah di-throttle
+            maxlag: Parameter maxlag untuk request API MediaWiki (None = tidak dikirim)
+            default_retry_after: Waktu blokir jika respons throttle tanpa Retry-After
+            max_retry_after: Batas atas waktu blokir dari Retry-After
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min_rate
+        self.maxlag = maxlag
+        self.default_retry_after = default_retry_after
+        self.max_retry_after = max_retry_after
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+
+    @classmethod
+    def from_env(cls) -> 'RateLimiter':
+        """Buat limiter dari environment variable WIKI_RATE_LIMIT, WIKI_RATE_BURST dan WIKI_MAXLAG"""
+        maxlag = os.getenv('WIKI_MAXLAG', '5')
+        return cls(
+            rate=float(os.getenv('WIKI_RATE_LIMIT', '10')),
+            burst=int(os.getenv('WIKI_RATE_BURST', '10')),
+            maxlag=int(maxlag) if maxlag else None,
+        )
+
+    def _bucket(self, url: str, language: str) -> Optional[TokenBucket]:
+        """Bucket untuk host URL dan bahasa, None jika limiter nonaktif"""
+        if self.rate <= 0:
+            return None
+        key = (urlparse(url).netloc, language)
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(self.rate, self.burst, self.min_rate)
+            return self._buckets[key]
+
+    def reserve(self, url: str, language: str) -> float:
+        """
+        Ambil token untuk request ke URL
+
+        Returns:
+            Jumlah detik yang harus ditunggu sebelum request dikirim
+        """
+        bucket = self._bucket(url, language)
+        return bucket.reserve() if bucket else 0.0
+
+    def acquire(self, url: str, language: str):
+        """Tunggu (blocking) sampai request ke URL boleh dikirim"""
+        delay = self.reserve(url, language)
+        if delay > 0:
+            logger.debug(f"Rate limit: waiting {delay:.2f}s for {url}")
+            time.sleep(delay)
+
+    async def acquire_async(self, url: str, language: str):
+        """Tunggu (tanpa memblokir event loop) sampai request ke URL boleh dikirim"""
+        delay = self.reserve(url, language)
+        if delay > 0:
+            logger.debug(f"Rate limit: waiting {delay:.2f}s for {url}")
+            await asyncio.sleep(delay)
+
+    def throttle_delay(self, status_code: int, headers) -> Optional[float]:
+        """
+        Cek apakah respons meminta client melambat
+
+        Args:
+            status_code: Status HTTP
+            headers: Header respons
+
+        Returns:
+            Waktu blokir (detik) jika respons adalah throttle (429/503 atau
+            error maxlag), None jika bukan
+        """
+        # Error maxlag MediaWiki dikirim dengan status 200 dan header X-Database-Lag
+        if status_code not in THROTTLE_STATUSES and 'X-Database-Lag' not in headers:
+            return None
+        delay = parse_retry_after(headers.get('Retry-After'))
+        if delay is None:
+            delay = self.default_retry_after
+        return min(delay, self.max_retry_after)
+
+    def observe(self, url: str, language: str, status_code: int, headers) -> Optional[float]:
+        """
+        Laporkan respons ke limiter
+
+        Args:
+            url: URL request
+            language: Kode bahasa Wikipedia
+            status_code: Status HTTP respons
+            headers: Header respons
+
+        Returns:
+            Waktu blokir jika respons adalah throttle (request sebaiknya
+            diulang), None jika tidak
+        """
+        bucket = self._bucket(url, language)
+        if not bucket:
+            return None
+
+        delay = self.throttle_delay(status_code, headers)
+        if delay is None:
+            bucket.reward()
+            return None
+
+        bucket.penalize(delay)
+        reason = f"status {status_code}" if status_code in THROTTLE_STATUSES else f"maxlag, lag {headers.get('X-Database-Lag')}s"
+        logger.warning(f"Throttled by {urlparse(url).netloc} ({reason}), "
+                       f"pausing {delay:.1f}s, rate now {bucket.rate:.2f}/s")
+        return delay
+
+    def api_params(self, params: Optional[Dict]) -> Optional[Dict]:
+        """Tambahkan parameter maxlag ke parameter request API"""
+        if params is None or self.maxlag is None:
+            return params
+        return {**params, 'maxlag': self.maxlag}
+
+    def wait_time(self, url: Optional[str] = None, language: Optional[str] = None) -> float:
+        """
+        Waktu tunggu saat ini untuk request berikutnya
+
+        Args:
+            url: URL tujuan, None untuk waktu tunggu terlama di semua bucket
+            language: Kode bahasa Wikipedia (wajib jika url diisi)
+
+        Returns:
+            Jumlah detik
+        """
+        if url is not None:
+            bucket = self._bucket(url, language)
+            return bucket.wait_time() if bucket else 0.0
+        with self._lock:
+            buckets = list(self._buckets.values())
+        return max((bucket.wait_time() for bucket in buckets), default=0.0)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Rate dan waktu tunggu saat ini per host dan bahasa"""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {
+            f"{host} ({language})": {'rate': bucket.rate, 'wait': bucket.wait_time()}
+            for (host, language), bucket in buckets.items()
+        }
+
+
+_default_limiter: Optional[RateLimiter] = None
+_default_lock = threading.Lock()
+
+
+def get_default_limiter() -> RateLimiter:
+    """Limiter bersama untuk semua scraper di proses ini (dibuat dari environment)"""
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter.from_env()
+        return _default_limiter
@@ -0,0 +1,307 @@
+"""
+Retry, hedged request dan circuit breaker untuk request ke Wikipedia
+Request GET (idempotent) yang gagal karena error koneksi, timeout atau 5xx
+diulang dengan exponential backoff + jitter. Jika hedging aktif, request
+kedua dikirim saat request pertama melewati latency p95 host tersebut dan
+respons yang lebih dulu selesai dipakai. Circuit breaker per host membuat
+request langsung gagal selama host sedang bermasalah.
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+from collections import deque
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Status HTTP yang dianggap kegagalan sementara (boleh diulang)
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(Exception):
+    """Request ditolak karena circuit breaker host sedang terbuka"""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit open for {host}, retry in {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class LatencyTracker:
+    """Latency request terakhir untuk satu host"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """
+        Args:
+            window: Jumlah sampel terakhir yang disimpan
+            min_samples: Jumlah sampel minimum sebelum percentile dihitung
+        """
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Percentile latency
+
+        Args:
+            q: Percentile antara 0 dan 1 (misalnya 0.95)
+
+        Returns:
+            Latency dalam detik, None jika sampel belum cukup
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class CircuitBreaker:
+    """Circuit breaker untuk satu host: closed -> open -> half-open -> closed"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: Jumlah kegagalan berturut-turut sebelum circuit terbuka
+            reset_timeout: Lama circuit terbuka (detik) sebelum satu request percobaan diizinkan
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def retry_in(self) -> float:
+        """Sisa waktu (detik) sampai circuit yang terbuka boleh dicoba lagi"""
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Cek apakah request boleh dikirim"""
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and self.retry_in() == 0:
+                # Satu request percobaan, request lain tetap ditolak sampai hasilnya diketahui
+                self.state = 'half_open'
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+
+    def record_failure(self) -> bool:
+        """
+        Catat kegagalan
+
+        Returns:
+            True jika circuit (baru) terbuka
+        """
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                return self._open()
+            return False
+
+    def record_abandoned(self) -> bool:
+        """
+        Catat request yang berakhir tanpa hasil (dibatalkan atau error non-HTTP)
+
+        Tidak dihitung sebagai kegagalan host, kecuali request tersebut adalah
+        percobaan half-open: circuit dibuka lagi supaya tidak tertahan di
+        half_open tanpa ada request yang melaporkan hasilnya.
+
+        Returns:
+            True jika circuit (baru) terbuka
+        """
+        with self._lock:
+            if self.state != 'half_open':
+                return False
+            return self._open()
+
+    def _open(self) -> bool:
+        opened = self.state != 'open'
+        self.state = 'open'
+        self._opened_at = time.monotonic()
+        return opened
+
+
+class Resilience:
+    """Kebijakan retry, hedging dan circuit breaker, state-nya per host"""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0,
+                 hedge: bool = False, hedge_percentile: float = 0.95, min_hedge_delay: float = 0.05,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 connect_timeout: float = 3.05, deadline: float = 30.0):
+        """
+        Args:
+            max_attempts: Jumlah percobaan maksimum per request (1 = tanpa retry)
+            base_delay: Backoff dasar (detik), dikali 2 setiap percobaan
+            max_delay: Batas atas backoff (detik)
+            hedge: Kirim request duplikat saat request melewati latency percentile
+            hedge_percentile: Percentile latency yang memicu hedged request
+            min_hedge_delay: Jeda minimum sebelum hedged request (detik)
+            failure_threshold: Kegagalan berturut-turut sebelum circuit host terbuka
+            reset_timeout: Lama circuit terbuka sebelum dicoba lagi (detik)
+            connect_timeout: Timeout membuka koneksi, terpisah dari timeout baca
+            deadline: Batas waktu total satu request termasuk semua retry (detik)
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.connect_timeout = connect_timeout
+        self.deadline = deadline
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latency: Dict[str, LatencyTracker] = {}
+
+    @classmethod
+    def from_env(cls) -> 'Resilience':
+        """
+        Buat kebijakan dari environment variable WIKI_RETRIES, WIKI_HEDGE,
+        WIKI_CONNECT_TIMEOUT, WIKI_BREAKER_THRESHOLD, WIKI_BREAKER_RESET dan
+        WIKI_DEADLINE
+        """
+        return cls(
+            max_attempts=int(os.getenv('WIKI_RETRIES', '3')),
+            hedge=os.getenv('WIKI_HEDGE', '0').lower() in ('1', 'true', 'yes'),
+            connect_timeout=float(os.getenv('WIKI_CONNECT_TIMEOUT', '3.05')),
+            failure_threshold=int(os.getenv('WIKI_BREAKER_THRESHOLD', '5')),
+            reset_timeout=float(os.getenv('WIKI_BREAKER_RESET', '30')),
+            deadline=float(os.getenv('WIKI_DEADLINE', '30')),
+        )
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[host]
+
+    def latency(self, host: str) -> LatencyTracker:
+        with self._lock:
+            if host not in self._latency:
+                self._latency[host] = LatencyTracker()
+            return self._latency[host]
+
+    def check(self, host: str):
+        """
+        Pastikan circuit host mengizinkan request
+
+        Raises:
+            CircuitOpenError: Jika circuit host terbuka
+        """
+        breaker = self.breaker(host)
+        if not breaker.allow():
+            raise CircuitOpenError(host, breaker.retry_in())
+
+    def should_retry(self, host: str, attempt: int) -> bool:
+        """Cek apakah percobaan ke-attempt (mulai 0) yang gagal boleh diulang"""
+        return attempt + 1 < self.max_attempts and self.breaker(host).state == 'closed'
+
+    def record_success(self, host: str):
+        """Catat request berhasil"""
+        self.breaker(host).record_success()
+
+    def record_latency(self, url: str, status_code: int, elapsed: float):
+        """Catat latency respons yang berhasil (dasar perhitungan hedge delay)"""
+        if status_code not in RETRYABLE_STATUSES:
+            self.latency(urlparse(url).netloc).record(elapsed)
+
+    def record_failure(self, host: str):
+        """Catat kegagalan request ke host"""
+        if self.breaker(host).record_failure():
+            logger.warning(f"Circuit opened for {host} for {self.reset_timeout:.0f}s")
+
+    def record_abandoned(self, host: str):
+        """Catat request ke host yang berakhir tanpa hasil (lihat CircuitBreaker.record_abandoned)"""
+        if self.breaker(host).record_abandoned():
+            logger.warning(f"Circuit probe for {host} abandoned, reopened for {self.reset_timeout:.0f}s")
+
+    def attempt_timeout(self, timeout: float, deadline: float) -> float:
+        """
+        Timeout baca satu percobaan, dipotong sisa waktu sampai deadline
+
+        Args:
+            timeout: Timeout baca yang diminta (detik)
+            deadline: Deadline request dalam time.monotonic()
+
+        Returns:
+            Timeout dalam detik (minimal 0.1)
+        """
+        return max(0.1, min(timeout, deadline - time.monotonic()))
+
+    def retry_wait(self, host: str, attempt: int, deadline: float, extra_wait: float = 0.0) -> Optional[float]:
+        """
+        Jeda sebelum mengulang percobaan ke-attempt (mulai 0) yang gagal
+
+        Args:
+            host: Host tujuan
+            attempt: Nomor percobaan yang gagal
+            deadline: Deadline request dalam time.monotonic()
+            extra_wait: Waktu tunggu lain sebelum percobaan berikutnya (misalnya rate limiter)
+
+        Returns:
+            Jeda backoff dalam detik, None jika tidak boleh diulang (percobaan
+            habis, circuit tidak closed atau deadline akan terlewati)
+        """
+        if not self.should_retry(host, attempt):
+            return None
+        delay = self.backoff(attempt)
+        if time.monotonic() + delay + extra_wait >= deadline:
+            return None
+        return delay
+
+    def backoff(self, attempt: int) -> float:
+        """Backoff dengan full jitter untuk percobaan ke-attempt (mulai 0)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def hedge_delay(self, host: str) -> Optional[float]:
+        """Jeda sebelum hedged request, None jika hedging nonaktif atau sampel belum cukup"""
+        if not self.hedge:
+            return None
+        latency = self.latency(host).percentile(self.hedge_percentile)
+        if latency is None:
+            return None
+        return max(self.min_hedge_delay, latency)
+
+    def stats(self) -> Dict[str, Dict]:
+        """State circuit dan latency p95 per host"""
+        with self._lock:
+            hosts = sorted(set(self._breakers) | set(self._latency))
+        return {
+            host: {
+                'circuit': self.breaker(host).state,
+                'failures': self.breaker(host).failures,
+                'p95': self.latency(host).percentile(0.95),
+            }
+            for host in hosts
+        }
+
+
+_default_resilience: Optional[Resilience] = None
+_default_lock = threading.Lock()
+
+
+def get_default_resilience() -> Resilience:
+    """Kebijakan bersama untuk semua scraper di proses ini (dibuat dari environment)"""
+    global _default_resilience
+    with _default_lock:
+        if _default_resilience is None:
+            _default_resilience = Resilience.from_env()
+        return _default_resilience
@@ -0,0 +1,208 @@
+"""
+Cache resolusi search untuk WikipediaScraper.search_article
+Query yang dinormalisasi (Unicode NFKC, case-fold, spasi dirapikan)
+dipetakan ke URL canonical artikel di SQLite. Judul artikel tujuan ikut
+disimpan sebagai alias, sehingga query lewat redirect dan query judul asli
+berakhir di entry yang sama. Query tanpa hasil disimpan dengan TTL pendek
+(negative caching). Entry yang paling lama tidak dipakai dihapus lebih dulu.
+
+Hasil lookup judul persis (titles=) disimpan terpisah dengan kunci yang
+mempertahankan huruf besar/kecil, karena judul Wikipedia case-sensitive
+("NICE" dan "Nice" adalah artikel berbeda).
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+import unicodedata
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalisasi query untuk kunci cache
+
+    Args:
+        query: Query dari user
+
+    Returns:
+        Query dalam bentuk NFKC, case-folded, '_' sebagai spasi dan
+        whitespace dirapikan
+    """
+    query = unicodedata.normalize('NFKC', query).casefold().replace('_', ' ')
+    return ' '.join(query.split())
+
+
+def exact_query(query: str) -> str:
+    """
+    Normalisasi query judul persis (huruf besar/kecil dipertahankan)
+
+    Args:
+        query: Query dari user
+
+    Returns:
+        Query dalam bentuk NFKC, '_' sebagai spasi dan whitespace dirapikan
+    """
+    query = unicodedata.normalize('NFKC', query).replace('_', ' ')
+    return ' '.join(query.split())
+
+
+def cache_key(query: str, exact: bool = False) -> str:
+    """
+    Kunci cache untuk query
+
+    Kunci judul persis diberi awalan spasi. Query hasil normalisasi tidak
+    pernah diawali spasi, jadi kedua jenis kunci tidak bisa bertabrakan.
+
+    Args:
+        query: Query dari user
+        exact: Kunci untuk hasil lookup judul persis
+    """
+    if exact:
+        key = exact_query(query)
+        return ' ' + key if key else ''
+    return normalize_query(query)
+
+
+class SearchCache:
+    """Cache query -> URL artikel di SQLite dengan negative caching dan eviksi LRU"""
+
+    def __init__(self, cache_dir: str = '.cache/search', ttl: int = 86400,
+                 negative_ttl: int = 300, max_entries: int = 50000):
+        """
+        Args:
+            cache_dir: Direktori penyimpanan cache
+            ttl: Umur maksimum hasil yang ditemukan (detik)
+            negative_ttl: Umur maksimum hasil "tidak ditemukan" (detik)
+            max_entries: Jumlah maksimum entry, yang paling lama tidak
+                         dipakai dihapus lebih dulu
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, 'search_cache.sqlite')
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS resolutions (
+                language TEXT NOT NULL,
+                query TEXT NOT NULL,
+                url TEXT,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (language, query)
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_resolutions_accessed ON resolutions (accessed_at)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_resolutions_created ON resolutions (created_at)')
+        self._conn.commit()
+
+    def lookup(self, language: str, query: str, exact: bool = False) -> Optional[Dict]:
+        """
+        Cari resolusi query
+
+        Args:
+            language: Kode bahasa Wikipedia
+            query: Query (dinormalisasi di sini)
+            exact: Cari hasil lookup judul persis, bukan hasil search
+
+        Returns:
+            Dictionary {'url': URL atau None untuk "tidak ditemukan"}, atau
+            None jika query belum ada di cache / sudah kadaluarsa
+        """
+        key = cache_key(query, exact)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT url, created_at FROM resolutions WHERE language = ? AND query = ?',
+                (language, key)
+            ).fetchone()
+            if row:
+                ttl = self.ttl if row[0] else self.negative_ttl
+                if row[1] <= now - ttl:
+                    row = None
+            if not row:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                'UPDATE resolutions SET accessed_at = ? WHERE language = ? AND query = ?',
+                (now, language, key)
+            )
+            self._conn.commit()
+
+        if row[0]:
+            self.hits += 1
+        else:
+            self.negative_hits += 1
+        return {'url': row[0]}
+
+    def put(self, language: str, query: str, url: Optional[str], aliases: Iterable[str] = (),
+            exact: bool = False):
+        """
+        Simpan resolusi query
+
+        Args:
+            language: Kode bahasa Wikipedia
+            query: Query dari user
+            url: URL canonical artikel, atau None jika tidak ditemukan
+            aliases: Query lain yang pasti berakhir di URL yang sama
+                     (misalnya judul artikel tujuan redirect)
+            exact: Simpan sebagai hasil lookup judul persis
+        """
+        keys = {cache_key(query, exact)}
+        if url:
+            keys.update(cache_key(alias, exact) for alias in aliases if alias)
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO resolutions (language, query, url, created_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                [(language, key, url, now, now) for key in keys if key]
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        """Hapus entry kadaluarsa dan entry berlebih (LRU)"""
+        self._conn.execute(
+            'DELETE FROM resolutions WHERE created_at <= ? OR (url IS NULL AND created_at <= ?)',
+            (now - self.ttl, now - self.negative_ttl)
+        )
+
+        count = self._conn.execute('SELECT COUNT(*) FROM resolutions').fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                'DELETE FROM resolutions WHERE rowid IN '
+                '(SELECT rowid FROM resolutions ORDER BY accessed_at ASC LIMIT ?)',
+                (count - self.max_entries,)
+            )
+            logger.info(f"Search cache evicted {count - self.max_entries} entries")
+
+    def stats(self) -> Dict:
+        """Statistik cache: hits, negative_hits, misses, hit rate dan jumlah entry"""
+        with self._lock:
+            count = self._conn.execute('SELECT COUNT(*) FROM resolutions').fetchone()[0]
+        total = self.hits + self.negative_hits + self.misses
+        return {
+            'hits': self.hits,
+            'negative_hits': self.negative_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.negative_hits) / total if total else 0.0,
+            'entries': count,
+        }
+
+    def close(self):
+        """Tutup koneksi database"""
+        with self._lock:
+            self._conn.close()
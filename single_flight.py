@@ -0,0 +1,123 @@
+"""
+Single-flight untuk lookup asyncio
+Pemanggilan identik (kunci sama) yang terjadi bersamaan hanya menjalankan
+satu pekerjaan; pemanggil lain menunggu pekerjaan yang sama dan mendapat
+hasil (atau exception) yang sama. Saat topik sedang ramai, beban ke
+Wikipedia tetap satu request per kunci berapa pun jumlah user-nya.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Gabungkan pemanggilan identik yang sedang berjalan (in-flight)"""
+
+    def __init__(self, retry_on: Tuple[Type[BaseException], ...] = ()):
+        """
+        Args:
+            retry_on: Exception dari pekerjaan bersama yang tidak diteruskan
+                      ke pemanggil lain; pemanggil tersebut menjalankan
+                      pekerjaannya sendiri (misalnya JobCancelled karena
+                      pesan status pemanggil pertama dihapus)
+        """
+        self.retry_on = retry_on
+        self.calls = 0
+        self.shared = 0
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Jalankan func, atau tunggu pemanggilan yang sedang berjalan dengan kunci sama
+
+        Args:
+            key: Kunci lookup, misalnya ('article', language, url)
+            func: Fungsi tanpa argumen yang mengembalikan coroutine pekerjaan
+
+        Returns:
+            Hasil pekerjaan
+        """
+        while True:
+            task = self._flights.get(key)
+            leader = task is None
+            if leader:
+                self.calls += 1
+                task = asyncio.ensure_future(func())
+                self._flights[key] = task
+                task.add_done_callback(lambda done, key=key: self._forget(key, done))
+            else:
+                self.shared += 1
+                logger.debug(f"Joined in-flight lookup: {key}")
+
+            try:
+                # shield: pemanggil yang dibatalkan tidak membatalkan pekerjaan pemanggil lain
+                return await asyncio.shield(task)
+            except self.retry_on:
+                if leader:
+                    raise
+                logger.info(f"Shared lookup aborted, retrying: {key}")
+
+    async def do_many(self, items: Dict[Hashable, Any],
+                      func: Callable[[List[Any]], Awaitable[Dict[Any, Any]]]) -> Dict[Hashable, Any]:
+        """
+        Jalankan banyak lookup sekaligus dalam satu pekerjaan batch
+
+        Kunci yang sedang berjalan (misalnya dari do()) ditunggu bersama,
+        sisanya dijalankan func dalam satu batch dan setiap kuncinya
+        terdaftar sebagai in-flight, sehingga pemanggilan lain dengan kunci
+        sama ikut menunggu batch ini.
+
+        Args:
+            items: Kunci lookup -> argumen, misalnya ('search', language, query) -> query
+            func: Fungsi yang menerima list argumen dan mengembalikan coroutine
+                  hasil berupa dictionary argumen -> hasil
+
+        Returns:
+            Dictionary kunci -> hasil
+        """
+        tasks: Dict[Hashable, asyncio.Task] = {}
+        leaders = {key: arg for key, arg in items.items() if key not in self._flights}
+        if leaders:
+            self.calls += 1
+            batch = asyncio.ensure_future(func(list(leaders.values())))
+            for key, arg in leaders.items():
+                task = asyncio.ensure_future(self._pick(batch, arg))
+                self._flights[key] = tasks[key] = task
+                task.add_done_callback(lambda done, key=key: self._forget(key, done))
+
+        async def result(key: Hashable, arg: Any) -> Any:
+            if key in tasks:
+                return await asyncio.shield(tasks[key])
+            # Sudah berjalan di pemanggilan lain; jika dibatalkan, dijalankan sendiri
+            return await self.do(key, lambda: self._pick(func([arg]), arg))
+
+        values = await asyncio.gather(*(result(key, arg) for key, arg in items.items()))
+        return dict(zip(items, values))
+
+    @staticmethod
+    async def _pick(batch: Awaitable[Dict[Any, Any]], arg: Any) -> Any:
+        """Hasil satu argumen dari pekerjaan batch"""
+        return (await batch)[arg]
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        """Hapus pekerjaan yang sudah selesai supaya pemanggilan berikutnya fetch ulang"""
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # Tandai exception sudah diambil jika tidak ada lagi yang menunggu
+            task.exception()
+
+    def in_flight(self) -> int:
+        """Jumlah pekerjaan yang sedang berjalan"""
+        return len(self._flights)
+
+    def stats(self) -> Dict[str, int]:
+        """Statistik: calls (pekerjaan dijalankan), shared (pemanggilan yang ikut menunggu), in_flight"""
+        return {
+            'calls': self.calls,
+            'shared': self.shared,
+            'in_flight': len(self._flights),
+        }
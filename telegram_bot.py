@@ -4,9 +4,12 @@ Implementasi lengkap bot Telegram dengan berbagai fitur
 """
 
 import os
+import math
+import argparse
+import asyncio
 import logging
-import time
 from datetime import datetime
+from typing import Dict, Optional
 from functools import wraps
 from dotenv import load_dotenv
 
@@ -16,12 +19,28 @@ from telegram.ext import (
     CommandHandler,
     CallbackQueryHandler,
     MessageHandler,
+    TypeHandler,
     filters,
     ContextTypes
 )
 from telegram.constants import ParseMode
-
-from app import WikipediaScraper
+from telegram.error import BadRequest
+
+from app import PDF_LAYOUT_VERSION
+from async_scraper import AsyncWikipediaScraper, create_client
+from offload import OffloadExecutor, JobCancelled
+from http_cache import HTTPCache
+from article_cache import ArticleCache
+from rate_limiter import RateLimiter
+from pdf_cache import PDFCache
+from search_cache import SearchCache, normalize_query, exact_query
+from pdf_jobs import PDFJobService, JobRejected, QueueFull
+from single_flight import SingleFlight
+from user_store import UserStore, SQLiteUserBackend
+from user_limiter import UserLimiter, LimiterBusy
+from webhook import serve_webhook
+from callback_data import CallbackPayloads
+from update_processor import UserUpdateProcessor
 
 # Load environment variables
 load_dotenv()
@@ -37,74 +56,236 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize scrapers
-scrapers = {
-    'en': WikipediaScraper(language='en'),
-    'id': WikipediaScraper(language='id')
-}
+# Shared connection pool untuk semua scraper
+http_client = create_client(
+    max_connections=int(os.getenv('HTTP_MAX_CONNECTIONS', '20')),
+    timeout=float(os.getenv('HTTP_TIMEOUT', '10'))
+)
+
+# Rate limiter outbound bersama untuk semua scraper (token bucket per host dan bahasa)
+rate_limiter = RateLimiter.from_env()
+
+# Executor untuk parsing artikel di luar event loop (PDF dirender oleh pdf_jobs)
+offload_executor = OffloadExecutor(
+    mode=os.getenv('OFFLOAD_MODE', 'thread'),
+    max_workers=int(os.getenv('OFFLOAD_WORKERS', '4')),
+    limits={
+        'parse': int(os.getenv('OFFLOAD_PARSE_LIMIT', '4')),
+    }
+)
+
+# Worker pool khusus render PDF (process pool, antrian terbatas, batas per user)
+pdf_jobs = PDFJobService(
+    workers=int(os.getenv('PDF_WORKERS', '0')) or None,
+    max_queue=int(os.getenv('PDF_QUEUE_MAX', '20')),
+    per_user=int(os.getenv('PDF_JOBS_PER_USER', '1')),
+    mode=os.getenv('PDF_WORKER_MODE', 'process')
+)
+
+# Jumlah artikel maksimum dalam satu /pdfbundle
+PDF_BUNDLE_MAX = int(os.getenv('PDF_BUNDLE_MAX', '20'))
+
+# Cache, data user dan scraper dibuat oleh init_services() di main(), sehingga
+# import modul ini tidak membuat direktori cache atau database
+http_cache: Optional[HTTPCache] = None
+article_cache: Optional[ArticleCache] = None
+search_cache: Optional[SearchCache] = None
+pdf_cache: Optional[PDFCache] = None
+user_store: Optional[UserStore] = None
+scrapers: Dict[str, AsyncWikipediaScraper] = {}
+
+# Lookup identik yang sedang berjalan dipakai bersama oleh semua handler (single-flight).
+# Jika pesan status user pertama dihapus (JobCancelled), user lain melanjutkan sendiri.
+lookups = SingleFlight(retry_on=(JobCancelled,))
+
+
+async def search_article(language: str, query: str):
+    """Search artikel, dipakai bersama request identik yang sedang berjalan"""
+    return await lookups.do(
+        ('search', language, normalize_query(query)),
+        lambda: scrapers[language].search_article(query)
+    )
+
+
+async def search_articles(language: str, queries):
+    """
+    Search banyak artikel dalam satu batch, per query dipakai bersama request identik
+
+    Query yang sedang dicari handler lain (/compare atau /pdfbundle) ditunggu
+    bersama; sisanya di-resolve scraper.search_articles dalam satu batch.
+    Kunci mempertahankan huruf besar/kecil karena query dicocokkan dulu
+    sebagai judul persis ("NICE" dan "Nice" adalah artikel berbeda).
+    """
+    keys = {('titles', language, exact_query(query)): query for query in queries}
+    results = await lookups.do_many(keys, lambda batch: scrapers[language].search_articles(batch))
+    return {query: results[('titles', language, exact_query(query))] for query in queries}
+
+
+async def scrape_article(language: str, url: str, before_start=None):
+    """
+    Scrape artikel, dipakai bersama request identik yang sedang berjalan
+
+    before_start yang dipakai adalah milik pemanggil pertama (pemilik
+    pekerjaan bersama). Jika pesan status pemanggil tersebut sudah dihapus,
+    pekerjaan batal dengan JobCancelled dan pemanggil lain mengulang
+    dengan before_start miliknya sendiri (lihat lookups).
+    """
+    return await lookups.do(
+        ('article', language, url),
+        lambda: scrapers[language].scrape_article(url, before_start=before_start)
+    )
+
+
+async def run_cache_io(func, *args):
+    """
+    Jalankan operasi cache SQLite (misalnya pdf_cache.get/put) di thread pool
+
+    Blob PDF bisa berukuran beberapa MB, jadi baca/tulisnya tidak dijalankan
+    di event loop (sama seperti user store dan cache scraper).
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, func, *args)
 
-# User data storage (dalam produksi, gunakan database)
-user_data = {}
+
+# Rate limit per user (token bucket bersama untuk semua command, /pdf lebih mahal dari /search)
+# dan batas handler berat yang berjalan bersamaan dengan antrian bergiliran antar user
+user_limiter = UserLimiter.from_env()
+
+# Payload tombol inline yang melebihi batas 64 byte callback_data Telegram
+callback_payloads = CallbackPayloads()
+
+
+def init_services():
+    """Buat cache, data user dan scraper (membuat direktori dan database di disk)"""
+    global http_cache, article_cache, search_cache, pdf_cache, user_store
+
+    # Shared HTTP cache untuk semua bahasa (kunci cache berisi host)
+    http_cache = HTTPCache(
+        cache_dir=os.getenv('HTTP_CACHE_DIR', '.cache/http'),
+        max_size_mb=int(os.getenv('HTTP_CACHE_MAX_MB', '200'))
+    )
+
+    # Shared cache artikel hasil ekstraksi (kunci berisi bahasa dan revision id)
+    article_cache = ArticleCache(
+        cache_dir=os.getenv('ARTICLE_CACHE_DIR', '.cache/articles'),
+        ttl=int(os.getenv('ARTICLE_CACHE_TTL', '3600')),
+        max_entries=int(os.getenv('ARTICLE_CACHE_MAX_ENTRIES', '5000'))
+    )
+
+    # Cache resolusi search query -> URL artikel (query dinormalisasi, hasil kosong TTL pendek)
+    search_cache = SearchCache(
+        cache_dir=os.getenv('SEARCH_CACHE_DIR', '.cache/search'),
+        ttl=int(os.getenv('SEARCH_CACHE_TTL', '86400')),
+        negative_ttl=int(os.getenv('SEARCH_CACHE_NEGATIVE_TTL', '300')),
+        max_entries=int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', '50000'))
+    )
+
+    # Cache PDF hasil render + file_id Telegram (kunci berisi judul, revision id dan versi layout)
+    pdf_cache = PDFCache(
+        cache_dir=os.getenv('PDF_CACHE_DIR', '.cache/pdf'),
+        max_size_mb=int(os.getenv('PDF_CACHE_MAX_MB', '200')),
+        layout_version=PDF_LAYOUT_VERSION
+    )
+
+    # Data user (bahasa, bookmark, jumlah pencarian): dimuat lazy per user ke hot cache,
+    # perubahan di-flush ke SQLite secara berkala (write-behind)
+    user_store = UserStore(
+        SQLiteUserBackend(os.getenv('USER_DATA_DIR', '.data')),
+        hot_size=int(os.getenv('USER_CACHE_SIZE', '10000')),
+        flush_interval=float(os.getenv('USER_FLUSH_INTERVAL', '5'))
+    )
+
+    # Initialize scrapers
+    scrapers.update({
+        language: AsyncWikipediaScraper(
+            language=language,
+            client=http_client,
+            http_cache=http_cache,
+            article_cache=article_cache,
+            search_cache=search_cache,
+            executor=offload_executor,
+            rate_limiter=rate_limiter
+        )
+        for language in ('en', 'id')
+    })
 
 
 # Decorators
-def rate_limit(seconds=2):
-    """Rate limiting decorator untuk mencegah spam"""
+def rate_limit(command: str):
+    """Rate limiting decorator untuk mencegah spam (biaya token sesuai bobot command)"""
     def decorator(func):
-        last_called = {}
-
         @wraps(func)
         async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
             user_id = update.effective_user.id
-            current_time = time.time()
-
-            if user_id in last_called:
-                elapsed = current_time - last_called[user_id]
-                if elapsed < seconds:
-                    await update.message.reply_text(
-                        f"⏳ Mohon tunggu {int(seconds - elapsed)} detik..."
+            # Handler juga dipanggil dari tombol inline, balasan ke pesan tombol
+            message = update.effective_message
+
+            retry_after = user_limiter.consume(user_id, command)
+            if retry_after:
+                # Penolakan berulang dalam periode yang sama tidak dibalas lagi
+                if message and user_limiter.should_notify(user_id, retry_after):
+                    await message.reply_text(
+                        f"⏳ Mohon tunggu {math.ceil(retry_after)} detik..."
+                    )
+                return
+
+            try:
+                async with user_limiter.slot(user_id):
+                    return await func(update, context)
+            except LimiterBusy:
+                # Handler tidak dijalankan, token tidak ikut terpakai
+                user_limiter.refund(user_id, command)
+                if message:
+                    await message.reply_text(
+                        "⏳ Bot sedang sibuk. Mohon coba lagi sebentar lagi."
                     )
-                    return
-
-            last_called[user_id] = current_time
-            return await func(update, context)
 
         return wrapper
     return decorator
 
 
+async def preload_user(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Muat data user ke hot cache di thread pool sebelum handler lain berjalan"""
+    if update.effective_user:
+        await user_store.preload(update.effective_user.id)
+
+
 def get_user_language(user_id: int) -> str:
     """Get user's preferred language"""
-    if user_id not in user_data:
-        user_data[user_id] = {'language': 'en', 'bookmarks': [], 'searches': 0}
-    return user_data[user_id]['language']
+    return user_store.get_language(user_id)
 
 
 def set_user_language(user_id: int, language: str):
     """Set user's preferred language"""
-    if user_id not in user_data:
-        user_data[user_id] = {'language': language, 'bookmarks': [], 'searches': 0}
-    else:
-        user_data[user_id]['language'] = language
+    user_store.set_language(user_id, language)
 
 
 def increment_search_count(user_id: int):
     """Increment user's search count"""
-    if user_id not in user_data:
-        user_data[user_id] = {'language': 'en', 'bookmarks': [], 'searches': 1}
-    else:
-        user_data[user_id]['searches'] += 1
+    user_store.increment_searches(user_id)
+
+
+async def status_alive(msg, text: str) -> bool:
+    """
+    Update status message sebelum pekerjaan berat dimulai
+
+    Returns:
+        False jika pesan sudah dihapus user (pekerjaan sebaiknya dibatalkan)
+    """
+    try:
+        await msg.edit_text(text)
+        return True
+    except BadRequest as e:
+        if 'not found' in str(e).lower():
+            return False
+        # Misalnya "message is not modified", pesan masih ada
+        return True
 
 
 # Command Handlers
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler untuk /start command"""
     user = update.effective_user
-    user_id = user.id
-
-    # Initialize user data
-    if user_id not in user_data:
-        user_data[user_id] = {'language': 'en', 'bookmarks': [], 'searches': 0}
 
     welcome_text = (
         f"👋 Hi *{user.first_name}*!\n\n"
@@ -144,6 +325,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 🔹 *Pencarian & Informasi*
 /search <query> - Cari artikel Wikipedia
 /pdf <query> - Export artikel ke PDF
+/pdfbundle <A>; <B> - Beberapa artikel dalam satu PDF
 /random - Dapatkan artikel random
 /compare <A> vs <B> - Bandingkan 2 artikel
 
@@ -151,6 +333,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 /bookmark <query> - Simpan artikel
 /bookmarks - Lihat artikel tersimpan
 /clear\\_bookmarks - Hapus semua bookmark
+/pdfbundle - Semua bookmark dalam satu PDF
 
 🔹 *Pengaturan*
 /language - Ganti bahasa (EN/ID)
@@ -186,7 +369,7 @@ _Tip: Anda juga bisa mention bot di group chat!_
         )
 
 
-@rate_limit(seconds=3)
+@rate_limit('search')
 async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler untuk /search command"""
     user_id = update.effective_user.id
@@ -207,14 +390,15 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     # Send searching message
-    msg = await update.message.reply_text(
-        f"🔍 Mencari: *{query}*...",
-        parse_mode=ParseMode.MARKDOWN
-    )
+    status = f"🔍 Mencari: *{query}*..."
+    wait = rate_limiter.wait_time(scraper.api_url, language)
+    if wait >= 1:
+        status += f"\n⏳ Wikipedia sedang membatasi request, menunggu ~{wait:.0f} detik"
+    msg = await update.message.reply_text(status, parse_mode=ParseMode.MARKDOWN)
 
     try:
         # Search article
-        article_url = scraper.search_article(query)
+        article_url = await search_article(language, query)
 
         if not article_url:
             await msg.edit_text(
@@ -226,7 +410,11 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         # Scrape article
         await msg.edit_text(f"📖 Mengambil artikel...")
-        article_data = scraper.scrape_article(article_url)
+        article_data = await scrape_article(
+            language,
+            article_url,
+            before_start=lambda: status_alive(msg, "⚙️ Memproses artikel...")
+        )
 
         if article_data:
             # Increment search count
@@ -254,8 +442,8 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             # Create inline keyboard
             keyboard = [
                 [
-                    InlineKeyboardButton("📄 Export PDF", callback_data=f"pdf:{query}"),
-                    InlineKeyboardButton("🔖 Bookmark", callback_data=f"bookmark:{query}")
+                    InlineKeyboardButton("📄 Export PDF", callback_data=callback_payloads.encode('pdf', query)),
+                    InlineKeyboardButton("🔖 Bookmark", callback_data=callback_payloads.encode('bookmark', query))
                 ],
                 [
                     InlineKeyboardButton("🔍 Search Lagi", switch_inline_query_current_chat="")
@@ -272,6 +460,8 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         else:
             await msg.edit_text("❌ Gagal mengambil artikel. Coba lagi.")
 
+    except JobCancelled:
+        logger.info(f"Search cancelled, status message gone: {query}")
     except Exception as e:
         logger.error(f"Error in search: {e}")
         await msg.edit_text(
@@ -279,17 +469,18 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
 
 
-@rate_limit(seconds=5)
+@rate_limit('pdf')
 async def pdf_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler untuk /pdf command"""
     user_id = update.effective_user.id
+    # Pesan command, atau pesan yang berisi tombol inline
+    message = update.effective_message
     language = get_user_language(user_id)
-    scraper = scrapers[language]
 
     query = ' '.join(context.args)
 
     if not query:
-        await update.message.reply_text(
+        await message.reply_text(
             "❌ Mohon berikan kata kunci.\n\n"
             "*Contoh:*\n"
             "`/pdf Python programming`",
@@ -298,13 +489,16 @@ async def pdf_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     # Send processing message
-    msg = await update.message.reply_text(
+    msg = await message.reply_text(
         f"🔍 Mencari artikel...",
     )
 
     try:
+        # Cek antrian PDF sebelum scrape, request yang pasti ditolak tidak mengambil artikel
+        pdf_jobs.check(user_id)
+
         # Search article
-        article_url = scraper.search_article(query)
+        article_url = await search_article(language, query)
 
         if not article_url:
             await msg.edit_text(f"❌ Artikel tidak ditemukan: *{query}*", parse_mode=ParseMode.MARKDOWN)
@@ -312,44 +506,168 @@ async def pdf_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         # Scrape article
         await msg.edit_text("📖 Mengambil data artikel...")
-        article_data = scraper.scrape_article(article_url)
+        article_data = await scrape_article(
+            language,
+            article_url,
+            before_start=lambda: status_alive(msg, "⚙️ Memproses artikel...")
+        )
 
-        if article_data:
-            # Generate PDF
-            await msg.edit_text("📄 Membuat PDF...")
-            pdf_filename = f"wikipedia_{query.replace(' ', '_')}_{int(time.time())}.pdf"
-
-            if scraper.export_to_pdf(article_data, pdf_filename):
-                # Send PDF file
-                await msg.edit_text("📤 Mengirim PDF...")
-
-                with open(pdf_filename, 'rb') as pdf_file:
-                    await update.message.reply_document(
-                        document=pdf_file,
-                        filename=f"{article_data['title']}.pdf",
-                        caption=f"📄 *{article_data['title']}*\n\n🌍 Language: {language.upper()}",
-                        parse_mode=ParseMode.MARKDOWN
-                    )
+        if not article_data:
+            await msg.edit_text("❌ Gagal mengambil artikel.")
+            return
 
-                # Delete the status message
+        title = article_data['title']
+        revision_id = article_data.get('revision_id')
+        caption = f"📄 *{title}*\n\n🌍 Language: {language.upper()}"
+
+        cached = await run_cache_io(pdf_cache.get, language, title, revision_id)
+        if cached and cached['file_id']:
+            # PDF ini sudah pernah diupload: kirim ulang file_id, tanpa render dan upload
+            try:
+                await message.reply_document(
+                    document=cached['file_id'],
+                    caption=caption,
+                    parse_mode=ParseMode.MARKDOWN
+                )
                 await msg.delete()
-
-                # Clean up file
-                if os.path.exists(pdf_filename):
-                    os.remove(pdf_filename)
-
-                # Increment search count
                 increment_search_count(user_id)
-            else:
-                await msg.edit_text("❌ Gagal membuat PDF. Coba lagi.")
+                return
+            except BadRequest as e:
+                logger.warning(f"Cached file_id rejected for {title}: {e}")
+                await run_cache_io(pdf_cache.clear_file_id, language, title, revision_id)
+
+        if cached:
+            pdf_bytes = cached['data']
         else:
-            await msg.edit_text("❌ Gagal mengambil artikel.")
+            # Generate PDF di memory lewat worker pool PDF, tanpa file sementara
+            async def progress(stage: str, position: int) -> bool:
+                if stage == 'queued':
+                    return await status_alive(msg, f"⏳ Menunggu antrian PDF (posisi {position})...")
+                return await status_alive(msg, "📄 Merender PDF...")
+
+            pdf_bytes = await pdf_jobs.render(user_id, article_data, progress=progress)
+            if not pdf_bytes:
+                await msg.edit_text("❌ Gagal membuat PDF. Coba lagi.")
+                return
+            await run_cache_io(pdf_cache.put, language, title, revision_id, pdf_bytes)
+
+        # Send PDF file
+        await msg.edit_text("📤 Mengirim PDF...")
+
+        sent = await message.reply_document(
+            document=pdf_bytes,
+            filename=f"{title}.pdf",
+            caption=caption,
+            parse_mode=ParseMode.MARKDOWN
+        )
+        if sent.document:
+            await run_cache_io(pdf_cache.set_file_id, language, title, revision_id,
+                               sent.document.file_id)
 
+        # Delete the status message
+        await msg.delete()
+
+        # Increment search count
+        increment_search_count(user_id)
+
+    except JobRejected as e:
+        if isinstance(e, QueueFull):
+            await msg.edit_text("⏳ Server PDF sedang sibuk. Coba lagi sebentar lagi.")
+        else:
+            await msg.edit_text("⏳ PDF Anda sebelumnya masih diproses. Mohon tunggu hingga selesai.")
+    except JobCancelled:
+        logger.info(f"PDF cancelled, status message gone: {query}")
     except Exception as e:
         logger.error(f"Error in PDF generation: {e}")
         await msg.edit_text("❌ Terjadi kesalahan. Mohon coba lagi.")
 
 
+@rate_limit('pdfbundle')
+async def pdfbundle_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handler untuk /pdfbundle command - beberapa artikel dalam satu PDF dengan daftar isi"""
+    user_id = update.effective_user.id
+    # Pesan command, atau pesan yang berisi tombol inline
+    message = update.effective_message
+    language = get_user_language(user_id)
+
+    # Query dipisah dengan ';', tanpa argumen pakai bookmark user
+    args = ' '.join(context.args)
+    if args:
+        queries = [q.strip() for q in args.split(';') if q.strip()]
+        title = "Wikipedia Articles"
+    else:
+        queries = user_store.bookmarks(user_id)
+        title = "My Wikipedia Bookmarks"
+
+    if not queries:
+        await message.reply_text(
+            "❌ Mohon berikan beberapa artikel (dipisah `;`) atau simpan bookmark dulu.\n\n"
+            "*Contoh:*\n"
+            "`/pdfbundle Python; Java; Rust`\n"
+            "`/pdfbundle` - semua bookmark Anda",
+            parse_mode=ParseMode.MARKDOWN
+        )
+        return
+
+    if len(queries) > PDF_BUNDLE_MAX:
+        await message.reply_text(f"❌ Maksimal {PDF_BUNDLE_MAX} artikel per bundle.")
+        return
+
+    msg = await message.reply_text(f"🔍 Mengambil {len(queries)} artikel...")
+
+    try:
+        # Cek antrian PDF sebelum mengambil banyak artikel
+        pdf_jobs.check(user_id)
+
+        # Semua artikel diambil bersamaan
+        urls = await search_articles(language, queries)
+        unique = list(dict.fromkeys(url for url in urls.values() if url))
+        still_visible = lambda: status_alive(msg, "⚙️ Memproses artikel...")
+        articles = await asyncio.gather(*(
+            scrape_article(language, url, before_start=still_visible) for url in unique
+        ))
+        articles = [article for article in articles if article]
+        if not articles:
+            await msg.edit_text("❌ Tidak ada artikel yang ditemukan.")
+            return
+
+        async def progress(stage: str, position: int) -> bool:
+            if stage == 'queued':
+                return await status_alive(msg, f"⏳ Menunggu antrian PDF (posisi {position})...")
+            return await status_alive(msg, f"📄 Merender PDF ({len(articles)} artikel)...")
+
+        pdf_bytes = await pdf_jobs.render_bundle(user_id, articles, title, progress=progress)
+        if not pdf_bytes:
+            await msg.edit_text("❌ Gagal membuat PDF. Coba lagi.")
+            return
+
+        await msg.edit_text("📤 Mengirim PDF...")
+        missing = len(queries) - len(articles)
+        caption = f"📚 *{title}*\n\n📄 {len(articles)} artikel\n🌍 Language: {language.upper()}"
+        if missing > 0:
+            caption += f"\n⚠️ {missing} artikel tidak ditemukan"
+        await message.reply_document(
+            document=pdf_bytes,
+            filename="wikipedia_bundle.pdf",
+            caption=caption,
+            parse_mode=ParseMode.MARKDOWN
+        )
+        await msg.delete()
+
+        increment_search_count(user_id)
+
+    except JobRejected as e:
+        if isinstance(e, QueueFull):
+            await msg.edit_text("⏳ Server PDF sedang sibuk. Coba lagi sebentar lagi.")
+        else:
+            await msg.edit_text("⏳ PDF Anda sebelumnya masih diproses. Mohon tunggu hingga selesai.")
+    except JobCancelled:
+        logger.info("PDF bundle cancelled, status message gone")
+    except Exception as e:
+        logger.error(f"Error in PDF bundle: {e}")
+        await msg.edit_text("❌ Terjadi kesalahan. Mohon coba lagi.")
+
+
 async def language_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler untuk /language command"""
     user_id = update.effective_user.id
@@ -394,10 +712,7 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler untuk /stats command"""
     user_id = update.effective_user.id
 
-    if user_id not in user_data:
-        user_data[user_id] = {'language': 'en', 'bookmarks': [], 'searches': 0}
-
-    data = user_data[user_id]
+    data = user_store.get(user_id)
     language_name = 'English 🇬🇧' if data['language'] == 'en' else 'Indonesian 🇮🇩'
 
     stats_text = (
@@ -437,12 +752,8 @@ async def bookmark_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
 
-    if user_id not in user_data:
-        user_data[user_id] = {'language': 'en', 'bookmarks': [], 'searches': 0}
-
     # Check if already bookmarked
-    if query not in user_data[user_id]['bookmarks']:
-        user_data[user_id]['bookmarks'].append(query)
+    if user_store.add_bookmark(user_id, query):
         await update.message.reply_text(
             f"✅ Artikel disimpan: *{query}*\n\n"
             f"Lihat semua bookmark: /bookmarks",
@@ -459,7 +770,9 @@ async def bookmarks_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler untuk /bookmarks command"""
     user_id = update.effective_user.id
 
-    if user_id not in user_data or not user_data[user_id]['bookmarks']:
+    bookmarks = user_store.bookmarks(user_id)
+
+    if not bookmarks:
         await update.message.reply_text(
             "📚 Belum ada bookmark.\n\n"
             "Simpan artikel dengan: `/bookmark <nama artikel>`",
@@ -467,7 +780,6 @@ async def bookmarks_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
 
-    bookmarks = user_data[user_id]['bookmarks']
     text = "📚 *Bookmarks Anda:*\n\n"
 
     for i, bookmark in enumerate(bookmarks, 1):
@@ -485,22 +797,29 @@ async def bookmarks_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
 
+@rate_limit('random')
 async def random_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler untuk /random command"""
     user_id = update.effective_user.id
+    # Pesan command, atau pesan yang berisi tombol inline
+    message = update.effective_message
     language = get_user_language(user_id)
     scraper = scrapers[language]
 
-    msg = await update.message.reply_text("🎲 Mencari artikel random...")
+    msg = await message.reply_text("🎲 Mencari artikel random...")
 
     try:
         # Get random article URL
         random_url = f"{scraper.base_url}/wiki/Special:Random"
-        response = scraper.get_page(random_url)
+        response = await scraper.get_page(random_url)
 
         if response:
-            article_url = response.url
-            article_data = scraper.scrape_article(article_url)
+            article_url = str(response.url)
+            article_data = await scrape_article(
+                language,
+                article_url,
+                before_start=lambda: status_alive(msg, "⚙️ Memproses artikel...")
+            )
 
             if article_data:
                 summary = article_data['summary'][:400] + "..."
@@ -514,7 +833,7 @@ async def random_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
                 keyboard = [
                     [
-                        InlineKeyboardButton("📄 Export PDF", callback_data=f"pdf:{article_data['title']}"),
+                        InlineKeyboardButton("📄 Export PDF", callback_data=callback_payloads.encode('pdf', article_data['title'])),
                         InlineKeyboardButton("🎲 Random Lagi", callback_data="random")
                     ]
                 ]
@@ -531,17 +850,18 @@ async def random_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         else:
             await msg.edit_text("❌ Gagal mengambil artikel random.")
 
+    except JobCancelled:
+        logger.info("Random cancelled, status message gone")
     except Exception as e:
         logger.error(f"Error in random: {e}")
         await msg.edit_text("❌ Terjadi kesalahan.")
 
 
-@rate_limit(seconds=5)
+@rate_limit('compare')
 async def compare_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler untuk /compare command - membandingkan dua artikel"""
     user_id = update.effective_user.id
     language = get_user_language(user_id)
-    scraper = scrapers[language]
 
     # Parse arguments - expected format: /compare Article1 vs Article2
     args = ' '.join(context.args)
@@ -578,12 +898,13 @@ async def compare_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
     try:
-        # Search both articles
-        await msg.edit_text(f"📖 Mencari artikel pertama: *{topic1.title()}*...", parse_mode=ParseMode.MARKDOWN)
-        url1 = scraper.search_article(topic1)
-
-        await msg.edit_text(f"📖 Mencari artikel kedua: *{topic2.title()}*...", parse_mode=ParseMode.MARKDOWN)
-        url2 = scraper.search_article(topic2)
+        # Search both articles (satu request API untuk judul yang cocok persis)
+        await msg.edit_text(
+            f"📖 Mencari artikel: *{topic1.title()}* dan *{topic2.title()}*...",
+            parse_mode=ParseMode.MARKDOWN
+        )
+        urls = await search_articles(language, [topic1, topic2])
+        url1, url2 = urls[topic1], urls[topic2]
 
         if not url1:
             await msg.edit_text(f"❌ Artikel tidak ditemukan: *{topic1}*", parse_mode=ParseMode.MARKDOWN)
@@ -595,8 +916,11 @@ async def compare_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         # Scrape both articles
         await msg.edit_text("🔄 Mengambil data artikel...")
-        article1 = scraper.scrape_article(url1)
-        article2 = scraper.scrape_article(url2)
+        still_visible = lambda: status_alive(msg, "⚙️ Memproses artikel...")
+        article1, article2 = await asyncio.gather(
+            scrape_article(language, url1, before_start=still_visible),
+            scrape_article(language, url2, before_start=still_visible)
+        )
 
         if not article1 or not article2:
             await msg.edit_text("❌ Gagal mengambil data artikel.")
@@ -662,10 +986,11 @@ async def compare_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         # Create keyboard
         keyboard = [
             [
-                InlineKeyboardButton(f"📄 PDF {article1['title'][:15]}", callback_data=f"pdf:{topic1}"),
-                InlineKeyboardButton(f"📄 PDF {article2['title'][:15]}", callback_data=f"pdf:{topic2}")
+                InlineKeyboardButton(f"📄 PDF {article1['title'][:15]}", callback_data=callback_payloads.encode('pdf', topic1)),
+                InlineKeyboardButton(f"📄 PDF {article2['title'][:15]}", callback_data=callback_payloads.encode('pdf', topic2))
             ],
             [
+                InlineKeyboardButton("📚 PDF Keduanya", callback_data=callback_payloads.encode('pdfbundle', f"{topic1};{topic2}")),
                 InlineKeyboardButton("🔍 Compare Lagi", switch_inline_query_current_chat="/compare ")
             ]
         ]
@@ -695,6 +1020,8 @@ async def compare_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         # Increment search count
         increment_search_count(user_id)
 
+    except JobCancelled:
+        logger.info("Compare cancelled, status message gone")
     except Exception as e:
         logger.error(f"Error in compare: {e}")
         await msg.edit_text("❌ Terjadi kesalahan saat membandingkan artikel.")
@@ -745,53 +1072,62 @@ _Bot ini dibuat untuk tujuan edukatif._
 async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler untuk inline button callbacks"""
     query = update.callback_query
-    await query.answer()
 
     user_id = update.effective_user.id
-    data = query.data
+    action, payload = callback_payloads.decode(query.data)
+
+    if action in ("pdf", "pdfbundle", "bookmark") and payload is None:
+        await query.answer("⌛ Tombol ini sudah kedaluwarsa. Kirim ulang perintahnya.", show_alert=True)
+        return
+    if action in ("pdf", "pdfbundle", "random") and update.effective_message is None:
+        # Pesan tombol terlalu lama (tidak bisa diakses lagi), tidak ada tempat untuk membalas
+        await query.answer("⌛ Pesan ini sudah terlalu lama. Kirim ulang perintahnya.", show_alert=True)
+        return
 
     # Handle different callback actions
-    if data == "start":
+    if action == "start":
+        await query.answer()
         await start_callback(update, context)
-    elif data == "help":
+    elif action == "help":
+        await query.answer()
         await help_command(update, context)
-    elif data == "language":
+    elif action == "language":
+        await query.answer()
         await language_command(update, context)
-    elif data == "stats":
+    elif action == "stats":
+        await query.answer()
         await stats_command(update, context)
-    elif data.startswith("lang:"):
-        lang = data.split(":")[1]
-        set_user_language(user_id, lang)
-        await query.answer(f"✅ Bahasa diubah ke {'English' if lang == 'en' else 'Indonesian'}")
+    elif action == "lang":
+        set_user_language(user_id, payload)
+        await query.answer(f"✅ Bahasa diubah ke {'English' if payload == 'en' else 'Indonesian'}")
         await language_command(update, context)
-    elif data.startswith("pdf:"):
-        search_query = data.split(":", 1)[1]
+    elif action == "pdf":
         await query.answer("📄 Generating PDF...")
-        # Simulate message for pdf_command
-        context.args = search_query.split()
-        update.message = query.message
+        # Handler command membalas ke update.effective_message (pesan tombol)
+        context.args = payload.split()
         await pdf_command(update, context)
-    elif data.startswith("bookmark:"):
-        bookmark_query = data.split(":", 1)[1]
-        if user_id not in user_data:
-            user_data[user_id] = {'language': 'en', 'bookmarks': [], 'searches': 0}
-        if bookmark_query not in user_data[user_id]['bookmarks']:
-            user_data[user_id]['bookmarks'].append(bookmark_query)
-            await query.answer(f"✅ Disimpan: {bookmark_query}")
+    elif action == "pdfbundle":
+        await query.answer("📚 Generating PDF bundle...")
+        context.args = payload.split()
+        await pdfbundle_command(update, context)
+    elif action == "bookmark":
+        if user_store.add_bookmark(user_id, payload):
+            await query.answer(f"✅ Disimpan: {payload}")
         else:
             await query.answer("ℹ️ Sudah ada di bookmark")
-    elif data == "clear_bookmarks":
-        if user_id in user_data:
-            user_data[user_id]['bookmarks'] = []
+    elif action == "clear_bookmarks":
+        user_store.clear_bookmarks(user_id)
         await query.answer("✅ Semua bookmark dihapus")
         await query.edit_message_text(
             "📚 Semua bookmark telah dihapus.",
             reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Home", callback_data="start")]])
         )
-    elif data == "random":
+    elif action == "random":
+        await query.answer()
         context.args = []
-        update.message = query.message
         await random_command(update, context)
+    else:
+        await query.answer()
 
 
 async def start_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -841,6 +1177,70 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     logger.error(f"Update {update} caused error {context.error}")
 
 
+async def post_shutdown(application: Application):
+    """Tutup connection pool dan executor serta flush data user saat bot berhenti"""
+    await http_client.aclose()
+    offload_executor.shutdown(wait=False)
+    pdf_jobs.shutdown(wait=False)
+    # Tulis perubahan data user yang belum di-flush
+    user_store.close()
+
+
+def parse_args() -> argparse.Namespace:
+    """Argumen command line, default dari environment variable"""
+    parser = argparse.ArgumentParser(description='Wikipedia Scraper Telegram Bot')
+    parser.add_argument(
+        '--mode',
+        choices=('polling', 'webhook'),
+        default=os.getenv('BOT_MODE', 'polling'),
+        help='How updates are received (default: BOT_MODE or polling)'
+    )
+    parser.add_argument(
+        '--concurrent-updates',
+        type=int,
+        default=int(os.getenv('BOT_CONCURRENT_UPDATES', '64')),
+        help='Updates processed concurrently, in order per user and chat; 1 for strictly sequential (default: 64)',
+        metavar='N'
+    )
+    parser.add_argument(
+        '--listen',
+        default=os.getenv('WEBHOOK_LISTEN', '0.0.0.0'),
+        help='Webhook server listen address (default: 0.0.0.0)'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=int(os.getenv('WEBHOOK_PORT', '8443')),
+        help='Webhook server port (default: 8443)'
+    )
+    parser.add_argument(
+        '--webhook-path',
+        default=os.getenv('WEBHOOK_PATH', '/telegram'),
+        help='Path that receives updates (default: /telegram)',
+        metavar='PATH'
+    )
+    parser.add_argument(
+        '--webhook-url',
+        default=os.getenv('WEBHOOK_URL') or None,
+        help='Public HTTPS URL registered with Telegram; omit to skip registration (local testing)',
+        metavar='URL'
+    )
+    parser.add_argument(
+        '--secret-token',
+        default=os.getenv('WEBHOOK_SECRET_TOKEN') or None,
+        help='Secret Telegram must send in the X-Telegram-Bot-Api-Secret-Token header',
+        metavar='TOKEN'
+    )
+    parser.add_argument(
+        '--max-connections',
+        type=int,
+        default=int(os.getenv('WEBHOOK_MAX_CONNECTIONS', '40')),
+        help='Maximum simultaneous webhook connections from Telegram, 1-100 (default: 40)',
+        metavar='N'
+    )
+    return parser.parse_args()
+
+
 def main():
     """Main function to run the bot"""
 
@@ -848,14 +1248,33 @@ def main():
         logger.error("TELEGRAM_BOT_TOKEN tidak ditemukan!")
         return
 
+    args = parse_args()
+    init_services()
+    user_store.start()
+
     # Create application
-    application = Application.builder().token(TELEGRAM_TOKEN).build()
+    builder = (
+        Application.builder()
+        .token(TELEGRAM_TOKEN)
+        .post_shutdown(post_shutdown)
+        # Update dari user berbeda diproses bersamaan, update satu user di satu chat berurutan
+        # (batas handler berat diatur user_limiter)
+        .concurrent_updates(UserUpdateProcessor(max(1, args.concurrent_updates)))
+    )
+    if args.mode == 'webhook':
+        # Update masuk lewat server webhook sendiri, bukan Updater
+        builder = builder.updater(None)
+    application = builder.build()
+
+    # Data user dimuat di luar event loop sebelum handler (group -1 berjalan lebih dulu)
+    application.add_handler(TypeHandler(Update, preload_user), group=-1)
 
     # Add command handlers
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("help", help_command))
     application.add_handler(CommandHandler("search", search_command))
     application.add_handler(CommandHandler("pdf", pdf_command))
+    application.add_handler(CommandHandler("pdfbundle", pdfbundle_command))
     application.add_handler(CommandHandler("language", language_command))
     application.add_handler(CommandHandler("stats", stats_command))
     application.add_handler(CommandHandler("bookmark", bookmark_command))
@@ -874,11 +1293,22 @@ def main():
     application.add_error_handler(error_handler)
 
     # Start the bot
-    logger.info("🤖 Wikipedia Scraper Bot started...")
+    logger.info(f"🤖 Wikipedia Scraper Bot started ({args.mode} mode)...")
     logger.info(f"Bot is running. Press Ctrl+C to stop.")
 
     # Run the bot
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    if args.mode == 'webhook':
+        asyncio.run(serve_webhook(
+            application,
+            listen=args.listen,
+            port=args.port,
+            url_path=args.webhook_path,
+            secret_token=args.secret_token,
+            webhook_url=args.webhook_url,
+            max_connections=args.max_connections
+        ))
+    else:
+        application.run_polling(allowed_updates=Update.ALL_TYPES)
 
 
 if __name__ == '__main__':
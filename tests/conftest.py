@@ -0,0 +1,102 @@
+"""
+Fixture bersama untuk test
+Modul proyek berada di root repository (tanpa package), jadi root
+ditambahkan ke sys.path. Fixture wiki_server menjalankan stand-in API
+server MediaWiki lokal yang mencatat setiap request.
+"""
+
+import os
+import sys
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StandInWiki:
+    """State stand-in server: halaman, redirect, status paksa dan log request"""
+
+    def __init__(self):
+        self.pages = {'Python (programming language)', 'Nice', 'NICE', 'Rust (programming language)'}
+        self.redirects = {'Python language': 'Python (programming language)'}
+        self.requests = []
+        # Status HTTP yang dikirim untuk request berikutnya (dipakai berurutan)
+        self.statuses = []
+        self.base_url = ''
+
+    def article_url(self, title: str) -> str:
+        return f"{self.base_url}/wiki/{quote(title.replace(' ', '_'), safe='/:;@$!*(),~')}"
+
+    def query(self, titles):
+        normalized, redirects, pages = [], [], []
+        for title in titles:
+            canonical = title.replace('_', ' ')
+            canonical = canonical[:1].upper() + canonical[1:]
+            if canonical != title:
+                normalized.append({'from': title, 'to': canonical})
+            if canonical in self.redirects:
+                redirects.append({'from': canonical, 'to': self.redirects[canonical]})
+                canonical = self.redirects[canonical]
+            if canonical in self.pages:
+                pages.append({'ns': 0, 'title': canonical, 'pageid': len(pages) + 1})
+            else:
+                pages.append({'ns': 0, 'title': canonical, 'missing': True})
+        return {'query': {'normalized': normalized, 'redirects': redirects, 'pages': pages}}
+
+    def opensearch(self, search):
+        for title in sorted(self.pages):
+            if title.lower().startswith(search.lower()):
+                return [search, [title], [''], [self.article_url(title)]]
+        return [search, [], [], []]
+
+
+def _handler(wiki: StandInWiki):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+            wiki.requests.append(params)
+
+            if wiki.statuses:
+                status = wiki.statuses.pop(0)
+                if status != 200:
+                    self.send_response(status)
+                    self.send_header('Retry-After', '0')
+                    self.end_headers()
+                    return
+
+            if params.get('action') == 'query' and 'titles' in params:
+                body = wiki.query(params['titles'].split('|'))
+            elif params.get('action') == 'opensearch':
+                body = wiki.opensearch(params.get('search', ''))
+            else:
+                body = {}
+
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def wiki_server():
+    """Stand-in API server MediaWiki di port acak, mengembalikan StandInWiki"""
+    wiki = StandInWiki()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _handler(wiki))
+    wiki.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield wiki
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,26 @@
+"""Posisi judul section di content artikel HTML (user-019)"""
+
+import pytest
+
+from app import WikipediaScraper, PARSER_BACKENDS
+from fast_extract import is_available as selectolax_available
+
+# Baris infobox dan daftar isi sama persis dengan teks judul section
+ARTICLE_HTML = """<html><body><h1 class="firstHeading">T</h1><div class="mw-parser-output">
+<table class="infobox"><tr><th>History</th><td>x</td></tr></table>
+<p>Lead</p><div id="toc"><ul><li>History</li><li>Usage</li></ul></div>
+<h2><span class="mw-headline">History</span><span class="mw-editsection">[<a>edit</a>]</span></h2>
+<p>Body</p><h3><span class="mw-headline">Usage</span></h3><p>Use</p><h2></h2>
+</div></body></html>"""
+
+
+@pytest.mark.parametrize('parser', PARSER_BACKENDS)
+def test_sections_point_at_heading_lines_not_earlier_duplicates(parser):
+    if parser == 'selectolax' and not selectolax_available():
+        pytest.skip('selectolax not installed')
+    data = WikipediaScraper(parser=parser).extract_article(ARTICLE_HTML, 'https://en.wikipedia.org/wiki/T')
+
+    lines = data['content'].split('\n')
+    assert data['sections'] == [[2, 5], [3, 10]]
+    assert [lines[index] for _, index in data['sections']] == ['History', 'Usage']
+    assert '\x00' not in data['content']
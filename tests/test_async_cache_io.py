@@ -0,0 +1,46 @@
+"""Query SQLite HTTP dan article cache scraper async berjalan di luar event loop (user-003)"""
+
+import asyncio
+import threading
+
+from article_cache import ArticleCache
+from async_scraper import AsyncWikipediaScraper
+from http_cache import HTTPCache
+from rate_limiter import RateLimiter
+
+
+def record_threads(cache, names, calls):
+    """Bungkus method cache supaya thread pemanggilnya dicatat"""
+    for name in names:
+        method = getattr(cache, name)
+
+        def wrapper(*args, _method=method, _name=name, **kwargs):
+            calls.append((_name, threading.get_ident()))
+            return _method(*args, **kwargs)
+
+        setattr(cache, name, wrapper)
+
+
+def test_cache_calls_run_outside_event_loop(wiki_server, tmp_path):
+    http_cache = HTTPCache(cache_dir=str(tmp_path / 'http'))
+    article_cache = ArticleCache(cache_dir=str(tmp_path / 'articles'))
+    url = f"{wiki_server.base_url}/wiki/Nice"
+    article_cache.put(url, url, 'en', 1, {'title': 'Nice', 'url': url, 'revision_id': 1})
+    calls = []
+    record_threads(http_cache, ('lookup', 'store', 'mark_revalidated'), calls)
+    record_threads(article_cache, ('get', 'put'), calls)
+
+    async def run():
+        scraper = AsyncWikipediaScraper(base_url=wiki_server.base_url, rate_limiter=RateLimiter(rate=0),
+                                        http_cache=http_cache, article_cache=article_cache)
+        try:
+            assert await scraper.get_page(url)
+            assert (await scraper.scrape_article(url))['title'] == 'Nice'
+            return threading.get_ident()
+        finally:
+            await scraper.close()
+
+    loop_thread = asyncio.run(run())
+
+    assert {name for name, _ in calls} >= {'lookup', 'store', 'get'}
+    assert all(thread != loop_thread for _, thread in calls)
@@ -0,0 +1,38 @@
+"""callback_data tombol inline dalam batas 64 byte Telegram (user-020)"""
+
+from callback_data import MAX_CALLBACK_BYTES, CallbackPayloads
+
+
+def test_short_payload_is_sent_inline():
+    payloads = CallbackPayloads()
+    assert payloads.encode('pdf', 'Python') == 'pdf:Python'
+    assert payloads.decode('pdf:Python') == ('pdf', 'Python')
+    assert payloads.decode('random') == ('random', None)
+
+
+def test_long_payload_is_stored_under_short_key():
+    payloads = CallbackPayloads()
+    bundle = 'history of the byzantine empire;timeline of ancient greek philosophy'
+
+    data = payloads.encode('pdfbundle', bundle)
+
+    assert len(data.encode('utf-8')) <= MAX_CALLBACK_BYTES
+    assert payloads.decode(data) == ('pdfbundle', bundle)
+
+
+def test_multibyte_payload_counts_bytes():
+    payloads = CallbackPayloads()
+    title = 'Перестройка и гласность в Советском Союзе'
+
+    data = payloads.encode('pdf', title)
+
+    assert len(data.encode('utf-8')) <= MAX_CALLBACK_BYTES
+    assert payloads.decode(data) == ('pdf', title)
+
+
+def test_evicted_payload_is_expired():
+    payloads = CallbackPayloads(max_entries=1)
+    first = payloads.encode('pdf', 'a' * 80)
+    payloads.encode('pdf', 'b' * 80)
+
+    assert payloads.decode(first) == ('pdf', None)
@@ -0,0 +1,137 @@
+"""Crawl yang dilanjutkan dan output JSONLSink setelah crash (user-014)"""
+
+import os
+from types import SimpleNamespace
+
+from crawler import Crawler, Frontier, DONE, PENDING
+from output_sink import JSONLSink, read_jsonl
+
+BASE = 'https://en.wikipedia.org/wiki/'
+
+# Graf link antar artikel: setiap halaman menaut ke dua halaman berikutnya
+LINKS = {f"P{i}": [f"P{2 * i + 1}", f"P{2 * i + 2}"] for i in range(20)}
+
+
+class GraphScraper:
+    """Scraper pengganti tanpa jaringan, link diambil dari LINKS"""
+
+    backend = 'api'
+
+    def __init__(self):
+        self.scraped = []
+
+    def scrape_article_page(self, url):
+        self.scraped.append(url)
+        return {'url': url, 'title': url.rsplit('/', 1)[-1]}, None
+
+    def article_links_api(self, url):
+        return [BASE + title for title in LINKS.get(url.rsplit('/', 1)[-1], [])]
+
+
+class HTMLGraphScraper(GraphScraper):
+    """Backend html: link diambil dari HTML response halaman"""
+
+    backend = 'html'
+
+    def __init__(self):
+        super().__init__()
+        self.fetched = []
+
+    def scrape_article_page(self, url):
+        data, _ = super().scrape_article_page(url)
+        self.fetched.append(url)
+        html = ''.join(f'<a href="/wiki/{title}">{title}</a>' for title in LINKS.get(data['title'], []))
+        return data, SimpleNamespace(text=html, url=url)
+
+    def get_page(self, url):
+        self.fetched.append(url)
+        return None
+
+    def filter_article_links(self, links, max_links, base_url):
+        return [base_url + link['url'] for link in links][:max_links]
+
+
+def read_output(state_dir):
+    records = []
+    for name in sorted(os.listdir(state_dir)):
+        if name.startswith('pages'):
+            records.extend(read_jsonl(os.path.join(state_dir, name)))
+    return records
+
+
+def test_resumed_crawl_writes_new_part_without_duplicates(tmp_path):
+    state_dir = str(tmp_path / 'crawl')
+
+    first = Crawler(GraphScraper(), state_dir=state_dir, max_depth=5, max_pages=3, workers=1,
+                    delay=0, checkpoint_every=1)
+    assert first.run([BASE + 'P0'])['done'] == 3
+    first.close()
+
+    second = Crawler(GraphScraper(), state_dir=state_dir, max_depth=5, max_pages=7, workers=2,
+                     delay=0, checkpoint_every=1)
+    assert second.run([BASE + 'P0'])['done'] == 7
+    second.close()
+
+    assert 'pages-00001.jsonl' in os.listdir(state_dir)
+    titles = [record['title'] for record in read_output(state_dir)]
+    assert sorted(titles) == sorted(f"P{i}" for i in range(7))
+
+
+def test_done_is_persisted_only_at_checkpoint(tmp_path):
+    state_dir = str(tmp_path / 'crawl')
+    frontier = Frontier(state_dir, capacity=1000)
+    frontier.add([BASE + 'P0', BASE + 'P1'], 0)
+    first = frontier.claim(None)
+    frontier.finish(first[0], True)
+    frontier.checkpoint()
+    second = frontier.claim(None)
+    frontier.finish(second[0], True)
+    # Crash: record halaman kedua belum di-flush, jadi belum ada checkpoint
+    frontier._conn.close()
+
+    resumed = Frontier(state_dir, capacity=1000)
+    assert resumed.counts[DONE] == 1
+    assert resumed.counts[PENDING] == 1
+    assert resumed.claim(None)[1] == BASE + 'P1'
+    resumed.close()
+
+
+def test_append_after_crash_keeps_flushed_records(tmp_path):
+    path = str(tmp_path / 'pages.jsonl.gz')
+
+    crashed = JSONLSink(path)
+    crashed.write({'n': 1})
+    crashed.flush()
+    # Proses mati: stream gzip tidak pernah ditutup
+
+    with JSONLSink(path, append=True) as sink:
+        sink.write({'n': 2})
+    assert sink.current_path == str(tmp_path / 'pages-00001.jsonl.gz')
+
+    assert list(read_jsonl(path)) == [{'n': 1}]
+    assert list(read_jsonl(sink.current_path)) == [{'n': 2}]
+
+
+def test_sink_overwrites_output_by_default(tmp_path):
+    path = str(tmp_path / 'articles.jsonl')
+    for n in (1, 2):
+        with JSONLSink(path, max_bytes=1) as sink:
+            sink.write({'n': n})
+            sink.write({'n': n})
+
+    # Rotasi setelah setiap record: dua file berisi record dan satu file kosong terakhir
+    assert sorted(os.listdir(tmp_path)) == [f"articles-0000{i}.jsonl" for i in range(3)]
+    assert list(read_jsonl(str(tmp_path / 'articles-00000.jsonl'))) == [{'n': 2}]
+
+
+def test_html_backend_fetches_each_page_once(tmp_path):
+    scraper = HTMLGraphScraper()
+    crawler = Crawler(scraper, state_dir=str(tmp_path / 'crawl'), max_depth=2, max_pages=7, workers=1,
+                      delay=0, checkpoint_every=1)
+
+    assert crawler.run(['https://en.wikipedia.org/wiki/P0'])['done'] == 7
+    crawler.close()
+
+    # Link diambil dari response scrape, bukan dari get_page kedua
+    assert sorted(scraper.fetched) == sorted(set(scraper.fetched))
+    assert len(scraper.fetched) == 7
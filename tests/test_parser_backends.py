@@ -0,0 +1,63 @@
+"""Output extract_article / extract_homepage identik di semua backend parser (user-005)"""
+
+import importlib.util
+import os
+
+import pytest
+
+from app import WikipediaScraper, PARSER_BACKENDS
+from fast_extract import is_available as selectolax_available
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+ARTICLE_URL = 'https://id.wikipedia.org/wiki/Danau_Toba'
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def installed(parser: str) -> bool:
+    if parser == 'selectolax':
+        return selectolax_available()
+    if parser == 'lxml':
+        return importlib.util.find_spec('lxml') is not None
+    return True
+
+
+# Varian seperti benchmark_parsers: BeautifulSoup dengan dan tanpa partial parse
+VARIANTS = [
+    (parser, partial)
+    for parser in PARSER_BACKENDS
+    for partial in ((None,) if parser == 'selectolax' else (False, True))
+]
+
+REFERENCE = WikipediaScraper(parser='html.parser', partial_parse=False)
+
+
+@pytest.mark.parametrize('parser, partial', VARIANTS)
+def test_backends_extract_identical_output(parser, partial):
+    if not installed(parser):
+        pytest.skip(f'{parser} not installed')
+    if partial is None:
+        scraper = WikipediaScraper(parser=parser)
+    else:
+        scraper = WikipediaScraper(parser=parser, partial_parse=partial)
+    article = read_fixture('article.html')
+    homepage = read_fixture('homepage.html')
+
+    assert scraper.extract_article(article, ARTICLE_URL) == REFERENCE.extract_article(article, ARTICLE_URL)
+    assert scraper.extract_homepage(homepage) == REFERENCE.extract_homepage(homepage)
+    assert scraper.extract_homepage(article) == REFERENCE.extract_homepage(article)
+
+
+def test_article_fixture_is_fully_extracted():
+    data = REFERENCE.extract_article(read_fixture('article.html'), ARTICLE_URL)
+
+    assert data['title'] == 'Danau Toba'
+    assert data['revision_id'] == 24811234
+    assert data['references'] == 2
+    assert data['infobox']['Lokasi'] == 'Sumatera Utara,Indonesia'
+    assert 'Danau di Indonesia' in data['categories']
+    lines = data['content'].split('\n')
+    assert [lines[index] for _, index in data['sections']][1:] == ['Geologi', 'Letusan Toba', 'Ekologi', 'Referensi']
@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+
+from pdf_jobs import PDFJobService, UserLimitReached
+
+
+def test_check_does_not_track_idle_users():
+    service = PDFJobService(workers=1, mode='thread')
+    for user_id in range(100):
+        service.check(user_id)
+    assert service._active == {}
+
+
+def test_active_jobs_are_released():
+    service = PDFJobService(workers=1, per_user=1, mode='thread')
+
+    async def main():
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def progress(stage, position):
+            if stage == 'rendering':
+                started.set()
+                await release.wait()
+            return True
+
+        job = asyncio.ensure_future(service._submit(1, progress, str.encode, 'abc'))
+        await started.wait()
+        with pytest.raises(UserLimitReached):
+            service.check(1)
+        service.check(2)
+        release.set()
+        return await job
+
+    assert asyncio.run(main()) == b'abc'
+    assert service._active == {}
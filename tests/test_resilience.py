@@ -0,0 +1,154 @@
+"""State machine circuit breaker dan loop retry scraper (user-013)"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app import WikipediaScraper
+from async_scraper import AsyncWikipediaScraper
+from rate_limiter import RateLimiter
+from resilience import CircuitBreaker, CircuitOpenError, Resilience
+
+
+def test_breaker_opens_after_threshold_and_probes_once():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    assert breaker.allow()
+
+    assert not breaker.record_failure()
+    assert breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    # Hanya satu request percobaan selama half-open
+    assert breaker.allow()
+    assert breaker.state == 'half_open'
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.failures == 0
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens_circuit():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+
+    assert breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+
+def test_abandoned_request_only_reopens_half_open():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    assert not breaker.record_abandoned()
+    assert breaker.state == 'closed'
+
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.record_abandoned()
+    assert breaker.state == 'open'
+
+
+def resilience(**kwargs):
+    options = {'max_attempts': 3, 'base_delay': 0.001, 'failure_threshold': 100}
+    options.update(kwargs)
+    return Resilience(**options)
+
+
+def test_throttled_requests_share_one_retry_loop(wiki_server):
+    wiki_server.statuses = [503] * 10
+    scraper = WikipediaScraper(base_url=wiki_server.base_url, rate_limiter=RateLimiter(rate=0),
+                               resilience=resilience())
+
+    response = scraper._request(scraper.api_url, params={'action': 'query', 'titles': 'Nice'})
+
+    assert response.status_code == 503
+    assert len(wiki_server.requests) == 3
+
+
+def test_retry_stops_at_deadline(wiki_server):
+    wiki_server.statuses = [503] * 10
+    scraper = WikipediaScraper(base_url=wiki_server.base_url, rate_limiter=RateLimiter(rate=0),
+                               resilience=resilience(max_attempts=10, base_delay=0.2, deadline=0.3))
+
+    scraper._request(scraper.api_url, params={'action': 'query', 'titles': 'Nice'})
+
+    assert len(wiki_server.requests) < 10
+
+
+def test_unexpected_error_in_probe_reopens_circuit(wiki_server):
+    policy = resilience(failure_threshold=1, reset_timeout=0.05)
+    scraper = WikipediaScraper(base_url=wiki_server.base_url, rate_limiter=RateLimiter(rate=0),
+                               resilience=policy)
+    host = wiki_server.base_url.split('//', 1)[1]
+    policy.record_failure(host)
+    time.sleep(0.06)
+
+    def broken_get(*args, **kwargs):
+        raise ValueError('not an HTTP failure')
+
+    scraper.session.get = broken_get
+    with pytest.raises(ValueError):
+        scraper._request(scraper.api_url)
+
+    assert policy.breaker(host).state == 'open'
+    with pytest.raises(CircuitOpenError):
+        scraper._request(scraper.api_url)
+
+
+def test_cancelled_async_probe_reopens_circuit(wiki_server):
+    policy = resilience(failure_threshold=1, reset_timeout=0.05)
+    host = wiki_server.base_url.split('//', 1)[1]
+
+    async def run():
+        scraper = AsyncWikipediaScraper(base_url=wiki_server.base_url, rate_limiter=RateLimiter(rate=0),
+                                        resilience=policy)
+
+        async def slow_get(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        scraper.client.get = slow_get
+        try:
+            policy.record_failure(host)
+            await asyncio.sleep(0.06)
+            task = asyncio.ensure_future(scraper._request(scraper.api_url))
+            await asyncio.sleep(0.01)
+            assert policy.breaker(host).state == 'half_open'
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        finally:
+            await scraper.close()
+
+    asyncio.run(run())
+    assert policy.breaker(host).state == 'open'
+
+
+def test_async_timeout_defaults_to_client_timeout(wiki_server):
+    seen = []
+
+    async def run():
+        client = httpx.AsyncClient(timeout=httpx.Timeout(4.0))
+        scraper = AsyncWikipediaScraper(client=client, base_url=wiki_server.base_url,
+                                        rate_limiter=RateLimiter(rate=0), resilience=resilience())
+        original = client.get
+
+        async def recording_get(*args, **kwargs):
+            seen.append(kwargs['timeout'])
+            return await original(*args, **kwargs)
+
+        client.get = recording_get
+        try:
+            await scraper.get_page(f"{wiki_server.base_url}/wiki/Nice")
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
+    assert seen[0].read == 4.0
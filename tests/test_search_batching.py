@@ -0,0 +1,91 @@
+"""Batching search_articles terhadap stand-in API server (user-009)"""
+
+import asyncio
+
+from app import WikipediaScraper, TITLES_PER_REQUEST
+from async_scraper import AsyncWikipediaScraper
+from rate_limiter import RateLimiter
+from search_cache import SearchCache
+
+
+def title_requests(wiki):
+    return [r for r in wiki.requests if r.get('action') == 'query']
+
+
+def test_titles_are_batched_per_request_limit(wiki_server):
+    scraper = WikipediaScraper(base_url=wiki_server.base_url, rate_limiter=RateLimiter(rate=0))
+    queries = [f"Missing {i}" for i in range(TITLES_PER_REQUEST * 2 + 5)] + ['python_language']
+
+    results = scraper.search_articles(queries)
+
+    assert len(title_requests(wiki_server)) == 3
+    assert results['python_language'] == wiki_server.article_url('Python (programming language)')
+    # Query yang tidak cocok sebagai judul jatuh ke opensearch
+    assert results['Missing 0'] is None
+    assert sum(r.get('action') == 'opensearch' for r in wiki_server.requests) == len(queries) - 1
+
+
+def test_duplicates_and_pipe_queries(wiki_server):
+    scraper = WikipediaScraper(base_url=wiki_server.base_url, rate_limiter=RateLimiter(rate=0))
+
+    results = scraper.search_articles(['Nice', 'Nice', 'a|b', ''])
+
+    assert len(title_requests(wiki_server)) == 1
+    assert title_requests(wiki_server)[0]['titles'] == 'Nice'
+    assert results == {'Nice': wiki_server.article_url('Nice'), 'a|b': None, '': None}
+
+
+def test_async_scraper_uses_same_batching(wiki_server):
+    async def run():
+        scraper = AsyncWikipediaScraper(base_url=wiki_server.base_url, rate_limiter=RateLimiter(rate=0))
+        try:
+            return await scraper.search_articles(['Python language', 'Rust (programming language)'])
+        finally:
+            await scraper.close()
+
+    results = asyncio.run(run())
+
+    assert len(title_requests(wiki_server)) == 1
+    assert results == {
+        'Python language': wiki_server.article_url('Python (programming language)'),
+        'Rust (programming language)': wiki_server.article_url('Rust (programming language)'),
+    }
+
+
+def test_article_url_encodes_apostrophe():
+    scraper = WikipediaScraper(rate_limiter=RateLimiter(rate=0))
+    assert scraper.article_url("Ender's Game") == "https://en.wikipedia.org/wiki/Ender%27s_Game"
+
+
+def test_exact_titles_are_cached_case_sensitively(wiki_server, tmp_path):
+    cache = SearchCache(cache_dir=str(tmp_path))
+    scraper = WikipediaScraper(base_url=wiki_server.base_url, rate_limiter=RateLimiter(rate=0),
+                               search_cache=cache)
+
+    first = scraper.search_articles(['NICE'])
+    second = scraper.search_articles(['Nice'])
+    again = scraper.search_articles(['NICE', 'Nice'])
+
+    assert first == {'NICE': wiki_server.article_url('NICE')}
+    assert second == {'Nice': wiki_server.article_url('Nice')}
+    assert again == {'NICE': wiki_server.article_url('NICE'), 'Nice': wiki_server.article_url('Nice')}
+    # Permintaan ketiga dilayani seluruhnya dari cache
+    assert len(title_requests(wiki_server)) == 2
+
+
+def test_async_scraper_reads_search_cache(wiki_server, tmp_path):
+    cache = SearchCache(cache_dir=str(tmp_path))
+
+    async def run():
+        scraper = AsyncWikipediaScraper(base_url=wiki_server.base_url, rate_limiter=RateLimiter(rate=0),
+                                        search_cache=cache)
+        try:
+            await scraper.search_articles(['NICE'])
+            return await scraper.search_articles(['NICE', 'Nice'])
+        finally:
+            await scraper.close()
+
+    results = asyncio.run(run())
+
+    assert results == {'NICE': wiki_server.article_url('NICE'), 'Nice': wiki_server.article_url('Nice')}
+    assert [r['titles'] for r in title_requests(wiki_server)] == ['NICE', 'Nice']
@@ -0,0 +1,60 @@
+"""Single-flight lookup per kunci, termasuk batch do_many (user-021)"""
+
+import asyncio
+
+from single_flight import SingleFlight
+
+
+class Resolver:
+    """Search pengganti yang mencatat setiap batch"""
+
+    def __init__(self):
+        self.batches = []
+
+    async def resolve(self, queries):
+        self.batches.append(list(queries))
+        await asyncio.sleep(0.05)
+        return {query: f"url:{query}" for query in queries}
+
+    async def resolve_one(self, query):
+        return (await self.resolve([query]))[query]
+
+
+def test_concurrent_batches_share_in_flight_queries():
+    resolver = Resolver()
+    lookups = SingleFlight()
+
+    async def run():
+        return await asyncio.gather(
+            lookups.do('python', lambda: resolver.resolve_one('Python')),
+            lookups.do_many({'python': 'Python', 'java': 'Java'}, resolver.resolve),
+            lookups.do_many({'java': 'Java', 'rust': 'Rust'}, resolver.resolve),
+        )
+
+    single, compare, bundle = asyncio.run(run())
+
+    assert single == 'url:Python'
+    assert compare == {'python': 'url:Python', 'java': 'url:Java'}
+    assert bundle == {'java': 'url:Java', 'rust': 'url:Rust'}
+    # Setiap query dicari tepat sekali
+    assert resolver.batches == [['Python'], ['Java'], ['Rust']]
+    assert lookups.stats() == {'calls': 3, 'shared': 2, 'in_flight': 0}
+
+
+def test_batch_error_reaches_every_caller():
+    lookups = SingleFlight()
+
+    async def failing(queries):
+        raise RuntimeError('search down')
+
+    async def run():
+        return await asyncio.gather(
+            lookups.do_many({'a': 'A'}, failing),
+            lookups.do_many({'a': 'A'}, failing),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert lookups.in_flight() == 0
@@ -0,0 +1,85 @@
+"""Update berurutan per user dan chat (user-025)"""
+
+import asyncio
+
+from telegram import Update
+
+from update_processor import UserUpdateProcessor
+
+
+def message_update(update_id, user_id):
+    return Update.de_json({
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id, 'date': 0,
+            'chat': {'id': user_id, 'type': 'private'},
+            'from': {'id': user_id, 'is_bot': False, 'first_name': 'Test'},
+            'text': 'hi',
+        },
+    }, None)
+
+
+def test_same_user_is_sequential_other_users_concurrent():
+    processor = UserUpdateProcessor(max_concurrent_updates=16)
+    events = []
+
+    async def handle(name, delay):
+        events.append(f"start {name}")
+        await asyncio.sleep(delay)
+        events.append(f"end {name}")
+
+    async def run():
+        await asyncio.gather(
+            processor.process_update(message_update(1, 1), handle('a1', 0.05)),
+            processor.process_update(message_update(2, 1), handle('a2', 0)),
+            processor.process_update(message_update(3, 2), handle('b1', 0)),
+        )
+
+    asyncio.run(run())
+
+    # a2 menunggu a1 selesai, b1 (user lain) tidak menunggu
+    assert events.index('end a1') < events.index('start a2')
+    assert events.index('end b1') < events.index('end a1')
+    assert processor.stats() == {'keys': 0, 'dropped': 0}
+
+
+def test_updates_beyond_pending_limit_are_dropped():
+    processor = UserUpdateProcessor(max_concurrent_updates=16, max_pending=2)
+    handled = []
+
+    async def handle(n):
+        await asyncio.sleep(0.01)
+        handled.append(n)
+
+    async def run():
+        await asyncio.gather(*(
+            processor.process_update(message_update(n, 1), handle(n)) for n in range(4)
+        ))
+
+    asyncio.run(run())
+
+    assert handled == [0, 1]
+    assert processor.stats()['dropped'] == 2
+
+
+def test_queued_update_does_not_hold_global_slot():
+    processor = UserUpdateProcessor(max_concurrent_updates=2)
+    events = []
+
+    async def handle(name, delay):
+        events.append(f"start {name}")
+        await asyncio.sleep(delay)
+        events.append(f"end {name}")
+
+    async def run():
+        await asyncio.gather(
+            processor.process_update(message_update(1, 1), handle('a1', 0.1)),
+            processor.process_update(message_update(2, 1), handle('a2', 0)),
+            processor.process_update(message_update(3, 2), handle('b1', 0)),
+        )
+
+    asyncio.run(run())
+
+    # a2 menunggu giliran user 1 tanpa memegang slot, b1 memakai slot kedua
+    assert events.index('end b1') < events.index('end a1')
+    assert events.index('end a1') < events.index('start a2')
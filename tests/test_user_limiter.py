@@ -0,0 +1,49 @@
+"""Token user dikembalikan saat antrian handler penuh (user-024)"""
+
+import asyncio
+
+import pytest
+
+from user_limiter import LimiterBusy, UserLimiter
+
+
+def test_refund_restores_tokens_up_to_burst():
+    limiter = UserLimiter(rate=0.001, burst=6, weights={'pdf': 3})
+    assert limiter.consume(1, 'pdf') == 0
+    assert limiter.consume(1, 'pdf') == 0
+    assert limiter.consume(1, 'pdf') > 0
+
+    limiter.refund(1, 'pdf')
+    assert limiter.consume(1, 'pdf') == 0
+
+    limiter.refund(1, 'pdf')
+    limiter.refund(1, 'pdf')
+    limiter.refund(1, 'pdf')
+    assert limiter._users[1].tokens == 6
+
+
+def test_busy_handler_refunds_tokens():
+    limiter = UserLimiter(rate=0.001, burst=3, weights={'pdf': 3}, max_concurrent=1, max_waiting=0)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.slot(1):
+                await release.wait()
+
+        holder = asyncio.ensure_future(hold())
+        await asyncio.sleep(0)
+
+        assert limiter.consume(2, 'pdf') == 0
+        with pytest.raises(LimiterBusy):
+            async with limiter.slot(2):
+                pass
+        limiter.refund(2, 'pdf')
+
+        release.set()
+        await holder
+
+    asyncio.run(run())
+    # Token user 2 utuh, command berikutnya langsung boleh
+    assert limiter.consume(2, 'pdf') == 0
@@ -0,0 +1,76 @@
+"""Load record user di luar lock UserStore (user-023)"""
+
+import asyncio
+import threading
+
+import pytest
+
+from user_store import DEFAULT_USER, SQLiteUserBackend, UserBackend, UserStore
+
+
+class SlowBackend(UserBackend):
+    """Backend yang menahan load() sampai dilepas test"""
+
+    def __init__(self):
+        self.records = {1: {'language': 'id', 'bookmarks': ['Python'], 'searches': 3}}
+        self.loading = threading.Event()
+        self.release = threading.Event()
+        self.loads = []
+
+    def load(self, user_id):
+        self.loads.append(user_id)
+        if user_id == 1:
+            self.loading.set()
+            self.release.wait(5)
+        return self.records.get(user_id)
+
+    def save_many(self, records):
+        self.records.update(records)
+
+    def count(self):
+        return len(self.records)
+
+
+def test_backend_must_implement_abstract_methods():
+    class Incomplete(UserBackend):
+        def load(self, user_id):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_slow_load_does_not_block_other_users():
+    backend = SlowBackend()
+    store = UserStore(backend)
+    store.set_language(2, 'id')
+
+    slow = threading.Thread(target=store.get_language, args=(1,))
+    slow.start()
+    assert backend.loading.wait(5)
+
+    # User 2 ada di memory, tidak menunggu load user 1 yang masih berjalan
+    other = threading.Thread(target=store.get_language, args=(2,))
+    other.start()
+    other.join(1)
+    assert not other.is_alive()
+
+    backend.release.set()
+    slow.join(5)
+    assert store.get(1)['bookmarks'] == ['Python']
+    assert store.get(3) == DEFAULT_USER
+    assert backend.loads == [2, 1, 3]
+
+
+def test_preload_fills_hot_cache_from_sqlite(tmp_path):
+    store = UserStore(SQLiteUserBackend(str(tmp_path)))
+    store.add_bookmark(1, 'Python')
+    store.close()
+
+    reopened = UserStore(SQLiteUserBackend(str(tmp_path)))
+    asyncio.run(reopened.preload(1))
+    assert reopened.stats()['loads'] == 1
+
+    assert reopened.bookmarks(1) == ['Python']
+    assert reopened.stats()['hits'] == 1
+    reopened.close()
@@ -0,0 +1,78 @@
+"""Server webhook: validasi secret token dan antrian update (user-025)"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+import tornado.httpserver
+import tornado.testing
+from telegram import Update
+from telegram.ext import Application
+
+from webhook import SECRET_HEADER, _make_app, serve_webhook
+
+UPDATE = {
+    'update_id': 1,
+    'message': {
+        'message_id': 1, 'date': 0,
+        'chat': {'id': 42, 'type': 'private'},
+        'from': {'id': 42, 'is_bot': False, 'first_name': 'Test'},
+        'text': '/search Python',
+        'entities': [{'type': 'bot_command', 'offset': 0, 'length': 7}],
+    },
+}
+
+
+def post_updates(requests):
+    """Jalankan server webhook lokal, kirim request dan kembalikan status serta isi antrian"""
+    application = Application.builder().token('123:TEST').updater(None).build()
+
+    async def run():
+        sock, port = tornado.testing.bind_unused_port()
+        server = tornado.httpserver.HTTPServer(_make_app(application, '/telegram', 'secret'))
+        server.add_sockets([sock])
+        try:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+                statuses = []
+                for headers, body in requests:
+                    response = await client.post('/telegram', headers=headers, content=body)
+                    statuses.append(response.status_code)
+                health = (await client.get('/healthz')).json()
+        finally:
+            server.stop()
+        queued = []
+        while not application.update_queue.empty():
+            queued.append(application.update_queue.get_nowait())
+        return statuses, health, queued
+
+    return asyncio.run(run())
+
+
+def test_post_with_secret_queues_update():
+    statuses, health, queued = post_updates([({SECRET_HEADER: 'secret'}, json.dumps(UPDATE))])
+
+    assert statuses == [200]
+    assert health == {'status': 'ok', 'pending_updates': 1}
+    assert len(queued) == 1
+    assert isinstance(queued[0], Update)
+    assert queued[0].effective_message.text == '/search Python'
+
+
+def test_post_with_wrong_secret_or_bad_json_is_rejected():
+    statuses, _, queued = post_updates([
+        ({}, json.dumps(UPDATE)),
+        ({SECRET_HEADER: 'wrong'}, json.dumps(UPDATE)),
+        ({SECRET_HEADER: 'secret'}, 'not json'),
+    ])
+
+    assert statuses == [403, 403, 400]
+    assert queued == []
+
+
+def test_public_webhook_without_secret_refuses_to_start():
+    application = Application.builder().token('123:TEST').updater(None).build()
+
+    with pytest.raises(ValueError, match='secret token'):
+        asyncio.run(serve_webhook(application, webhook_url='https://bot.example.com/telegram',
+                                  stop_event=asyncio.Event()))
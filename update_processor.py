@@ -0,0 +1,107 @@
+"""
+Update processor bot Telegram yang berurutan per user dan chat
+Update dari user atau chat berbeda diproses bersamaan, tetapi update dari
+user yang sama di chat yang sama diproses satu per satu sesuai urutan
+datangnya. Dengan begitu dua pesan beruntun dari satu user (misalnya
+/language lalu /search) tidak saling mendahului, dan satu user tidak bisa
+menjalankan banyak handler sekaligus hanya dengan mengirim banyak pesan.
+
+Batas update global diambil setelah lock per kunci: update yang masih
+menunggu giliran user-nya tidak memegang slot global, jadi user yang spam
+tidak menahan update user lain. Semaphore BaseUpdateProcessor (diambil
+sebelum do_process_update) dibuat praktis tanpa batas.
+"""
+
+import sys
+import asyncio
+import logging
+from typing import Any, Awaitable, Dict, Hashable, List, Optional
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+logger = logging.getLogger(__name__)
+
+# Ukuran semaphore BaseUpdateProcessor; batas sebenarnya diterapkan UserUpdateProcessor
+UNBOUNDED_UPDATES = sys.maxsize
+
+
+def update_key(update: object) -> Optional[Hashable]:
+    """
+    Kunci urutan update
+
+    Args:
+        update: Update dari Application
+
+    Returns:
+        (chat_id, user_id), atau None untuk update tanpa chat dan user
+        (diproses tanpa menunggu update lain)
+    """
+    if not isinstance(update, Update):
+        return None
+    chat, user = update.effective_chat, update.effective_user
+    if chat is None and user is None:
+        return None
+    return (chat.id if chat else None, user.id if user else None)
+
+
+class UserUpdateProcessor(BaseUpdateProcessor):
+    """Proses update bersamaan, tetapi berurutan untuk kunci (chat, user) yang sama"""
+
+    def __init__(self, max_concurrent_updates: int, max_pending: int = 8):
+        """
+        Args:
+            max_concurrent_updates: Jumlah update yang diproses bersamaan (semua user)
+            max_pending: Jumlah update maksimum per kunci yang berjalan atau
+                         menunggu; update berikutnya dari kunci tersebut dibuang
+                         supaya antrian satu user tidak tumbuh tanpa batas
+        """
+        if max_concurrent_updates < 1:
+            raise ValueError("`max_concurrent_updates` must be a positive integer!")
+        super().__init__(UNBOUNDED_UPDATES)
+        self.limit = max_concurrent_updates
+        self.max_pending = max_pending
+        self.dropped = 0
+        # Kunci -> [lock, jumlah update yang berjalan atau menunggu]
+        self._keys: Dict[Hashable, List[Any]] = {}
+        # Slot global, dibuat di event loop yang memproses update
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.limit)
+        key = update_key(update)
+        if key is None:
+            async with self._slots:
+                await coroutine
+            return
+
+        entry = self._keys.get(key)
+        if entry is None:
+            entry = self._keys[key] = [asyncio.Lock(), 0]
+        if entry[1] >= self.max_pending:
+            self.dropped += 1
+            logger.warning(f"Dropping update for {key}: {entry[1]} updates already pending")
+            if asyncio.iscoroutine(coroutine):
+                coroutine.close()
+            return
+
+        entry[1] += 1
+        try:
+            # Slot global diambil setelah giliran kunci ini tiba
+            async with entry[0], self._slots:
+                await coroutine
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._keys[key]
+
+    async def initialize(self) -> None:
+        self._slots = asyncio.Semaphore(self.limit)
+
+    async def shutdown(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, int]:
+        """Statistik: keys (user/chat dengan update berjalan), dropped"""
+        return {'keys': len(self._keys), 'dropped': self.dropped}
@@ -0,0 +1,274 @@
+"""
+Rate limiter per user untuk command bot Telegram
+Setiap user punya satu token bucket yang dipakai bersama oleh semua command;
+command berat (misalnya /pdf) memakai lebih banyak token daripada /search.
+State user yang sudah lama tidak aktif dihapus (TTL), sehingga memory
+sebanding dengan jumlah user aktif, bukan jumlah user sepanjang waktu.
+
+Selain budget per user, jumlah handler berat yang berjalan bersamaan dibatasi
+secara global. Handler yang harus menunggu diantrikan per user dan dilayani
+bergiliran (round-robin), sehingga satu user dengan banyak request tidak
+bisa menghabiskan slot milik user lain.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Biaya token per command, command yang tidak terdaftar memakai 1 token
+DEFAULT_WEIGHTS = {
+    'search': 1.0,
+    'random': 1.0,
+    'compare': 2.0,
+    'pdf': 3.0,
+    'pdfbundle': 5.0,
+}
+
+
+def parse_weights(value: Optional[str]) -> Dict[str, float]:
+    """
+    Parse bobot command dari string "pdf=3,pdfbundle=5"
+
+    Args:
+        value: String bobot (boleh kosong)
+
+    Returns:
+        Dictionary command -> bobot; entry yang tidak valid dilewati
+    """
+    weights = {}
+    for item in (value or '').split(','):
+        name, _, weight = item.partition('=')
+        try:
+            weights[name.strip()] = float(weight)
+        except ValueError:
+            if item.strip():
+                logger.warning(f"Ignoring invalid command weight: {item}")
+    return weights
+
+
+class LimiterBusy(Exception):
+    """Antrian handler global penuh"""
+
+    def __init__(self, waiting: int):
+        super().__init__(f"Handler queue full ({waiting} waiting)")
+        self.waiting = waiting
+
+
+class _UserState:
+    """Token bucket satu user"""
+
+    __slots__ = ('tokens', 'updated', 'notified_until')
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated = now
+        # Selama throttle belum habis, penolakan berikutnya tidak dibalas lagi
+        self.notified_until = 0.0
+
+
+class UserLimiter:
+    """Token bucket per user dengan bobot command, TTL dan antrian handler global yang adil"""
+
+    def __init__(self, rate: float = 0.5, burst: float = 6.0, idle_ttl: float = 600.0,
+                 weights: Optional[Dict[str, float]] = None, max_concurrent: int = 8,
+                 max_waiting: int = 100):
+        """
+        Args:
+            rate: Token yang diisi ulang per detik per user, 0 untuk tanpa batas
+            burst: Kapasitas bucket (token maksimum yang bisa dipakai sekaligus)
+            idle_ttl: State user yang tidak aktif selama ini (detik) dihapus;
+                      minimal selama waktu isi ulang bucket penuh
+            weights: Bobot command tambahan / pengganti DEFAULT_WEIGHTS
+            max_concurrent: Jumlah handler yang boleh berjalan bersamaan
+                            (semua user), 0 untuk tanpa batas
+            max_waiting: Jumlah handler maksimum yang menunggu slot
+        """
+        self.rate = rate
+        self.burst = burst
+        # Menghapus state sebelum bucket penuh kembali sama dengan memberi token gratis
+        self.idle_ttl = max(idle_ttl, burst / rate) if rate > 0 else idle_ttl
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.allowed = 0
+        self.throttled = 0
+        self.busy = 0
+        self._users: 'OrderedDict[int, _UserState]' = OrderedDict()
+        self._running = 0
+        # user_id -> antrian Future handler yang menunggu slot (urutan giliran)
+        self._waiting: 'OrderedDict[int, deque]' = OrderedDict()
+
+    @classmethod
+    def from_env(cls) -> 'UserLimiter':
+        """
+        Buat limiter dari environment variable USER_RATE_LIMIT, USER_RATE_BURST,
+        USER_RATE_IDLE_TTL, USER_RATE_WEIGHTS, HANDLER_CONCURRENCY dan HANDLER_QUEUE_MAX
+        """
+        return cls(
+            rate=float(os.getenv('USER_RATE_LIMIT', '0.5')),
+            burst=float(os.getenv('USER_RATE_BURST', '6')),
+            idle_ttl=float(os.getenv('USER_RATE_IDLE_TTL', '600')),
+            weights=parse_weights(os.getenv('USER_RATE_WEIGHTS')),
+            max_concurrent=int(os.getenv('HANDLER_CONCURRENCY', '8')),
+            max_waiting=int(os.getenv('HANDLER_QUEUE_MAX', '100')),
+        )
+
+    def weight(self, command: str) -> float:
+        """Biaya token command"""
+        return self.weights.get(command, 1.0)
+
+    def _evict(self, now: float):
+        """Hapus state user yang sudah tidak aktif lebih lama dari idle_ttl"""
+        while self._users:
+            user_id, state = next(iter(self._users.items()))
+            if state.updated > now - self.idle_ttl:
+                break
+            del self._users[user_id]
+
+    def consume(self, user_id: int, command: str) -> float:
+        """
+        Ambil token untuk command
+
+        Args:
+            user_id: ID user Telegram
+            command: Nama command (menentukan bobot)
+
+        Returns:
+            0 jika command boleh dijalankan (token sudah diambil), atau jumlah
+            detik sampai token user cukup
+        """
+        if self.rate <= 0:
+            self.allowed += 1
+            return 0.0
+
+        now = time.monotonic()
+        self._evict(now)
+        cost = min(self.weight(command), self.burst)
+
+        state = self._users.pop(user_id, None)
+        if state is None:
+            state = _UserState(self.burst, now)
+        else:
+            state.tokens = min(self.burst, state.tokens + (now - state.updated) * self.rate)
+            state.updated = now
+        # Dimasukkan ulang di akhir: urutan OrderedDict = urutan aktivitas terakhir
+        self._users[user_id] = state
+
+        if state.tokens >= cost:
+            state.tokens -= cost
+            self.allowed += 1
+            return 0.0
+
+        self.throttled += 1
+        return (cost - state.tokens) / self.rate
+
+    def refund(self, user_id: int, command: str):
+        """
+        Kembalikan token command yang tidak jadi dijalankan (misalnya LimiterBusy)
+
+        Args:
+            user_id: ID user Telegram
+            command: Nama command yang token-nya diambil consume()
+        """
+        state = self._users.get(user_id)
+        if self.rate <= 0 or state is None:
+            return
+        state.tokens = min(self.burst, state.tokens + min(self.weight(command), self.burst))
+        self.allowed -= 1
+
+    def should_notify(self, user_id: int, retry_after: float) -> bool:
+        """
+        Apakah penolakan perlu dibalas (sekali per periode throttle, supaya
+        user yang spam tidak membuat bot mengirim balasan untuk setiap pesan)
+
+        Args:
+            user_id: ID user Telegram
+            retry_after: Hasil consume()
+
+        Returns:
+            True untuk penolakan pertama dalam periode throttle
+        """
+        state = self._users.get(user_id)
+        if state is None:
+            return True
+        now = time.monotonic()
+        if now < state.notified_until:
+            return False
+        state.notified_until = now + retry_after
+        return True
+
+    @asynccontextmanager
+    async def slot(self, user_id: int):
+        """
+        Jalankan handler di dalam slot global; jika semua slot terpakai,
+        tunggu giliran (round-robin antar user)
+
+        Raises:
+            LimiterBusy: Jika antrian tunggu sudah penuh
+        """
+        if self.max_concurrent <= 0:
+            yield
+            return
+
+        if self._running >= self.max_concurrent or self._waiting:
+            waiting = sum(len(queue) for queue in self._waiting.values())
+            if waiting >= self.max_waiting:
+                self.busy += 1
+                raise LimiterBusy(waiting)
+
+            future = asyncio.get_running_loop().create_future()
+            self._waiting.setdefault(user_id, deque()).append(future)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # Slot sudah diberikan tapi tidak jadi dipakai
+                    self._release()
+                else:
+                    self._discard(user_id, future)
+                raise
+        else:
+            self._running += 1
+
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _discard(self, user_id: int, future: asyncio.Future):
+        """Hapus waiter yang dibatalkan dari antrian"""
+        queue = self._waiting.get(user_id)
+        if queue and future in queue:
+            queue.remove(future)
+            if not queue:
+                del self._waiting[user_id]
+
+    def _release(self):
+        """Lepas slot dan berikan ke user berikutnya sesuai giliran"""
+        self._running -= 1
+        while self._waiting and self._running < self.max_concurrent:
+            user_id, queue = self._waiting.popitem(last=False)
+            future = queue.popleft()
+            if queue:
+                # User yang masih punya antrian pindah ke giliran paling akhir
+                self._waiting[user_id] = queue
+            if not future.done():
+                self._running += 1
+                future.set_result(None)
+
+    def stats(self) -> Dict:
+        """Statistik limiter: users, running, waiting, allowed, throttled, busy"""
+        return {
+            'users': len(self._users),
+            'running': self._running,
+            'waiting': sum(len(queue) for queue in self._waiting.values()),
+            'allowed': self.allowed,
+            'throttled': self.throttled,
+            'busy': self.busy,
+        }
@@ -0,0 +1,342 @@
+"""
+Penyimpanan data user untuk bot Telegram
+Data user (bahasa, bookmark, jumlah pencarian) disimpan di backend persisten
+(SQLite secara default) dan dimuat secara lazy per user ke hot cache LRU
+di memory, sehingga memory tetap terbatas berapa pun jumlah user dan
+restart tidak perlu memuat semua user. Perubahan ditulis ke backend secara
+write-behind: record yang berubah dikumpulkan lalu di-flush dalam satu
+transaksi oleh thread latar belakang setiap beberapa detik.
+
+Record dimuat dari backend di luar lock store, sehingga user lain tidak
+ikut menunggu I/O disk; preload() memuat record di thread pool sebelum
+handler async memakainya.
+"""
+
+import os
+import abc
+import copy
+import json
+import time
+import sqlite3
+import logging
+import asyncio
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Record default untuk user yang belum pernah tersimpan
+DEFAULT_USER = {'language': 'en', 'bookmarks': [], 'searches': 0}
+
+
+class UserBackend(abc.ABC):
+    """
+    Base class backend penyimpanan user
+
+    Subclass mengimplementasikan load() untuk satu user dan save_many()
+    untuk menulis banyak record sekaligus (satu batch write-behind).
+    """
+
+    @abc.abstractmethod
+    def load(self, user_id: int) -> Optional[Dict]:
+        """Record user, atau None jika user belum pernah disimpan"""
+
+    @abc.abstractmethod
+    def save_many(self, records: Dict[int, Dict]):
+        """Simpan banyak record user sekaligus"""
+
+    @abc.abstractmethod
+    def count(self) -> int:
+        """Jumlah user yang tersimpan"""
+
+    def close(self):
+        """Tutup koneksi backend"""
+
+
+class SQLiteUserBackend(UserBackend):
+    """
+    Backend user di SQLite, satu baris per user
+
+    Pembacaan memakai koneksi terpisah dari penulisan: dengan WAL, load()
+    tidak menunggu transaksi flush yang sedang berjalan.
+    """
+
+    def __init__(self, cache_dir: str = '.data'):
+        """
+        Args:
+            cache_dir: Direktori file database
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, 'users.sqlite')
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                user_id INTEGER PRIMARY KEY,
+                language TEXT NOT NULL,
+                searches INTEGER NOT NULL,
+                bookmarks TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+        self._read_lock = threading.Lock()
+        self._read_conn = sqlite3.connect(self.path, check_same_thread=False)
+
+    def load(self, user_id: int) -> Optional[Dict]:
+        with self._read_lock:
+            row = self._read_conn.execute(
+                'SELECT language, searches, bookmarks FROM users WHERE user_id = ?',
+                (user_id,)
+            ).fetchone()
+        if not row:
+            return None
+        return {'language': row[0], 'searches': row[1], 'bookmarks': json.loads(row[2])}
+
+    def save_many(self, records: Dict[int, Dict]):
+        now = time.time()
+        rows = [
+            (user_id, data['language'], data['searches'],
+             json.dumps(data['bookmarks'], ensure_ascii=False), now)
+            for user_id, data in records.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO users (user_id, language, searches, bookmarks, updated_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                rows
+            )
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._read_lock:
+            return self._read_conn.execute('SELECT COUNT(*) FROM users').fetchone()[0]
+
+    def close(self):
+        with self._read_lock:
+            self._read_conn.close()
+        with self._lock:
+            self._conn.close()
+
+
+class UserStore:
+    """Data user dengan hot cache LRU di memory dan flush write-behind ke backend"""
+
+    def __init__(self, backend: Optional[UserBackend] = None, hot_size: int = 10000,
+                 flush_interval: float = 5.0):
+        """
+        Args:
+            backend: Backend penyimpanan (default: SQLiteUserBackend)
+            hot_size: Jumlah maksimum user di hot cache memory
+            flush_interval: Jeda flush perubahan ke backend (detik)
+        """
+        self.backend = backend or SQLiteUserBackend()
+        self.hot_size = hot_size
+        self.flush_interval = flush_interval
+        self.hits = 0
+        self.loads = 0
+        self.flushes = 0
+        self.written = 0
+        self._lock = threading.RLock()
+        self._hot: 'OrderedDict[int, Dict]' = OrderedDict()
+        # Record yang berubah tapi belum di-flush; tetap dipegang di sini
+        # walaupun sudah keluar dari hot cache, supaya perubahan tidak hilang
+        self._dirty: Dict[int, Dict] = {}
+        # Batch yang sedang ditulis ke backend (belum tentu sudah commit)
+        self._flushing: Dict[int, Dict] = {}
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def start(self):
+        """Jalankan thread flush periodik"""
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, name='user-store-flush', daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing user data: {e}")
+
+    def _cached(self, user_id: int) -> Optional[Dict]:
+        """Record user yang sudah ada di memory (dipanggil di bawah lock)"""
+        data = self._hot.get(user_id)
+        if data is not None:
+            self.hits += 1
+            self._hot.move_to_end(user_id)
+            return data
+
+        data = self._dirty.get(user_id)
+        if data is None and user_id in self._flushing:
+            data = copy.deepcopy(self._flushing[user_id])
+        if data is not None:
+            self._hot[user_id] = data
+            self._trim()
+        return data
+
+    def _trim(self):
+        while len(self._hot) > self.hot_size:
+            self._hot.popitem(last=False)
+
+    @contextmanager
+    def _record(self, user_id: int) -> Iterator[Dict]:
+        """
+        Record user di bawah lock store
+
+        Jika belum ada di memory, record dimuat dari backend di luar lock
+        lalu dimasukkan ke hot cache (kecuali sudah dimuat pemanggil lain).
+        """
+        loaded = None
+        while True:
+            with self._lock:
+                data = self._cached(user_id)
+                if data is None and loaded is not None:
+                    data = self._hot[user_id] = loaded
+                    self._trim()
+                if data is not None:
+                    yield data
+                    return
+                self.loads += 1
+            loaded = self.backend.load(user_id) or copy.deepcopy(DEFAULT_USER)
+
+    async def preload(self, user_id: int):
+        """
+        Muat record user ke hot cache di thread pool, di luar event loop
+
+        Args:
+            user_id: ID user Telegram
+        """
+        with self._lock:
+            if user_id in self._hot:
+                return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._preload, user_id)
+
+    def _preload(self, user_id: int):
+        with self._record(user_id):
+            pass
+
+    def _changed(self, user_id: int, data: Dict):
+        self._dirty[user_id] = data
+
+    def get(self, user_id: int) -> Dict:
+        """
+        Data user (salinan, perubahan harus lewat method store)
+
+        Args:
+            user_id: ID user Telegram
+
+        Returns:
+            Dictionary berisi language, bookmarks dan searches
+        """
+        with self._record(user_id) as data:
+            return copy.deepcopy(data)
+
+    def get_language(self, user_id: int) -> str:
+        """Bahasa pilihan user"""
+        with self._record(user_id) as data:
+            return data['language']
+
+    def set_language(self, user_id: int, language: str):
+        """Simpan bahasa pilihan user"""
+        with self._record(user_id) as data:
+            if data['language'] != language:
+                data['language'] = language
+                self._changed(user_id, data)
+
+    def increment_searches(self, user_id: int):
+        """Tambah jumlah pencarian user"""
+        with self._record(user_id) as data:
+            data['searches'] += 1
+            self._changed(user_id, data)
+
+    def bookmarks(self, user_id: int) -> List[str]:
+        """Salinan daftar bookmark user"""
+        with self._record(user_id) as data:
+            return list(data['bookmarks'])
+
+    def add_bookmark(self, user_id: int, query: str) -> bool:
+        """
+        Tambah bookmark
+
+        Args:
+            user_id: ID user Telegram
+            query: Nama artikel
+
+        Returns:
+            False jika artikel sudah ada di bookmark
+        """
+        with self._record(user_id) as data:
+            if query in data['bookmarks']:
+                return False
+            data['bookmarks'].append(query)
+            self._changed(user_id, data)
+            return True
+
+    def clear_bookmarks(self, user_id: int):
+        """Hapus semua bookmark user"""
+        with self._record(user_id) as data:
+            if data['bookmarks']:
+                data['bookmarks'] = []
+                self._changed(user_id, data)
+
+    def flush(self) -> int:
+        """
+        Tulis semua perubahan yang belum tersimpan ke backend dalam satu batch
+
+        Returns:
+            Jumlah record yang ditulis
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return 0
+                # Salinan dibuat di bawah lock; penulisan ke backend di luar lock
+                # supaya handler tidak menunggu I/O disk
+                batch = copy.deepcopy(self._dirty)
+                self._dirty.clear()
+                self._flushing = batch
+
+            try:
+                self.backend.save_many(batch)
+            except Exception:
+                with self._lock:
+                    # Kembalikan ke antrian, kecuali sudah ada perubahan yang lebih baru
+                    for user_id, data in batch.items():
+                        self._dirty.setdefault(user_id, data)
+                raise
+            finally:
+                with self._lock:
+                    self._flushing = {}
+
+        self.flushes += 1
+        self.written += len(batch)
+        logger.debug(f"Flushed {len(batch)} user records")
+        return len(batch)
+
+    def stats(self) -> Dict:
+        """Statistik store: hot (user di memory), dirty, hits, loads, flushes, written"""
+        with self._lock:
+            return {
+                'hot': len(self._hot),
+                'dirty': len(self._dirty),
+                'hits': self.hits,
+                'loads': self.loads,
+                'flushes': self.flushes,
+                'written': self.written,
+            }
+
+    def close(self):
+        """Hentikan thread flush, tulis perubahan terakhir dan tutup backend"""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+        self.backend.close()
@@ -0,0 +1,149 @@
+"""
+Mode webhook untuk bot Telegram
+Telegram mengirim update lewat HTTPS POST ke server ini, sehingga update
+diterima begitu dikirim (tanpa jeda long polling) dan bot bisa dijalankan
+di belakang load balancer atau reverse proxy yang meneruskan HTTP biasa.
+
+Server hanya memvalidasi secret token dan memasukkan update ke antrian
+Application; pemrosesan (berurutan atau concurrent) diatur oleh
+Application. Pendaftaran webhook ke Telegram bersifat opsional: tanpa
+webhook_url server tetap menerima update, misalnya untuk testing lokal
+dengan mengirim JSON update lewat curl. Webhook publik (webhook_url diisi)
+wajib memakai secret token, karena tanpa secret siapa pun yang mengetahui
+URL-nya bisa mengirim update palsu.
+
+Butuh dependency opsional tornado: pip install "python-telegram-bot[webhooks]"
+"""
+
+import re
+import hmac
+import json
+import signal
+import asyncio
+import logging
+from typing import Optional
+
+try:
+    import tornado.web
+    import tornado.httpserver
+except ImportError:  # pragma: no cover - dependency opsional
+    tornado = None
+
+from telegram import Update
+from telegram.ext import Application
+
+logger = logging.getLogger(__name__)
+
+# Header yang dikirim Telegram berisi secret_token dari set_webhook
+SECRET_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+
+# Karakter yang diizinkan Telegram untuk secret_token
+SECRET_TOKEN_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,256}$')
+
+
+def _make_app(application: Application, url_path: str, secret_token: Optional[str]):
+    """Aplikasi tornado: POST url_path untuk update, GET /healthz untuk health check"""
+
+    class UpdateHandler(tornado.web.RequestHandler):
+        async def post(self):
+            if secret_token:
+                received = self.request.headers.get(SECRET_HEADER, '')
+                if not hmac.compare_digest(received.encode(), secret_token.encode()):
+                    logger.warning(f"Rejected webhook request with invalid secret token from {self.request.remote_ip}")
+                    raise tornado.web.HTTPError(403)
+
+            try:
+                update = Update.de_json(json.loads(self.request.body), application.bot)
+            except Exception as e:
+                logger.warning(f"Rejected invalid webhook payload: {e}")
+                raise tornado.web.HTTPError(400)
+
+            # Balas secepatnya; update diproses Application dari antrian
+            await application.update_queue.put(update)
+            self.set_status(200)
+
+    class HealthHandler(tornado.web.RequestHandler):
+        def get(self):
+            self.write({'status': 'ok', 'pending_updates': application.update_queue.qsize()})
+
+    return tornado.web.Application([
+        (re.escape(url_path), UpdateHandler),
+        (r'/healthz', HealthHandler),
+    ])
+
+
+async def serve_webhook(application: Application, listen: str = '0.0.0.0', port: int = 8443,
+                        url_path: str = '/telegram', secret_token: Optional[str] = None,
+                        webhook_url: Optional[str] = None, max_connections: int = 40,
+                        stop_event: Optional[asyncio.Event] = None):
+    """
+    Jalankan bot dalam mode webhook sampai stop_event di-set
+
+    Args:
+        application: Application bot (dibuat dengan updater(None))
+        listen: Alamat listen server HTTP
+        port: Port server HTTP
+        url_path: Path yang menerima update
+        secret_token: Secret yang harus dikirim di header X-Telegram-Bot-Api-Secret-Token
+        webhook_url: URL publik webhook (https), jika diisi didaftarkan ke Telegram
+                     dengan set_webhook (butuh secret_token); kosong untuk tidak
+                     mendaftarkan (testing lokal)
+        max_connections: Jumlah koneksi HTTPS simultan maksimum dari Telegram
+        stop_event: Event untuk menghentikan server (default: SIGINT / SIGTERM)
+    """
+    if tornado is None:
+        raise ValueError('Webhook mode requires tornado: pip install "python-telegram-bot[webhooks]"')
+    if webhook_url and not secret_token:
+        raise ValueError("Public webhook requires a secret token (--secret-token / WEBHOOK_SECRET_TOKEN)")
+    if secret_token and not SECRET_TOKEN_PATTERN.match(secret_token):
+        raise ValueError("Webhook secret token must be 1-256 characters of A-Z, a-z, 0-9, _ and -")
+    if not url_path.startswith('/'):
+        url_path = '/' + url_path
+
+    if stop_event is None:
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop_event.set)
+            except NotImplementedError:  # pragma: no cover - Windows
+                pass
+
+    await application.initialize()
+    try:
+        if application.post_init:
+            await application.post_init(application)
+
+        if webhook_url:
+            await application.bot.set_webhook(
+                url=webhook_url,
+                allowed_updates=Update.ALL_TYPES,
+                max_connections=max_connections,
+                secret_token=secret_token,
+            )
+            logger.info(f"Webhook registered: {webhook_url}")
+        else:
+            logger.info("Webhook URL not set, not registering with Telegram")
+
+        await application.start()
+        server = tornado.httpserver.HTTPServer(
+            _make_app(application, url_path, secret_token),
+            # Batas ukuran update, update Telegram jauh lebih kecil dari ini
+            max_body_size=1024 * 1024
+        )
+        try:
+            server.listen(port, address=listen)
+            logger.info(f"Webhook server listening on {listen}:{port}{url_path}")
+            await stop_event.wait()
+        finally:
+            logger.info("Stopping webhook server...")
+            server.stop()
+            await server.close_all_connections()
+            # Webhook tidak dihapus: instance lain di belakang load balancer mungkin masih berjalan
+            await application.stop()
+            if application.post_stop:
+                await application.post_stop(application)
+    finally:
+        await application.shutdown()
+        if application.post_shutdown:
+            await application.post_shutdown(application)